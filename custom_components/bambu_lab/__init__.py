@@ -1,6 +1,7 @@
 """The Bambu Lab component."""
 
 import asyncio
+import gzip
 import os
 import mimetypes
 from datetime import datetime
@@ -242,13 +243,24 @@ class FileCacheFileView(HomeAssistantView):
             except ValueError:
                 return web.json_response({"error": "Access denied"}, status=403)
 
+            # Plate gcode is only extracted from its cached 3mf the first time it's asked for. It may be kept
+            # gzipped, in which case it's served as is to clients that accept gzip and decompressed for the rest.
+            content_encoding = None
+            if full_path.suffix == '.gcode' and not full_path.is_file():
+                extracted_path = await self.hass.async_add_executor_job(
+                    coordinator.get_model().print_job.ensure_gcode_file, str(full_path))
+                if extracted_path is not None:
+                    if extracted_path.endswith('.gz'):
+                        content_encoding = 'gzip'
+                    full_path = Path(extracted_path)
+
             # Check if file exists
             if not full_path.exists() or not full_path.is_file():
                 return web.json_response({"error": "File not found"}, status=404)
 
             # Get file info
             stat = full_path.stat()
-            content_type, _ = mimetypes.guess_type(str(full_path))
+            content_type, _ = mimetypes.guess_type(filepath)
             if not content_type:
                 content_type = 'application/octet-stream'
 
@@ -256,14 +268,24 @@ class FileCacheFileView(HomeAssistantView):
             async with aiofiles.open(full_path, 'rb') as f:
                 content = await f.read()
 
+            if content_encoding:
+                accepted = [encoding.split(';')[0].strip().lower() for encoding in request.headers.get('Accept-Encoding', '').split(',')]
+                if content_encoding not in accepted:
+                    content = await self.hass.async_add_executor_job(gzip.decompress, content)
+                    content_encoding = None
+
             # Always set Content-Disposition: attachment
             headers = {
                 'Content-Type': content_type,
-                'Content-Length': str(stat.st_size),
+                'Content-Length': str(len(content)),
                 'Cache-Control': 'public, max-age=3600',  # Cache for 1 hour
                 'Last-Modified': datetime.fromtimestamp(stat.st_mtime).strftime('%a, %d %b %Y %H:%M:%S GMT'),
                 'Content-Disposition': f'attachment; filename="{os.path.basename(filepath)}"',
             }
+            if full_path.suffix == '.gz':
+                headers['Vary'] = 'Accept-Encoding'
+            if content_encoding:
+                headers['Content-Encoding'] = content_encoding
 
             return web.Response(
                 body=content,
@@ -1,8 +1,12 @@
+import asyncio
 import os
 
+from contextlib import aclosing
+
+from aiohttp import web
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from io import BytesIO
 from PIL import Image, ImageDraw
 from urllib.parse import urlparse
@@ -161,6 +165,47 @@ class BambuLabRtspCamera(BambuLabEntity, Camera):
         img.save(buf, format="JPEG")
         return buf.getvalue()
 
+MJPEG_BOUNDARY = "frameboundary"
+
+
+class ChamberFrameBroadcaster:
+    """Fan chamber image frames out to any number of MJPEG viewers.
+
+    Only the newest frame is kept. A viewer that is slow to consume skips straight to the latest frame instead of
+    queueing a backlog, so memory use doesn't grow with the number or speed of viewers.
+    """
+
+    def __init__(self):
+        self._frame: bytes = b""
+        self._waiters: set[asyncio.Event] = set()
+
+    @callback
+    def publish(self, frame: bytes) -> None:
+        if not frame:
+            return
+        self._frame = frame
+        for waiter in self._waiters:
+            waiter.set()
+
+    async def frames(self):
+        """Yield the current frame, then each new one as it arrives."""
+        waiter = asyncio.Event()
+        self._waiters.add(waiter)
+        try:
+            if self._frame:
+                yield self._frame
+            while True:
+                await waiter.wait()
+                waiter.clear()
+                yield self._frame
+        finally:
+            self._waiters.discard(waiter)
+
+    @property
+    def viewers(self) -> int:
+        return len(self._waiters)
+
+
 class BambuLabImageCamera(BambuLabEntity, Camera):
     """Camera from chamber image"""
 
@@ -180,8 +225,40 @@ class BambuLabImageCamera(BambuLabEntity, Camera):
         super().__init__(coordinator=coordinator)
         Camera.__init__(self)
 
+        self._broadcaster = ChamberFrameBroadcaster()
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_frame_listener(self._broadcaster.publish))
+
     def camera_image(self, width: int | None = None, height: int | None = None) -> bytes | None:
-        return self.coordinator.get_model().chamber_image.get_image()
+        # Snapshots and dashboard thumbnails keep the on-demand camera connection alive.
+        self.coordinator.request_chamber_image()
+        return self.coordinator.get_model().chamber_image.get_scaled_image(width, height)
+
+    async def handle_async_mjpeg_stream(self, request: web.Request) -> web.StreamResponse | None:
+        """Stream frames to the viewer as they arrive from the printer, shared with every other viewer."""
+        response = web.StreamResponse()
+        response.content_type = f"multipart/x-mixed-replace;boundary={MJPEG_BOUNDARY}"
+        await response.prepare(request)
+
+        LOGGER.debug(f"MJPEG viewer connected. Viewers: {self._broadcaster.viewers + 1}")
+        release_camera = self.coordinator.async_acquire_camera()
+        try:
+            async with aclosing(self._broadcaster.frames()) as frames:
+                async for frame in frames:
+                    # Written separately so the shared frame is never copied per viewer.
+                    await response.write(
+                        f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(frame)}\r\n\r\n".encode("ascii"))
+                    await response.write(frame)
+                    await response.write(b"\r\n")
+        except ConnectionResetError:
+            # Viewer went away.
+            pass
+        finally:
+            release_camera()
+            LOGGER.debug(f"MJPEG viewer disconnected. Viewers: {self._broadcaster.viewers}")
+        return response
 
     @property
     def is_streaming(self) -> bool:
@@ -861,6 +861,12 @@ class BambuOptionsFlowHandler(config_entries.OptionsFlow):
                     options["usage_hours"] = float(user_input['usage_hours'])
                     options["disable_ssl_verify"] = user_input['advanced']['disable_ssl_verify']
                     options["enable_firmware_update"] = user_input['advanced']['enable_firmware_update']
+                    options["update_coalesce_ms"] = max(0, int(user_input['advanced']['update_coalesce_ms']))
+                    options["camera_idle_timeout"] = max(0, int(user_input['advanced']['camera_idle_timeout']))
+                    options["image_update_interval_ms"] = max(0, int(user_input['advanced']['image_update_interval_ms']))
+                    options["compress_gcode"] = user_input['advanced']['compress_gcode']
+                    options["asyncio_transport"] = user_input['advanced']['asyncio_transport']
+                    options["capture_raw_payloads"] = user_input['advanced']['capture_raw_payloads']
                     options["print_cache_count"] = max(-1, int(user_input['print_cache_count']))
                     options["timelapse_cache_count"] = max(-1, int(user_input['timelapse_cache_count']))
                     options["force_ip"] = force_ip
@@ -895,6 +901,12 @@ class BambuOptionsFlowHandler(config_entries.OptionsFlow):
         default_usage_hours = str(self._config_entry.options.get('usage_hours', 0)) if user_input is None else user_input['usage_hours']
         default_disable_ssl_verify = self._config_entry.options.get('disable_ssl_verify', False) if user_input is None else user_input.get('advanced', {}).get('disable_ssl_verify', self._config_entry.options.get('disable_ssl_verify', ''))
         default_enable_firmware_update = self._config_entry.options.get('enable_firmware_update', False) if user_input is None else user_input.get('advanced', {}).get('enable_firmware_update', self._config_entry.options.get('enable_firmware_update', ''))
+        default_update_coalesce_ms = self._config_entry.options.get('update_coalesce_ms', 250) if user_input is None else user_input.get('advanced', {}).get('update_coalesce_ms', self._config_entry.options.get('update_coalesce_ms', 250))
+        default_camera_idle_timeout = self._config_entry.options.get('camera_idle_timeout', 60) if user_input is None else user_input.get('advanced', {}).get('camera_idle_timeout', self._config_entry.options.get('camera_idle_timeout', 60))
+        default_image_update_interval_ms = self._config_entry.options.get('image_update_interval_ms', 2000) if user_input is None else user_input.get('advanced', {}).get('image_update_interval_ms', self._config_entry.options.get('image_update_interval_ms', 2000))
+        default_compress_gcode = self._config_entry.options.get('compress_gcode', False) if user_input is None else user_input.get('advanced', {}).get('compress_gcode', self._config_entry.options.get('compress_gcode', False))
+        default_asyncio_transport = self._config_entry.options.get('asyncio_transport', False) if user_input is None else user_input.get('advanced', {}).get('asyncio_transport', self._config_entry.options.get('asyncio_transport', False))
+        default_capture_raw_payloads = self._config_entry.options.get('capture_raw_payloads', False) if user_input is None else user_input.get('advanced', {}).get('capture_raw_payloads', self._config_entry.options.get('capture_raw_payloads', False))
 
         # Build form
         fields: OrderedDict[vol.Marker, Any] = OrderedDict()
@@ -910,6 +922,12 @@ class BambuOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Schema({
                 vol.Required('disable_ssl_verify', default=default_disable_ssl_verify): BOOLEAN_SELECTOR,
                 vol.Required('enable_firmware_update', default=default_enable_firmware_update): BOOLEAN_SELECTOR,
+                vol.Required('update_coalesce_ms', default=str(default_update_coalesce_ms)): NUMBER_SELECTOR,
+                vol.Required('camera_idle_timeout', default=str(default_camera_idle_timeout)): NUMBER_SELECTOR,
+                vol.Required('image_update_interval_ms', default=str(default_image_update_interval_ms)): NUMBER_SELECTOR,
+                vol.Required('compress_gcode', default=default_compress_gcode): BOOLEAN_SELECTOR,
+                vol.Required('asyncio_transport', default=default_asyncio_transport): BOOLEAN_SELECTOR,
+                vol.Required('capture_raw_payloads', default=default_capture_raw_payloads): BOOLEAN_SELECTOR,
             }),
             {'collapsed': True},
         )
@@ -958,6 +976,12 @@ class BambuOptionsFlowHandler(config_entries.OptionsFlow):
                 options["usage_hours"] = float(user_input['usage_hours'])
                 options["disable_ssl_verify"] = user_input['advanced']['disable_ssl_verify']
                 options["enable_firmware_update"] = user_input['advanced']['enable_firmware_update']
+                options["update_coalesce_ms"] = max(0, int(user_input['advanced']['update_coalesce_ms']))
+                options["camera_idle_timeout"] = max(0, int(user_input['advanced']['camera_idle_timeout']))
+                options["image_update_interval_ms"] = max(0, int(user_input['advanced']['image_update_interval_ms']))
+                options["compress_gcode"] = user_input['advanced']['compress_gcode']
+                options["asyncio_transport"] = user_input['advanced']['asyncio_transport']
+                options["capture_raw_payloads"] = user_input['advanced']['capture_raw_payloads']
                 options["force_ip"] = (user_input['host'] != bambu.get_device().info.ip_address)
 
                 title = self._config_entry.data['serial']
@@ -991,6 +1015,12 @@ class BambuOptionsFlowHandler(config_entries.OptionsFlow):
         default_usage_hours = str(self._config_entry.options.get('usage_hours', 0)) if user_input is None else user_input['usage_hours']
         default_disable_ssl_verify = self._config_entry.options.get('disable_ssl_verify', False) if user_input is None else user_input.get('advanced', {}).get('disable_ssl_verify', self._config_entry.options.get('disable_ssl_verify', ''))
         default_enable_firmware_update = self._config_entry.options.get('enable_firmware_update', False) if user_input is None else user_input.get('advanced', {}).get('enable_firmware_update', self._config_entry.options.get('enable_firmware_update', ''))
+        default_update_coalesce_ms = self._config_entry.options.get('update_coalesce_ms', 250) if user_input is None else user_input.get('advanced', {}).get('update_coalesce_ms', self._config_entry.options.get('update_coalesce_ms', 250))
+        default_camera_idle_timeout = self._config_entry.options.get('camera_idle_timeout', 60) if user_input is None else user_input.get('advanced', {}).get('camera_idle_timeout', self._config_entry.options.get('camera_idle_timeout', 60))
+        default_image_update_interval_ms = self._config_entry.options.get('image_update_interval_ms', 2000) if user_input is None else user_input.get('advanced', {}).get('image_update_interval_ms', self._config_entry.options.get('image_update_interval_ms', 2000))
+        default_compress_gcode = self._config_entry.options.get('compress_gcode', False) if user_input is None else user_input.get('advanced', {}).get('compress_gcode', self._config_entry.options.get('compress_gcode', False))
+        default_asyncio_transport = self._config_entry.options.get('asyncio_transport', False) if user_input is None else user_input.get('advanced', {}).get('asyncio_transport', self._config_entry.options.get('asyncio_transport', False))
+        default_capture_raw_payloads = self._config_entry.options.get('capture_raw_payloads', False) if user_input is None else user_input.get('advanced', {}).get('capture_raw_payloads', self._config_entry.options.get('capture_raw_payloads', False))
 
         fields[vol.Required('host', default=default_host)] = TEXT_SELECTOR
         fields[vol.Required('access_code', default=default_access_code)] = TEXT_SELECTOR
@@ -1001,6 +1031,12 @@ class BambuOptionsFlowHandler(config_entries.OptionsFlow):
             vol.Schema({
                 vol.Required('disable_ssl_verify', default=default_disable_ssl_verify): BOOLEAN_SELECTOR,
                 vol.Required('enable_firmware_update', default=default_enable_firmware_update): BOOLEAN_SELECTOR,
+                vol.Required('update_coalesce_ms', default=str(default_update_coalesce_ms)): NUMBER_SELECTOR,
+                vol.Required('camera_idle_timeout', default=str(default_camera_idle_timeout)): NUMBER_SELECTOR,
+                vol.Required('image_update_interval_ms', default=str(default_image_update_interval_ms)): NUMBER_SELECTOR,
+                vol.Required('compress_gcode', default=default_compress_gcode): BOOLEAN_SELECTOR,
+                vol.Required('asyncio_transport', default=default_asyncio_transport): BOOLEAN_SELECTOR,
+                vol.Required('capture_raw_payloads', default=default_capture_raw_payloads): BOOLEAN_SELECTOR,
             }),
             {'collapsed': True},
         )
@@ -44,14 +44,35 @@ BAMBU_LAB_CARDS = [
 class Options(IntEnum):
     CAMERA = 1,
     IMAGECAMERA = 2,
-    FIRMWAREUPDATE = 6
+    FIRMWAREUPDATE = 6,
+    UPDATECOALESCEMS = 7,
+    CAMERAIDLETIMEOUT = 8,
+    IMAGEUPDATEINTERVALMS = 9,
+    COMPRESSGCODE = 10
 
 OPTION_NAME = {
-    Options.CAMERA:         "enable_camera",
-    Options.IMAGECAMERA:    "camera_as_image_sensor",
-    Options.FIRMWAREUPDATE: "enable_firmware_update",
+    Options.CAMERA:           "enable_camera",
+    Options.IMAGECAMERA:      "camera_as_image_sensor",
+    Options.FIRMWAREUPDATE:   "enable_firmware_update",
+    Options.UPDATECOALESCEMS: "update_coalesce_ms",
+    Options.CAMERAIDLETIMEOUT: "camera_idle_timeout",
+    Options.IMAGEUPDATEINTERVALMS: "image_update_interval_ms",
+    Options.COMPRESSGCODE: "compress_gcode",
 }
 
+# Printer events that are merged within the coalescing window before being handed to Home Assistant. Every other
+# event (print started/finished, errors, ready...) is delivered immediately and in order.
+COALESCED_EVENTS = {
+    "event_printer_data_update",
+    "event_light_update",
+    "event_speed_update",
+    "event_printer_chamber_image_update",
+    "event_printer_cover_image_update",
+}
+
+# Seconds a snapshot waits for the first frame when it has to connect an idle chamber camera.
+CHAMBER_IMAGE_CONNECT_TIMEOUT = 5
+
 def load_dict(filename: str) -> dict:
     with open(filename) as f:
         return json.load(f);
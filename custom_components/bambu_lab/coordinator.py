@@ -4,10 +4,11 @@ import asyncio
 import functools
 import os
 import re
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Optional, List, Dict
+from typing import Any, Callable, Optional, List, Dict
 
 from homeassistant import config_entries
 from homeassistant.config_entries import ConfigEntry
@@ -27,6 +28,8 @@ from homeassistant.helpers import entity_registry as er
 
 from .const import (
     BRAND,
+    CHAMBER_IMAGE_CONNECT_TIMEOUT,
+    COALESCED_EVENTS,
     DOMAIN,
     LOGGER,
     LOGGERFORHA,
@@ -76,10 +79,13 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
         config.update(entry.options.items())
         config['user_language'] = hass.config.language
         config['file_cache_path'] = self.get_file_cache_directory(config['serial'])
+        # Raw payload captures must not land under www where they would be publicly served.
+        config['raw_payload_capture_path'] = hass.config.path(f"ha-bambulab/{config['serial']}/mqtt_payloads.log")
         self.client = BambuClient(config)
             
         self._updatedDevice = False
         self._shutdown = False
+        self.changed_subsystems = None
         self.data = self.get_model()
         self._eventloop = asyncio.get_running_loop()
         # Pass LOGGERFORHA logger into HA as otherwise it generates a debug output line every single time we tell it we have an update
@@ -90,6 +96,16 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
             name=DOMAIN
         )
 
+        # Coalescing of bursty MQTT events into at most one UI-facing update per window.
+        self._coalesce_window = max(0, self.get_option_value(Options.UPDATECOALESCEMS)) / 1000
+        self._pending_events: dict[str, frozenset | None] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._last_flush = 0.0
+
+        # Callbacks receiving every new chamber image frame, e.g. the MJPEG stream broadcaster.
+        self._frame_listeners: list = []
+
         self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_shutdown)
         self._service_call_listener = self.hass.bus.async_listen(SERVICE_CALL_EVENT, self._handle_service_call_event)
 
@@ -99,15 +115,52 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
         LOGGER.debug("HOME ASSISTANT IS SHUTTING DOWN")
         self.shutdown()
 
-    def event_handler(self, event: str):
+    def event_handler(self, event: str, changed: frozenset | None = None):
         if self._shutdown:
             # Handle race conditions when the integration is being deleted by re-registering and existing device.
             return
         
         # The callback comes in on the MQTT thread. Need to jump to the HA main thread to guarantee thread safety.
-        self._eventloop.call_soon_threadsafe(self.event_handler_internal, event)
+        if event in COALESCED_EVENTS and self._coalesce_window > 0:
+            with self._pending_lock:
+                if event in self._pending_events:
+                    # Merge the change sets. None (everything may have changed) absorbs any set.
+                    pending = self._pending_events[event]
+                    self._pending_events[event] = None if pending is None or changed is None else pending | changed
+                else:
+                    self._pending_events[event] = changed
+                if self._flush_scheduled:
+                    return
+                self._flush_scheduled = True
+            self._eventloop.call_soon_threadsafe(self._schedule_flush)
+        else:
+            # Edge events go out immediately, after anything still pending so ordering is preserved.
+            with self._pending_lock:
+                events = list(self._pending_events.items())
+                self._pending_events.clear()
+            events.append((event, changed))
+            self._eventloop.call_soon_threadsafe(self._dispatch_events, events)
+
+    def _schedule_flush(self):
+        delay = self._last_flush + self._coalesce_window - time.monotonic()
+        if delay <= 0:
+            self._flush_pending_events()
+        else:
+            self._eventloop.call_later(delay, self._flush_pending_events)
+
+    def _flush_pending_events(self):
+        with self._pending_lock:
+            events = list(self._pending_events.items())
+            self._pending_events.clear()
+            self._flush_scheduled = False
+        self._last_flush = time.monotonic()
+        self._dispatch_events(events)
+
+    def _dispatch_events(self, events: list[tuple[str, frozenset | None]]):
+        for event, changed in events:
+            self.event_handler_internal(event, changed)
 
-    def event_handler_internal(self, event: str):
+    def event_handler_internal(self, event: str, changed: frozenset | None = None):
         if self._shutdown:
             # Handle race conditions when the integration is being deleted by re-registering and existing device.
             return
@@ -134,7 +187,7 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
             self._update_data()
 
         elif event == "event_printer_data_update":
-            self._update_data()
+            self._update_data(changed)
 
             # Check is usage hours change and persist to config entry if it did.
             if self.latest_usage_hours != self.get_model().info.usage_hours:
@@ -149,8 +202,9 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
                     options=options)
 
         elif event == "event_printer_chamber_image_update":
-            if self.get_option_enabled(Options.IMAGECAMERA):
-                self._update_data()
+            # Only the chamber image consumers (image entity, MJPEG stream) care about frames. They subscribe as frame
+            # listeners rather than every entity being refreshed for each frame.
+            self._notify_frame_listeners()
 
         elif event == "event_printer_cover_image_update":
             self._update_data()
@@ -722,14 +776,60 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
         device = self.get_model()
         return device
     
-    def _update_data(self):
+    def _update_data(self, changed: frozenset | None = None):
+        """Push the model to listeners. changed names the sub-models that changed; None means all of them."""
         device = self.get_model()
+        self.changed_subsystems = changed
         try:
             self.async_set_updated_data(device)
         except Exception as e:
             LOGGER.error("An exception occurred calling async_set_updated_data():")
             LOGGER.error(f"Exception type: {type(e)}")
             LOGGER.error(f"Exception data: {e}")
+        finally:
+            self.changed_subsystems = None
+
+    @callback
+    def async_add_frame_listener(self, listener) -> Callable[[], None]:
+        """Call listener with each new chamber image frame. Returns a function that removes the listener."""
+        self._frame_listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._frame_listeners:
+                self._frame_listeners.remove(listener)
+
+        return remove_listener
+
+    @callback
+    def async_acquire_camera(self) -> Callable[[], None]:
+        """Keep the chamber camera connected until the returned release function is called."""
+        return self.client.camera_session.acquire()
+
+    def request_chamber_image(self) -> bytes:
+        """Return the latest chamber image, connecting the camera and waiting for a fresh frame if it was idle.
+
+        Blocks while waiting so must be called from an executor.
+        """
+        if self.client.camera_session.request():
+            return self.get_model().chamber_image.wait_for_image(CHAMBER_IMAGE_CONNECT_TIMEOUT)
+        return self.get_model().chamber_image.get_image()
+
+    def _notify_frame_listeners(self):
+        if not self._frame_listeners:
+            return
+        frame = self.get_model().chamber_image.get_image()
+        for listener in list(self._frame_listeners):
+            try:
+                listener(frame)
+            except Exception as e:
+                LOGGER.error(f"Chamber image frame listener failed: {e}")
+
+    def update_affects(self, depends_on: frozenset[str] | None) -> bool:
+        """Return whether the update being dispatched touches any of the given Device sub-models."""
+        if self.changed_subsystems is None or depends_on is None:
+            return True
+        return not self.changed_subsystems.isdisjoint(depends_on)
 
     def _update_printer_error(self):
         dev_reg = device_registry.async_get(self._hass)
@@ -990,7 +1090,16 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
 
     def get_option_value(self, option: Options) -> int:
         options = dict(self.config_entry.options)
+
         default = 0
+        match option:
+            case Options.UPDATECOALESCEMS:
+                default = 250
+            case Options.CAMERAIDLETIMEOUT:
+                default = 60
+            case Options.IMAGEUPDATEINTERVALMS:
+                default = 2000
+
         return options.get(OPTION_NAME[option], default)
         
     async def set_option_value(self, option: Options, value: int):
@@ -1086,7 +1195,8 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
         if not cache_dir:
             return []
             
-        cache_dir = os.path.join(cache_dir, file_type)
+        # Plate gcode is extracted next to the 3mf it came from.
+        cache_dir = os.path.join(cache_dir, 'prints' if file_type == 'gcode' else file_type)
         if not os.path.exists(cache_dir):
             return []
         
@@ -1097,7 +1207,7 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
         # Define file type patterns
         type_patterns = {
             'prints': ['*.3mf'],
-            'gcode': ['*.gcode'],
+            'gcode': ['*.gcode', '*.gcode.gz', '*.3mf'],
             'timelapse': ['*.mp4', '*.avi', '*.mov'],
         }
         
@@ -1108,9 +1218,28 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
                 if file_path.is_file():
                     # Get file stats
                     stat = file_path.stat()
+                    size_bytes = stat.st_size
                     
-                    # Determine file type
+                    # Determine file type. Compressed gcode is listed under its .gcode name, which the file view
+                    # serves from the .gz, unless an uncompressed copy is also present.
+                    listed_path = file_path
                     file_ext = file_path.suffix.lower()
+                    if file_path.name.lower().endswith('.gcode.gz'):
+                        listed_path = file_path.with_suffix('')
+                        if listed_path.is_file():
+                            continue
+                        file_ext = '.gcode'
+                    elif file_type == 'gcode' and file_ext == '.3mf':
+                        # Plate gcode that hasn't been extracted from its cached 3mf yet. The file view extracts it
+                        # when it's first downloaded.
+                        listed_path = file_path.with_suffix('.gcode')
+                        if listed_path.is_file() or listed_path.with_suffix('.gcode.gz').is_file():
+                            continue
+                        size_bytes = await self.hass.async_add_executor_job(
+                            self.get_model().print_job.cached_gcode_size, str(listed_path))
+                        if size_bytes is None:
+                            continue
+                        file_ext = '.gcode'
                     if file_ext == '.3mf':
                         detected_type = 'prints'
                     elif file_ext == '.gcode':
@@ -1127,11 +1256,11 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
                     thumbnail_path = None
                     if detected_type in ['timelapse', 'prints', 'gcode']:
                         # Create thumbnail candidates relative to cache root
-                        file_relative_path = file_path.relative_to(cache_root)
+                        file_relative_path = listed_path.relative_to(cache_root)
                         thumbnail_candidates = [
-                            cache_root / file_relative_path.parent / (file_path.stem + '.jpg'),
-                            cache_root / file_relative_path.parent / (file_path.stem + '.png'),
-                            cache_root / file_relative_path.parent / (file_path.stem + '.jpeg'),
+                            cache_root / file_relative_path.parent / (listed_path.stem + '.jpg'),
+                            cache_root / file_relative_path.parent / (listed_path.stem + '.png'),
+                            cache_root / file_relative_path.parent / (listed_path.stem + '.jpeg'),
                         ]
                         for thumb_path in thumbnail_candidates:
                             if thumb_path.exists():
@@ -1139,7 +1268,6 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
                                 break
                     
                     # Format file size
-                    size_bytes = stat.st_size
                     if size_bytes < 1024:
                         size_human = f"{size_bytes} B"
                     elif size_bytes < 1024 * 1024:
@@ -1150,13 +1278,13 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
                         size_human = f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
 
                     # Build API path relative to cache root (preserves subdirs like 'cache/')
-                    api_path = f"{self.get_model().info.serial}/{file_path.relative_to(cache_root)}"
+                    api_path = f"{self.get_model().info.serial}/{listed_path.relative_to(cache_root)}"
                     api_thumbnail_path = None
                     if thumbnail_path:
                         api_thumbnail_path = f"{self.get_model().info.serial}/{thumbnail_path.relative_to(cache_root)}"
 
                     file_info = {
-                        'filename': file_path.name,
+                        'filename': listed_path.name,
                         'path': api_path,
                         'type': detected_type,
                         'size': size_bytes,
@@ -1192,7 +1320,7 @@ class BambuDataUpdateCoordinator(DataUpdateCoordinator):
                 # Delete only specific file type
                 type_patterns = {
                     'prints': ['*.3mf'],
-                    'gcode': ['*.gcode'],
+                    'gcode': ['*.gcode', '*.gcode.gz'],
                     'timelapse': ['*.mp4', '*.avi', '*.mov'],
                 }
                 
@@ -24,7 +24,8 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfMass,
     UnitOfLength,
-    UnitOfTime
+    UnitOfTime,
+    UnitOfDataRate
 )
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.util import dt as dt_util
@@ -74,6 +75,8 @@ class BambuLabSensorEntityDescription(SensorEntityDescription, BambuLabSensorEnt
     icon_fn: Callable[..., str] = lambda _: None
     is_restoring: bool = False
     options_fn: Callable[..., list[str]] | None = None
+    # Device sub-models read by the callbacks above. None means refresh on every coordinator update.
+    depends_on: frozenset[str] | None = None
 
 
 @dataclass
@@ -86,6 +89,7 @@ class BambuLabAMSSensorEntityDescription(
     exists_fn: Callable[[BambuDataUpdateCoordinator, int], bool] = lambda coordinator, index: True
     extra_attributes: Callable[..., dict] = lambda _: {}
     icon_fn: Callable[..., str] = lambda _: None
+    depends_on: frozenset[str] | None = None
 
 
 @dataclass
@@ -99,6 +103,7 @@ class BambuLabHotendRackSensorEntityDescription(
     extra_attributes: Callable[..., dict] = lambda _: {}
     icon_fn: Callable[..., str] = lambda _: None
     hotend_id: int | None = None
+    depends_on: frozenset[str] | None = None
 
 
 @dataclass
@@ -113,6 +118,7 @@ class BambuLabBinarySensorEntityDescription(BinarySensorEntityDescription, Bambu
     available_fn: Callable[..., bool] = lambda _: True
     exists_fn: Callable[..., bool] = lambda _: True
     extra_attributes: Callable[..., dict] = lambda _: {}
+    depends_on: frozenset[str] | None = None
 
 
 @dataclass
@@ -121,11 +127,13 @@ class BambuLabAMSBinarySensorEntityDescription(BinarySensorEntityDescription, Ba
     available_fn: Callable[..., bool] = lambda _: True
     exists_fn: Callable[[BambuDataUpdateCoordinator, int], bool] = lambda coordinator, index: True
     extra_attributes: Callable[..., dict] = lambda _: {}
+    depends_on: frozenset[str] | None = None
 
 
 AMS_BINARY_SENSORS: tuple[BambuLabAMSBinarySensorEntityDescription, ...] = (
     BambuLabAMSBinarySensorEntityDescription(
         key="active_ams",
+        depends_on=frozenset({"ams", "extruder"}),
         translation_key="active_ams",
         icon="mdi:check",
         device_class=BinarySensorDeviceClass.RUNNING,
@@ -133,6 +141,7 @@ AMS_BINARY_SENSORS: tuple[BambuLabAMSBinarySensorEntityDescription, ...] = (
     ),
     BambuLabAMSBinarySensorEntityDescription(
         key="drying",
+        depends_on=frozenset({"ams"}),
         translation_key="drying",
         icon="mdi:heat-wave",
         device_class=BinarySensorDeviceClass.RUNNING,
@@ -149,6 +158,7 @@ AMS_BINARY_SENSORS: tuple[BambuLabAMSBinarySensorEntityDescription, ...] = (
 PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     BambuLabBinarySensorEntityDescription(
         key="timelapse",
+        depends_on=frozenset({"camera"}),
         translation_key="timelapse",
         icon="mdi:camera",
         device_class=BinarySensorDeviceClass.RUNNING,
@@ -156,11 +166,13 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="extruder_filament_state",
+        depends_on=frozenset({"info"}),
         translation_key="extruder_filament_state",
         is_on_fn=lambda self: self.coordinator.get_model().info.extruder_filament_state,
     ),
     BambuLabBinarySensorEntityDescription(
         key="hms",
+        depends_on=frozenset({"hms"}),
         translation_key="hms_errors",
         device_class=BinarySensorDeviceClass.PROBLEM,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -169,6 +181,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="print_error",
+        depends_on=frozenset({"print_error"}),
         translation_key="print_error",
         device_class=BinarySensorDeviceClass.PROBLEM,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -177,6 +190,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="online",
+        depends_on=frozenset({"info"}),
         translation_key="online",
         device_class=BinarySensorDeviceClass.RUNNING,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -184,6 +198,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="firmware_update",
+        depends_on=frozenset({"info"}),
         translation_key="firmware_update",
         device_class=BinarySensorDeviceClass.UPDATE,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -192,6 +207,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="door_open",
+        depends_on=frozenset({"info"}),
         translation_key="door_open",
         device_class=BinarySensorDeviceClass.DOOR,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -200,6 +216,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="developer_lan_mode",
+        depends_on=frozenset({"info", "print_fun"}),
         translation_key="developer_lan_mode",
         device_class=BinarySensorDeviceClass.RUNNING,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -208,6 +225,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
     ),
     BambuLabBinarySensorEntityDescription(
         key="mqtt_encryption",
+        depends_on=frozenset({"info"}),
         translation_key="mqtt_encryption",
         device_class=BinarySensorDeviceClass.RUNNING,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -225,6 +243,7 @@ PRINTER_BINARY_SENSORS: tuple[BambuLabBinarySensorEntityDescription, ...] = (
 PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     BambuLabSensorEntityDescription(
         key="mqtt_mode",
+        depends_on=frozenset({"info"}),
         translation_key="mqtt_mode",
         entity_category=EntityCategory.DIAGNOSTIC,
         device_class=SensorDeviceClass.ENUM,
@@ -233,6 +252,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="tool_module",
+        depends_on=frozenset({"extruder_tool"}),
         translation_key="tool_module",
         icon="mdi:printer-3d-nozzle",
         device_class=SensorDeviceClass.ENUM,
@@ -242,6 +262,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="wifi_signal",
+        depends_on=frozenset({"info"}),
         translation_key="wifi_signal",
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
@@ -251,6 +272,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="bed_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="bed_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -261,6 +283,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="target_bed_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="target_bed_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -271,6 +294,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="chamber_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="chamber_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -282,6 +306,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="target_chamber_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="target_chamber_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -293,6 +318,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="nozzle_temp",
+        depends_on=frozenset({"temperature", "extruder"}),
         translation_key="nozzle_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -304,6 +330,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="target_nozzle_temp",
+        depends_on=frozenset({"temperature", "extruder"}),
         translation_key="target_nozzle_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -315,6 +342,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="left_nozzle_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="left_nozzle_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -327,6 +355,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="left_target_nozzle_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="left_target_nozzle_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -339,6 +368,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="right_nozzle_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="right_nozzle_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -351,6 +381,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="right_target_nozzle_temp",
+        depends_on=frozenset({"temperature"}),
         translation_key="right_target_nozzle_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -363,6 +394,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="aux_fan_speed",
+        depends_on=frozenset({"fans"}),
         translation_key="aux_fan_speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -372,6 +404,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="chamber_fan_speed",
+        depends_on=frozenset({"fans"}),
         translation_key="chamber_fan_speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -381,6 +414,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="cooling_fan_speed",
+        depends_on=frozenset({"fans"}),
         translation_key="cooling_fan_speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -389,6 +423,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="heatbreak_fan_speed",
+        depends_on=frozenset({"fans"}),
         translation_key="heatbreak_fan_speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -397,6 +432,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="secondary_aux_fan_speed",
+        depends_on=frozenset({"fans"}),
         translation_key="secondary_aux_fan_speed",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -406,14 +442,38 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="model_download_percentage",
+        depends_on=frozenset({"print_job"}),
         translation_key="model_download_percentage",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:percent",
         value_fn=lambda self: self.coordinator.get_model().print_job.model_download_percentage,
     ),
+    BambuLabSensorEntityDescription(
+        key="ftp_queue_depth",
+        depends_on=frozenset({"ftp"}),
+        translation_key="ftp_queue_depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:tray-full",
+        value_fn=lambda self: self.coordinator.client.ftp_scheduler.queue_depth,
+        exists_fn=lambda coordinator: coordinator.client.ftp_enabled,
+    ),
+    BambuLabSensorEntityDescription(
+        key="ftp_throughput",
+        depends_on=frozenset({"ftp"}),
+        translation_key="ftp_throughput",
+        native_unit_of_measurement=UnitOfDataRate.KILOBYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        suggested_display_precision=0,
+        value_fn=lambda self: round(self.coordinator.client.ftp_scheduler.throughput / 1000, 1),
+        exists_fn=lambda coordinator: coordinator.client.ftp_enabled,
+    ),
     BambuLabSensorEntityDescription(
         key="speed_profile",
+        depends_on=frozenset({"speed"}),
         translation_key="speed_profile",
         icon="mdi:speedometer",
         value_fn=lambda self: self.coordinator.get_model().speed.name,
@@ -423,6 +483,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="airduct_mode",
+        depends_on=frozenset({"info"}),
         translation_key="airduct_mode",
         icon="mdi:air-filter",
         device_class=SensorDeviceClass.ENUM,
@@ -432,6 +493,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="stage",
+        depends_on=frozenset({"info", "stage"}),
         translation_key="stage",
         icon="mdi:file-tree",
         value_fn=lambda self: "offline" if not self.coordinator.get_model().info.online else self.coordinator.get_model().stage.description,
@@ -440,6 +502,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="print_progress",
+        depends_on=frozenset({"print_job"}),
         translation_key="print_progress",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
@@ -448,6 +511,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="print_status",
+        depends_on=frozenset({"info", "print_job"}),
         translation_key="print_status",
         icon="mdi:list-status",
         value_fn=lambda
@@ -457,6 +521,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="printable_objects",
+        depends_on=frozenset({"print_job"}),
         translation_key="printable_objects",
         icon="mdi:cube-unfolded",
         state_class=SensorStateClass.MEASUREMENT,
@@ -465,6 +530,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="sdcard_status",
+        depends_on=frozenset({"home_flag"}),
         translation_key="sdcard_status",
         icon="mdi:list-status",
         value_fn=lambda
@@ -475,6 +541,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="skipped_objects",
+        depends_on=frozenset({"print_job"}),
         translation_key="skipped_objects",
         icon="mdi:cube-unfolded",
         state_class=SensorStateClass.MEASUREMENT,
@@ -483,6 +550,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="start_time",
+        depends_on=frozenset({"info", "print_job"}),
         translation_key="start_time",
         icon="mdi:clock",
         device_class=SensorDeviceClass.TIMESTAMP,
@@ -492,6 +560,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="remaining_time",
+        depends_on=frozenset({"print_job"}),
         translation_key="remaining_time",
         icon="mdi:timer-sand",
         native_unit_of_measurement=UnitOfTime.MINUTES,
@@ -502,6 +571,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="end_time",
+        depends_on=frozenset({"print_job"}),
         translation_key="end_time",
         icon="mdi:clock",
         device_class=SensorDeviceClass.TIMESTAMP,
@@ -510,6 +580,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="total_usage_hours",
+        depends_on=frozenset({"info"}),
         translation_key="total_usage_hours",
         icon="mdi:clock",
         state_class=SensorStateClass.TOTAL_INCREASING,
@@ -522,6 +593,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="current_layer",
+        depends_on=frozenset({"print_job"}),
         translation_key="current_layer",
         icon="mdi:printer-3d-nozzle",
         state_class=SensorStateClass.MEASUREMENT,
@@ -529,6 +601,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="total_layers",
+        depends_on=frozenset({"print_job"}),
         translation_key="total_layers",
         icon="mdi:printer-3d-nozzle",
         state_class=SensorStateClass.MEASUREMENT,
@@ -536,6 +609,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="gcode_file",
+        depends_on=frozenset({"print_job"}),
         translation_key="gcode_file",
         available_fn=lambda self: True,
         value_fn=lambda self: self.coordinator.get_model().print_job.gcode_file if self.coordinator.get_model().print_job.gcode_file != "" else None,
@@ -543,6 +617,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="gcode_file_downloaded",
+        depends_on=frozenset({"print_job"}),
         translation_key="gcode_file_downloaded",
         available_fn=lambda self: True,
         value_fn=lambda self: self.coordinator.get_model().print_job.gcode_file_downloaded if self.coordinator.get_model().print_job.gcode_file_downloaded != "" else None,
@@ -550,12 +625,14 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="subtask_name",
+        depends_on=frozenset({"print_job"}),
         translation_key="subtask_name",
         value_fn=lambda self: self.coordinator.get_model().print_job.subtask_name,
         icon_fn=lambda self: self.coordinator.get_model().print_job.file_type_icon
     ),
     BambuLabSensorEntityDescription(
         key="print_type",
+        depends_on=frozenset({"print_job"}),
         translation_key="print_type",
         value_fn=lambda self: self.coordinator.get_model().print_job.print_type,
         icon_fn=lambda self: self.coordinator.get_model().print_job.file_type_icon,
@@ -570,6 +647,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="print_length",
+        depends_on=frozenset({"print_job", "ams", "extruder", "external_spool"}),
         translation_key="print_length",
         native_unit_of_measurement=UnitOfLength.METERS,
         suggested_unit_of_measurement=UnitOfLength.METERS,
@@ -582,12 +660,14 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="print_bed_type",
+        depends_on=frozenset({"print_job"}),
         translation_key="print_bed_type",
         icon="mdi:file",
         value_fn=lambda self: self.coordinator.get_model().print_job.print_bed_type,
     ),
     BambuLabSensorEntityDescription(
         key="print_weight",
+        depends_on=frozenset({"print_job", "ams", "extruder", "external_spool"}),
         translation_key="print_weight",
         native_unit_of_measurement=UnitOfMass.GRAMS,
         suggested_unit_of_measurement=UnitOfMass.GRAMS,
@@ -598,8 +678,37 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
         value_fn=lambda self: self.coordinator.get_model().print_job.print_weight,
         extra_attributes=lambda self: self.coordinator.get_model().print_job.get_print_weights,
     ),
+    BambuLabSensorEntityDescription(
+        key="print_weight_used",
+        depends_on=frozenset({"print_job", "ams", "extruder", "external_spool"}),
+        translation_key="print_weight_used",
+        native_unit_of_measurement=UnitOfMass.GRAMS,
+        suggested_unit_of_measurement=UnitOfMass.GRAMS,
+        suggested_display_precision=1,
+        device_class=SensorDeviceClass.WEIGHT,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:printer-3d-nozzle",
+        value_fn=lambda self: self.coordinator.get_model().print_job.print_weight_used,
+        extra_attributes=lambda self: self.coordinator.get_model().print_job.get_print_weights_used,
+        exists_fn=lambda coordinator: coordinator.client.ftp_enabled,
+    ),
+    BambuLabSensorEntityDescription(
+        key="print_weight_remaining",
+        depends_on=frozenset({"print_job", "ams", "extruder", "external_spool"}),
+        translation_key="print_weight_remaining",
+        native_unit_of_measurement=UnitOfMass.GRAMS,
+        suggested_unit_of_measurement=UnitOfMass.GRAMS,
+        suggested_display_precision=1,
+        device_class=SensorDeviceClass.WEIGHT,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:printer-3d-nozzle-outline",
+        value_fn=lambda self: self.coordinator.get_model().print_job.print_weight_remaining,
+        extra_attributes=lambda self: self.coordinator.get_model().print_job.get_print_weights_remaining,
+        exists_fn=lambda coordinator: coordinator.client.ftp_enabled,
+    ),
     BambuLabSensorEntityDescription(
         key="active_tray",
+        depends_on=frozenset({"ams", "extruder", "external_spool", "info"}),
         translation_key="active_tray",
         icon="mdi:printer-3d-nozzle",
         value_fn=lambda self: "none" if self.coordinator.get_model().ams.active_tray is None else self.coordinator.get_model().ams.active_tray.name,
@@ -630,6 +739,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="nozzle_diameter",
+        depends_on=frozenset({"info", "extruder"}),
         translation_key="nozzle_diameter",
         native_unit_of_measurement=UnitOfLength.MILLIMETERS,
         suggested_unit_of_measurement=UnitOfLength.MILLIMETERS,
@@ -640,12 +750,14 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="nozzle_type",
+        depends_on=frozenset({"info", "extruder"}),
         translation_key="nozzle_type",
         icon="mdi:printer-3d-nozzle",
         value_fn=lambda self: self.coordinator.get_model().info.active_nozzle_type
     ),
     BambuLabSensorEntityDescription(
         key="left_nozzle_diameter",
+        depends_on=frozenset({"info"}),
         translation_key="left_nozzle_diameter",
         native_unit_of_measurement=UnitOfLength.MILLIMETERS,
         suggested_unit_of_measurement=UnitOfLength.MILLIMETERS,
@@ -657,6 +769,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="left_nozzle_type",
+        depends_on=frozenset({"info"}),
         translation_key="left_nozzle_type",
         icon="mdi:printer-3d-nozzle",
         value_fn=lambda self: self.coordinator.get_model().info.left_nozzle_type,
@@ -664,6 +777,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="right_nozzle_diameter",
+        depends_on=frozenset({"info"}),
         translation_key="right_nozzle_diameter",
         native_unit_of_measurement=UnitOfLength.MILLIMETERS,
         suggested_unit_of_measurement=UnitOfLength.MILLIMETERS,
@@ -675,6 +789,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="right_nozzle_type",
+        depends_on=frozenset({"info"}),
         translation_key="right_nozzle_type",
         icon="mdi:printer-3d-nozzle",
         value_fn=lambda self: self.coordinator.get_model().info.right_nozzle_type,
@@ -682,12 +797,14 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     ),
     BambuLabSensorEntityDescription(
         key="ip_address",
+        depends_on=frozenset({"info"}),
         translation_key="ip_address",
         entity_category=EntityCategory.DIAGNOSTIC,
         value_fn=lambda self: self.coordinator.get_model().info.ip_address
     ),
     BambuLabSensorEntityDescription(
         key="serial",
+        depends_on=frozenset({"info"}),
         translation_key="serial",
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:identifier",
@@ -698,6 +815,7 @@ PRINTER_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
 VIRTUAL_TRAY_BINARY_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     BambuLabBinarySensorEntityDescription(
         key="active_ams",
+        depends_on=frozenset({"ams", "extruder", "info"}),
         translation_key="active_ams",
         icon="mdi:check",
         device_class=BinarySensorDeviceClass.RUNNING,
@@ -708,6 +826,7 @@ VIRTUAL_TRAY_BINARY_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
 VIRTUAL_TRAY_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
     BambuLabSensorEntityDescription(
         key="external_spool",
+        depends_on=frozenset({"ams", "extruder", "external_spool", "info"}),
         translation_key="external_spool",
         icon="mdi:printer-3d-nozzle",
         value_fn=lambda self: self.coordinator.get_model().external_spool[self.index].name,
@@ -741,6 +860,7 @@ VIRTUAL_TRAY_SENSORS: tuple[BambuLabSensorEntityDescription, ...] = (
 AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     BambuLabAMSSensorEntityDescription(
         key="humidity_index",
+        depends_on=frozenset({"ams"}),
         translation_key="humidity_index",
         icon="mdi:water-percent",
         state_class=SensorStateClass.MEASUREMENT,
@@ -749,6 +869,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     ),
     BambuLabAMSSensorEntityDescription(
         key="humidity",
+        depends_on=frozenset({"ams"}),
         translation_key="humidity",
         native_unit_of_measurement=PERCENTAGE,
         device_class=SensorDeviceClass.HUMIDITY,
@@ -758,6 +879,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     ),
     BambuLabAMSSensorEntityDescription(
         key="temperature",
+        depends_on=frozenset({"ams"}),
         translation_key="ams_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -769,6 +891,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     ),
     BambuLabAMSSensorEntityDescription(
         key="remaining_drying_time",
+        depends_on=frozenset({"ams"}),
         translation_key="remaining_drying_time",
         native_unit_of_measurement=UnitOfTime.MINUTES,
         suggested_unit_of_measurement=UnitOfTime.HOURS,
@@ -781,6 +904,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     ),
     BambuLabAMSSensorEntityDescription(
         key="drying_temperature",
+        depends_on=frozenset({"ams"}),
         translation_key="drying_temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_unit_of_measurement=UnitOfTemperature.CELSIUS,
@@ -793,6 +917,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     ),
     BambuLabAMSSensorEntityDescription(
         key="drying_duration",
+        depends_on=frozenset({"ams"}),
         translation_key="drying_duration",
         native_unit_of_measurement=UnitOfTime.HOURS,
         suggested_display_precision=0,
@@ -804,6 +929,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = (
     ),
     BambuLabAMSSensorEntityDescription(
         key="drying_filament",
+        depends_on=frozenset({"ams"}),
         translation_key="drying_filament",
         icon="mdi:printer-3d-nozzle",
         value_fn=lambda self: self.coordinator.get_model().ams.data[self.index].drying_filament or None,
@@ -819,6 +945,7 @@ def _tray_sensor(tray_index: int, display_number: int) -> BambuLabAMSSensorEntit
         translation_key="tray",
         translation_placeholders={"tray_number": str(display_number)},
         icon="mdi:printer-3d-nozzle",
+        depends_on=frozenset({"ams", "extruder", "home_flag", "info"}),
         value_fn=lambda self, idx=tray_index: self.coordinator.get_model().ams.data[self.index].tray[idx].name,
         extra_attributes=lambda self, idx=tray_index, dnum=display_number:
         {
@@ -856,6 +983,7 @@ AMS_SENSORS: tuple[BambuLabAMSSensorEntityDescription, ...] = AMS_SENSORS + tupl
 HOTEND_RACK_SENSORS: tuple[BambuLabHotendRackSensorEntityDescription, ...] = (
     BambuLabHotendRackSensorEntityDescription(
         key="holder_position",
+        depends_on=frozenset({"hotend_rack"}),
         translation_key="hotend_rack_holder_position",
         icon="mdi:robot-industrial",
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -867,6 +995,7 @@ HOTEND_RACK_SENSORS: tuple[BambuLabHotendRackSensorEntityDescription, ...] = (
     ),
     BambuLabHotendRackSensorEntityDescription(
         key="holder_state",
+        depends_on=frozenset({"hotend_rack"}),
         translation_key="hotend_rack_holder_state",
         icon="mdi:robot-industrial",
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -890,6 +1019,7 @@ def _hotend_sensor(slot_id: int, display_id: int) -> BambuLabHotendRackSensorEnt
         device_class=SensorDeviceClass.ENUM,
         options=["mounted", "docked", "empty"],
         hotend_id=slot_id,
+        depends_on=frozenset({"hotend_rack"}),
         value_fn=lambda self: (
             lambda rack, sid: (
                 "mounted" if sid == rack.tar_id
@@ -1,12 +1,15 @@
 """Image platform."""
 from __future__ import annotations
 
+import time
+
 from datetime import datetime
 
 from homeassistant.components.image import ImageEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .const import DOMAIN, LOGGER, Options
 from .coordinator import BambuDataUpdateCoordinator
@@ -20,7 +23,9 @@ CHAMBER_IMAGE_SENSOR = BambuLabSensorEntityDescription(
         value_fn=lambda self: self.coordinator.get_model().get_camera_image(),
         exists_fn=lambda coordinator: coordinator.get_model().supports_feature(Features.CAMERA_IMAGE) and
                                       coordinator.get_option_enabled(Options.CAMERA) and
-                                      coordinator.get_option_enabled(Options.IMAGECAMERA)
+                                      coordinator.get_option_enabled(Options.IMAGECAMERA),
+        # New frames are delivered through the coordinator's frame listeners, not data updates.
+        depends_on=frozenset({"chamber_image"})
     )
 
 COVER_IMAGE_SENSOR = BambuLabSensorEntityDescription(
@@ -105,10 +110,42 @@ class ChamberImage(ImageEntity, BambuLabEntity):
         self.entity_description = description
         printer = self.coordinator.get_model().info
         self._attr_unique_id = f"{printer.serial}_{description.key}"
+        self._update_interval = max(0, coordinator.get_option_value(Options.IMAGEUPDATEINTERVALMS)) / 1000
+        self._last_frame_write = 0.0
+        self._pending_frame_write = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_frame_listener(self._frame_received))
+        self.async_on_remove(self._cancel_pending_frame_write)
+
+    @callback
+    def _frame_received(self, frame: bytes) -> None:
+        """Write state for a new frame, at most once per update interval. The last frame in an interval always lands."""
+        if self._pending_frame_write is not None:
+            return
+        delay = self._last_frame_write + self._update_interval - time.monotonic()
+        if delay > 0:
+            self._pending_frame_write = async_call_later(self.hass, delay, self._write_frame)
+        else:
+            self._write_frame()
+
+    @callback
+    def _write_frame(self, _now: datetime | None = None) -> None:
+        self._pending_frame_write = None
+        self._last_frame_write = time.monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _cancel_pending_frame_write(self) -> None:
+        if self._pending_frame_write is not None:
+            self._pending_frame_write()
+            self._pending_frame_write = None
 
     def image(self) -> bytes | None:
         """Return bytes of image."""
-        return self.coordinator.get_model().chamber_image.get_image()
+        # Fetches keep the on-demand camera connection alive while the image is being viewed.
+        return self.coordinator.request_chamber_image()
     
     @property
     def image_last_updated(self) -> datetime | None:
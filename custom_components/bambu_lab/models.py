@@ -1,3 +1,4 @@
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -6,7 +7,59 @@ from .const import DOMAIN, LOGGER, BRAND
 from .coordinator import BambuDataUpdateCoordinator
 
 
-class BambuLabEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
+class BambuLabCoordinatorEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
+    """Coordinator entity that only writes its state when something it reads has changed."""
+
+    # Device sub-models (temperature, ams, print_job, ...) read by entities without a description declaring them.
+    # None means the entity is refreshed on every coordinator update.
+    _depends_on: frozenset[str] | None = None
+    _last_written_state: tuple | None = None
+
+    @property
+    def depends_on(self) -> frozenset[str] | None:
+        """Return the Device sub-models this entity reads."""
+        depends_on = getattr(getattr(self, "entity_description", None), "depends_on", None)
+        return depends_on if depends_on is not None else self._depends_on
+
+    def _state_snapshot(self) -> tuple:
+        """Return the state and attributes this entity would write.
+
+        Attributes are often the model's own dicts, which are mutated in place, so they're copied one level deep. The
+        state machine compares attributes the same way when deciding whether a write changed anything.
+        """
+        if not self.available:
+            return (False,)
+        state_attributes = self.state_attributes
+        extra_state_attributes = self.extra_state_attributes
+        return (True,
+                self.state,
+                dict(state_attributes) if state_attributes else None,
+                dict(extra_state_attributes) if extra_state_attributes else None)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if this entity's inputs changed and it would produce a different state."""
+        if not self.coordinator.update_affects(self.depends_on):
+            return
+        try:
+            state = self._state_snapshot()
+        except Exception:
+            # Let the normal write path surface the error.
+            self.async_write_ha_state()
+            return
+        if state == self._last_written_state:
+            return
+        self.async_write_ha_state()
+        self._last_written_state = state
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        # Any write outside the coordinator path invalidates the snapshot.
+        self._last_written_state = None
+        super().async_write_ha_state()
+
+
+class BambuLabEntity(BambuLabCoordinatorEntity):
     """Defines a base Bambu entity."""
 
     _attr_has_entity_name = True
@@ -17,7 +70,7 @@ class BambuLabEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
         return self.coordinator.get_printer_device()
 
 
-class AMSEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
+class AMSEntity(BambuLabCoordinatorEntity):
     """Defines a base AMS entity."""
 
     _attr_has_entity_name = True
@@ -28,7 +81,7 @@ class AMSEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
         return self.coordinator.get_ams_device(self.index)
 
 
-class VirtualTrayEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
+class VirtualTrayEntity(BambuLabCoordinatorEntity):
     """Defines an External Spool entity."""
 
     _attr_has_entity_name = True
@@ -39,7 +92,7 @@ class VirtualTrayEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
         return self.coordinator.get_virtual_tray_device(self.suffix)
 
 
-class HotendRackEntity(CoordinatorEntity[BambuDataUpdateCoordinator]):
+class HotendRackEntity(BambuLabCoordinatorEntity):
     """Defines a base Hotend Rack entity."""
 
     _attr_has_entity_name = True
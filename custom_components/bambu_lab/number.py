@@ -32,6 +32,7 @@ class BambuLabNumberEntityDescription(NumberEntityDescription, BambuLabNumberEnt
     """Sensor entity description for Bambu Lab."""
     exists_fn: Callable[..., bool] = lambda _: True
     max_value_fn: Callable[..., float | None] = lambda _: None
+    depends_on: frozenset[str] | None = None
 
 
 NUMBERS: tuple[BambuLabNumberEntityDescription, ...] = (
@@ -46,6 +47,7 @@ NUMBERS: tuple[BambuLabNumberEntityDescription, ...] = (
         native_max_value=320, # TODO: Determine by actual printer model
         native_step=1,
         value_fn=lambda self: self.coordinator.get_model().temperature.active_nozzle_target_temperature,
+        depends_on=frozenset({"temperature", "extruder"}),
         set_value_fn=lambda self, value: self.coordinator.get_model().temperature.set_target_temp(TempEnum.NOZZLE, value),
     ),
     BambuLabNumberEntityDescription(
@@ -58,6 +60,7 @@ NUMBERS: tuple[BambuLabNumberEntityDescription, ...] = (
         native_max_value=120,  # TODO: Determine by actual printer model and voltage
         native_step=1,
         value_fn=lambda self: self.coordinator.get_model().temperature.target_bed_temp,
+        depends_on=frozenset({"temperature"}),
         set_value_fn=lambda self, value: self.coordinator.get_model().temperature.set_target_temp(TempEnum.HEATBED, value),
     ),
     BambuLabNumberEntityDescription(
@@ -71,6 +74,7 @@ NUMBERS: tuple[BambuLabNumberEntityDescription, ...] = (
         native_max_value=60,  # Default to X1E limit; overridden per-model at init
         native_step=1,
         value_fn=lambda self: self.coordinator.get_model().temperature.target_chamber_temp,
+        depends_on=frozenset({"temperature"}),
         set_value_fn=lambda self, value: self.coordinator.get_model().temperature.set_target_temp(TempEnum.CHAMBER, value),
         exists_fn=lambda coordinator: coordinator.get_model().supports_feature(Features.ACTIVE_CHAMBER_HEATER),
         max_value_fn=lambda coordinator: 60 if coordinator.get_model().info.device_type == Printers.X1E else 65,
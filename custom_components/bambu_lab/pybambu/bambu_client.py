@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import ftplib
 import functools
+import heapq
+import itertools
 import json
+import logging
 import math
 import os
 import queue
-import re
+import selectors
 import socket
 import ssl
 import struct
@@ -15,15 +19,18 @@ import threading
 import time
 import uuid
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Any
 
 import paho.mqtt.client as mqtt
 
-from .bambu_cloud import BambuCloud
+from .bambu_cloud import BambuCloud, CoverImageCache
 from .const import (
     LOGGER,
+    CHAMBER_IMAGE_MAX_PAYLOAD_SIZE,
     Features,
+    FtpPriority,
 )
 from .models import Device, SlicerSettings
 from .commands import (
@@ -32,7 +39,14 @@ from .commands import (
     START_PUSH,
 )
 from .tests import MockMQTTClient
-from .utils import safe_json_loads
+from .utils import RawPayloadCapture, SerialWorker, format_payload_for_log, safe_json_loads, background_executor
+
+WATCHDOG_TIMER = 60
+# Idle FTPS sessions kept open per printer, and how long an unused one is kept before it is closed.
+FTP_POOL_SIZE = 2
+FTP_IDLE_TIMEOUT = 60
+# Attempts at a download before giving up. Each retry reconnects and resumes where the last one stopped.
+FTP_DOWNLOAD_ATTEMPTS = 5
 
 class WatchdogThread(threading.Thread):
 
@@ -54,7 +68,6 @@ class WatchdogThread(threading.Thread):
         self.setName(f"{self._client._device.info.device_type}-Watchdog-{threading.get_native_id()}")
         LOGGER.debug("Watchdog thread started.")
 
-        WATCHDOG_TIMER = 60
         while not self._stop_event.is_set():
             # Wait out the remainder of the watchdog delay or 1s, whichever is higher.
             interval = time.time() - self._last_received_data
@@ -73,49 +86,80 @@ class WatchdogThread(threading.Thread):
         LOGGER.debug("Watchdog thread exited.")
 
 
+def chamber_image_auth_data(access_code: str) -> bytearray:
+    """Build the authentication packet sent when opening the chamber image stream."""
+    auth_data = bytearray()
+    username = 'bblp'
+
+    auth_data += struct.pack("<I", 0x40)   # '@'\0\0\0
+    auth_data += struct.pack("<I", 0x3000) # \0'0'\0\0
+    auth_data += struct.pack("<I", 0)      # \0\0\0\0
+    auth_data += struct.pack("<I", 0)      # \0\0\0\0
+    for i in range(0, len(username)):
+        auth_data += struct.pack("<c", username[i].encode('ascii'))
+    for i in range(0, 32 - len(username)):
+        auth_data += struct.pack("<x")
+    for i in range(0, len(access_code)):
+        auth_data += struct.pack("<c", access_code[i].encode('ascii'))
+    for i in range(0, 32 - len(access_code)):
+        auth_data += struct.pack("<x")
+    return auth_data
+
+
 class ChamberImageThread(threading.Thread):
+    INITIAL_FRAME_BUFFER_SIZE = 256 * 1024
+
     def __init__(self, client: BambuClient):
         self._client = client
         self._stop_event = threading.Event()
+        # Written to by stop() so a reader blocked waiting for the next frame wakes immediately.
+        self._wakeup_read, self._wakeup_write = socket.socketpair()
+        self._wakeup_read.setblocking(False)
         super().__init__()
         self.daemon = True
 
     def stop(self):
         self._stop_event.set()
+        try:
+            self._wakeup_write.send(b"\0")
+        except OSError:
+            pass
+
+    def _recv_exactly(self, sslSock, selector, view: memoryview) -> bool:
+        """Fill view from the socket, sleeping in the selector until data arrives. Returns False if stopped."""
+        received = 0
+        while received < len(view):
+            if self._stop_event.is_set():
+                return False
+            try:
+                count = sslSock.recv_into(view[received:])
+            except ssl.SSLWantReadError:
+                # Nothing buffered in the TLS layer or the socket - wait for the printer to send more.
+                selector.select()
+                continue
+            if count == 0:
+                if received == 0 and len(view) == 16:
+                    # This occurs if the wrong access code was provided.
+                    LOGGER.error("Chamber image connection rejected by the printer. Check provided access code and IP address.")
+                raise RuntimeError("Received no data unexpectedly.")
+            received += count
+        return True
 
     def run(self):
         self.setName(f"{self._client._device.info.device_type}-Chamber-{threading.get_native_id()}")
         LOGGER.debug("Chamber image thread started.")
 
-        auth_data = bytearray()
-
-        username = 'bblp'
-        access_code = self._client._access_code
+        auth_data = chamber_image_auth_data(self._client._access_code)
         hostname = self._client._device.info.ip_address
         port = 6000
         MAX_CONNECT_ATTEMPTS = 12
         connect_attempts = 0
 
-        auth_data += struct.pack("<I", 0x40)   # '@'\0\0\0
-        auth_data += struct.pack("<I", 0x3000) # \0'0'\0\0
-        auth_data += struct.pack("<I", 0)      # \0\0\0\0
-        auth_data += struct.pack("<I", 0)      # \0\0\0\0
-        for i in range(0, len(username)):
-            auth_data += struct.pack("<c", username[i].encode('ascii'))
-        for i in range(0, 32 - len(username)):
-            auth_data += struct.pack("<x")
-        for i in range(0, len(access_code)):
-            auth_data += struct.pack("<c", access_code[i].encode('ascii'))
-        for i in range(0, 32 - len(access_code)):
-            auth_data += struct.pack("<x")
-
         ctx = self._client.local_tls_context
 
         jpeg_start = bytearray([0xff, 0xd8, 0xff, 0xe0])
         jpeg_end = bytearray([0xff, 0xd9])
 
-        read_chunk_size = 4096 # 4096 is the max we'll get even if we increase this.
-
         # Payload format for each image is:
         # 16 byte header:
         #   Bytes 0:3   = little endian payload size for the jpeg image (does not include this header).
@@ -128,7 +172,13 @@ class ChamberImageThread(threading.Thread):
         # Bytes 20:payload_size-2           = jpeg image bytes
         # Bytes payload_size-2:payload_size = jpeg_end magic bytes
         #
-        # Further attempts to receive data will get SSLWantReadError until a new image is ready (1-2 seconds later)
+        # Nothing more arrives until a new image is ready (1-2 seconds later). The reader blocks in a selector until
+        # then rather than polling, so each frame is delivered as soon as its last byte arrives.
+        #
+        # Frames are received straight into a buffer reused for the whole stream (grown if a bigger frame comes
+        # along) and published as immutable bytes - the only copy made - which every consumer shares.
+        header = bytearray(16)
+        frame_buffer = bytearray(self.INITIAL_FRAME_BUFFER_SIZE)
         while connect_attempts < MAX_CONNECT_ATTEMPTS and not self._stop_event.is_set():
             connect_attempts += 1
             try:
@@ -136,8 +186,6 @@ class ChamberImageThread(threading.Thread):
                     try:
                         sslSock = ctx.wrap_socket(sock, server_hostname=hostname)
                         sslSock.write(auth_data)
-                        img = None
-                        payload_size = 0
 
                         status = sslSock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
                         LOGGER.debug(f"SOCKET STATUS: {status}")
@@ -151,52 +199,34 @@ class ChamberImageThread(threading.Thread):
                         continue
 
                     sslSock.setblocking(False)
-                    while not self._stop_event.is_set():
-                        try:
-                            dr = sslSock.recv(read_chunk_size)
-                        except ssl.SSLWantReadError:
-                            if self._stop_event.wait(1):
+                    with selectors.DefaultSelector() as selector:
+                        selector.register(sslSock, selectors.EVENT_READ)
+                        selector.register(self._wakeup_read, selectors.EVENT_READ)
+
+                        while not self._stop_event.is_set():
+                            if not self._recv_exactly(sslSock, selector, memoryview(header)):
                                 break
-                            continue
-
-                        if img is not None and len(dr) > 0:
-                            img += dr
-                            if len(img) > payload_size:
-                                # We got more data than we expected.
-                                LOGGER.error(f"Unexpected image payload received: {len(img)} > {payload_size}")
-                                # Reset buffer
-                                img = None
-                            elif len(img) == payload_size:
-                                # We should have the full image now.
+
+                            # Reset connect_attempts now we know the connect was successful.
+                            connect_attempts = 0
+                            payload_size = int.from_bytes(header[0:3], byteorder='little')
+                            if payload_size == 0 or payload_size > CHAMBER_IMAGE_MAX_PAYLOAD_SIZE:
+                                LOGGER.error(f"UNEXPECTED DATA RECEIVED: {payload_size}")
+                                raise RuntimeError(f"Unexpected image payload size received: {payload_size}")
+
+                            if payload_size > len(frame_buffer):
+                                frame_buffer = bytearray(payload_size)
+                            with memoryview(frame_buffer)[:payload_size] as img:
+                                if not self._recv_exactly(sslSock, selector, img):
+                                    break
+
                                 if img[:4] != jpeg_start:
                                     LOGGER.error("JPEG start magic bytes missing.")
                                 elif img[-2:] != jpeg_end:
                                     LOGGER.error("JPEG end magic bytes missing.")
                                 else:
                                     # Content is as expected. Send it.
-                                    self._client.on_jpeg_received(img)
-
-                                # Reset buffer
-                                img = None
-                            # else:
-                            # Otherwise we need to continue looping without reseting the buffer to receive the remaining data
-                            # and without delaying.
-
-                        elif len(dr) == 16:
-                            # We got the header bytes. Get the expected payload size from it and create the image buffer bytearray.
-                            # Reset connect_attempts now we know the connect was successful.
-                            connect_attempts = 0
-                            img = bytearray()
-                            payload_size = int.from_bytes(dr[0:3], byteorder='little')
-
-                        elif len(dr) == 0:
-                            # This occurs if the wrong access code was provided.
-                            LOGGER.error("Chamber image connection rejected by the printer. Check provided access code and IP address.")
-                            raise RuntimeError("Received no data unexpectedly.")
-
-                        else:
-                            LOGGER.error(f"UNEXPECTED DATA RECEIVED: {len(dr)}")
-                            raise RuntimeError(f"Unexpected data chunk size received: {len(dr)}")
+                                    self._client.on_jpeg_received(bytes(img))
 
             except OSError as e:
                 if e.errno == 113:
@@ -204,15 +234,17 @@ class ChamberImageThread(threading.Thread):
                 else:
                     LOGGER.error("Chamber Image thread outer exception occurred:")
                     LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
-                if not self._stop_event.is_set():
-                    time.sleep(2)  # Avoid a tight loop if this is a persistent error.
+                if self._stop_event.wait(2):  # Avoid a tight loop if this is a persistent error.
+                    break
 
             except Exception as e:
                 LOGGER.error(f"Chamber Image thread exception occurred:")
                 LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
-                if not self._stop_event.is_set():
-                    time.sleep(2)  # Avoid a tight loop if this is a persistent error.
+                if self._stop_event.wait(2):  # Avoid a tight loop if this is a persistent error.
+                    break
 
+        self._wakeup_read.close()
+        self._wakeup_write.close()
         LOGGER.debug("Chamber image thread exited.")
 
 
@@ -291,14 +323,375 @@ class MqttThread(threading.Thread):
 
         LOGGER.debug("MQTT listener thread exited.")
 
+class AsyncioWatchdog:
+    """Watchdog for the asyncio transport, run as a timer on the event loop rather than a thread."""
+
+    def __init__(self, client, loop: asyncio.AbstractEventLoop):
+        self._client = client
+        self._loop = loop
+        self._watchdog_fired = False
+        self._stopped = False
+        self._handle = None
+        self._last_received_data = time.time()
+
+    def start(self):
+        self._loop.call_soon_threadsafe(self._schedule, WATCHDOG_TIMER)
+
+    def stop(self):
+        self._stopped = True
+        self._loop.call_soon_threadsafe(self._cancel)
+
+    def join(self, timeout=None):
+        pass
+
+    def received_data(self):
+        self._last_received_data = time.time()
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self, delay: float):
+        if not self._stopped:
+            self._handle = self._loop.call_later(delay, self._check)
+
+    def _check(self):
+        self._handle = None
+        if self._stopped:
+            return
+        interval = time.time() - self._last_received_data
+        if not self._watchdog_fired and (interval > WATCHDOG_TIMER):
+            LOGGER.debug(f"Watchdog fired. No data received for {math.floor(interval)} seconds for {self._client._serial}.")
+            self._watchdog_fired = True
+            # Model updates happen on the printer's message worker, not the event loop.
+            self._client._message_worker.submit(self._client._on_watchdog_fired)
+        elif interval < WATCHDOG_TIMER:
+            self._watchdog_fired = False
+        # Wait out the remainder of the watchdog delay or 1s, whichever is higher.
+        self._schedule(max(1, WATCHDOG_TIMER - (time.time() - self._last_received_data)))
+
+
+class AsyncioChamberImage:
+    """Chamber image reader for the asyncio transport, run as a task on the event loop."""
+
+    MAX_CONNECT_ATTEMPTS = 12
+
+    def __init__(self, client, loop: asyncio.AbstractEventLoop):
+        self._client = client
+        self._loop = loop
+        self._stopped = False
+        self._task = None
+
+    def start(self):
+        self._loop.call_soon_threadsafe(self._start)
+
+    def stop(self):
+        self._stopped = True
+        self._loop.call_soon_threadsafe(self._cancel)
+
+    def join(self, timeout=None):
+        pass
+
+    def _start(self):
+        if not self._stopped:
+            self._task = self._loop.create_task(self._run())
+
+    def _cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        LOGGER.debug("Chamber image task started.")
+        auth_data = chamber_image_auth_data(self._client._access_code)
+        hostname = self._client._device.info.ip_address
+        port = 6000
+        connect_attempts = 0
+
+        # Creating the context may load certificates from disk.
+        ctx = await self._loop.run_in_executor(background_executor(), lambda: self._client.local_tls_context)
+
+        jpeg_start = bytearray([0xff, 0xd8, 0xff, 0xe0])
+        jpeg_end = bytearray([0xff, 0xd9])
+
+        # See ChamberImageThread for the payload format. Each image is a 16 byte header holding the little endian
+        # payload size followed by exactly that many bytes of jpeg data.
+        while connect_attempts < self.MAX_CONNECT_ATTEMPTS and not self._stopped:
+            connect_attempts += 1
+            writer = None
+            try:
+                reader, writer = await asyncio.open_connection(hostname, port, ssl=ctx, server_hostname=hostname)
+                writer.write(auth_data)
+                await writer.drain()
+
+                while not self._stopped:
+                    try:
+                        header = await reader.readexactly(16)
+                    except asyncio.IncompleteReadError as e:
+                        if len(e.partial) == 0:
+                            # This occurs if the wrong access code was provided.
+                            LOGGER.error("Chamber image connection rejected by the printer. Check provided access code and IP address.")
+                        raise RuntimeError("Received no data unexpectedly.")
+
+                    # Reset connect_attempts now we know the connect was successful.
+                    connect_attempts = 0
+                    payload_size = int.from_bytes(header[0:3], byteorder='little')
+                    if payload_size == 0 or payload_size > CHAMBER_IMAGE_MAX_PAYLOAD_SIZE:
+                        # A bad header means we've lost the frame boundaries. Drop the connection and start over.
+                        LOGGER.error(f"UNEXPECTED DATA RECEIVED: {payload_size}")
+                        raise RuntimeError(f"Unexpected image payload size received: {payload_size}")
+                    img = await reader.readexactly(payload_size)
+                    if img[:4] != jpeg_start:
+                        LOGGER.error("JPEG start magic bytes missing.")
+                    elif img[-2:] != jpeg_end:
+                        LOGGER.error("JPEG end magic bytes missing.")
+                    else:
+                        # Content is as expected. Send it.
+                        self._client.on_jpeg_received(img)
+
+            except asyncio.CancelledError:
+                break
+            except OSError as e:
+                if e.errno == 113:
+                    LOGGER.debug("Host is unreachable")
+                else:
+                    LOGGER.error("Chamber Image task outer exception occurred:")
+                    LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
+            except Exception as e:
+                LOGGER.error(f"Chamber Image task exception occurred:")
+                LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            if not self._stopped:
+                try:
+                    await asyncio.sleep(2)  # Avoid a tight loop if this is a persistent error.
+                except asyncio.CancelledError:
+                    break
+
+        LOGGER.debug("Chamber image task exited.")
+
+
+class CameraSession:
+    """Reference counted chamber camera connection.
+
+    The port 6000 stream is only opened while something wants frames: long lived consumers (an MJPEG viewer) hold
+    the session with acquire() until they release it, one-off consumers (snapshots, image entity fetches) call
+    request(). Once nothing holds the session and no request came in for idle_timeout seconds the stream is closed
+    again. An idle_timeout of 0 or less keeps the camera connected whenever it is enabled, as before.
+    """
+
+    def __init__(self, client, idle_timeout: float):
+        self._client = client
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._consumers = 0
+        self._last_request = None
+        self._cancel_idle_check = None
+        self._idle_generation = 0
+
+    @property
+    def always_on(self) -> bool:
+        return self._idle_timeout <= 0
+
+    @property
+    def consumers(self) -> int:
+        return self._consumers
+
+    @property
+    def wanted(self) -> bool:
+        """Whether the camera should currently be connected."""
+        if self.always_on or self._consumers > 0:
+            return True
+        return self._last_request is not None and time.monotonic() - self._last_request < self._idle_timeout
+
+    def acquire(self):
+        """Keep the camera connected until the returned release function is called."""
+        with self._lock:
+            self._consumers += 1
+            self._last_request = time.monotonic()
+            self._idle_generation += 1
+        self._client.start_camera()
+
+        released = False
+        def release():
+            nonlocal released
+            with self._lock:
+                if released:
+                    return
+                released = True
+                self._consumers -= 1
+                self._last_request = time.monotonic()
+                if self._consumers == 0:
+                    self._schedule_idle_check(self._idle_timeout)
+        return release
+
+    def request(self) -> bool:
+        """Keep the camera connected for at least another idle_timeout seconds. Returns True if it wasn't running."""
+        with self._lock:
+            self._last_request = time.monotonic()
+            if self._consumers == 0:
+                self._schedule_idle_check(self._idle_timeout)
+        return self._client.start_camera()
+
+    def stop(self):
+        """Forget all consumers and pending idle checks, e.g. when the client disconnects."""
+        with self._lock:
+            self._consumers = 0
+            self._last_request = None
+            self._idle_generation += 1
+            if self._cancel_idle_check is not None:
+                self._cancel_idle_check()
+                self._cancel_idle_check = None
+
+    def _schedule_idle_check(self, delay: float):
+        # Called with the lock held. A newer schedule, acquire or stop bumps the generation so stale checks do nothing.
+        if self.always_on:
+            return
+        self._idle_generation += 1
+        generation = self._idle_generation
+        if self._cancel_idle_check is not None:
+            self._cancel_idle_check()
+        self._cancel_idle_check = self._client.call_later(delay, functools.partial(self._idle_check, generation))
+
+    def _idle_check(self, generation: int):
+        with self._lock:
+            if generation != self._idle_generation or self._consumers > 0:
+                return
+            self._cancel_idle_check = None
+            remaining = self._last_request + self._idle_timeout - time.monotonic()
+            if remaining > 0:
+                self._schedule_idle_check(remaining)
+                return
+        LOGGER.debug(f"Chamber camera idle for {self._idle_timeout}s, disconnecting.")
+        self._client.stop_camera()
+
+
+class AsyncioMqttTransport:
+    """Drives the paho client from the asyncio event loop instead of a loop_forever thread.
+
+    The socket is watched with add_reader/add_writer, keepalives run from a 1s timer and the blocking connect runs
+    on the shared executor. Messages are handed to the printer's SerialWorker so model updates (and any blocking
+    work they trigger) stay off the event loop while keeping their order.
+    """
+
+    # Same as MqttThread.
+    RECONNECT_DELAY = 5
+    # Upper bound on packets handled per readable event, so one busy printer can't hog the loop.
+    MAX_PACKETS_PER_READ = 500
+
+    def __init__(self, client, loop: asyncio.AbstractEventLoop):
+        self._client = client
+        self._loop = loop
+        self._stopped = False
+        self._task = None
+
+    def start(self):
+        mqtt_client = self._client.client
+        mqtt_client.on_socket_open = self._on_socket_open
+        mqtt_client.on_socket_close = self._on_socket_close
+        mqtt_client.on_socket_register_write = self._on_socket_register_write
+        mqtt_client.on_socket_unregister_write = self._on_socket_unregister_write
+        self._task = self._loop.create_task(self._run())
+
+    def stop(self):
+        self._stopped = True
+        self._loop.call_soon_threadsafe(self._cancel)
+
+    def join(self, timeout=None):
+        pass
+
+    def _cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    # paho may call these from the executor thread running connect(), or from the printer's worker when publishing,
+    # so they are marshalled onto the loop in order. The fd is captured now as the socket may be closed by then.
+    def _on_socket_open(self, client, userdata, sock):
+        self._loop.call_soon_threadsafe(self._loop.add_reader, sock.fileno(), self._on_readable)
+
+    def _on_socket_close(self, client, userdata, sock):
+        self._loop.call_soon_threadsafe(self._remove_socket, sock.fileno())
+
+    def _on_socket_register_write(self, client, userdata, sock):
+        self._loop.call_soon_threadsafe(self._loop.add_writer, sock.fileno(), self._on_writable)
+
+    def _on_socket_unregister_write(self, client, userdata, sock):
+        self._loop.call_soon_threadsafe(self._loop.remove_writer, sock.fileno())
+
+    def _remove_socket(self, fd: int):
+        self._loop.remove_reader(fd)
+        self._loop.remove_writer(fd)
+
+    def _on_readable(self):
+        if self._client.client is not None:
+            self._client.client.loop_read(self.MAX_PACKETS_PER_READ)
+
+    def _on_writable(self):
+        if self._client.client is not None:
+            self._client.client.loop_write()
+
+    async def _run(self):
+        LOGGER.debug("MQTT asyncio transport started.")
+
+        exceptionSeen = ""
+        connectionSuccessful = False
+        while not self._stopped:
+            mqtt_client = self._client.client
+            if mqtt_client is None:
+                break
+            delay = self.RECONNECT_DELAY
+            try:
+                host = self._client.host if self._client._local_mqtt else self._client.bambu_cloud.cloud_mqtt_host
+                if connectionSuccessful:
+                    LOGGER.debug(f"Connect: Attempting Connection to {host}")
+                connectionSuccessful = False
+                await self._loop.run_in_executor(
+                    background_executor(), functools.partial(mqtt_client.connect, host, self._client._port, keepalive=5))
+                connectionSuccessful = True
+                exceptionSeen = ""
+
+                while not self._stopped and mqtt_client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+                    await asyncio.sleep(1)
+                # Connection dropped: reconnect quickly, as loop_forever does in threaded mode.
+                delay = 1
+            except asyncio.CancelledError:
+                break
+            except OSError as e:
+                # Includes TimeoutError and ConnectionError. A printer that is off fails every attempt so only log
+                # the first of a run of identical failures.
+                kind = f"{type(e).__name__}{e.errno or ''}"
+                if exceptionSeen != kind:
+                    LOGGER.debug(f"{type(e).__name__}: {e}.")
+                exceptionSeen = kind
+            except Exception as e:
+                LOGGER.error("An MQTT asyncio transport exception occurred:")
+                LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
+                delay = 1
+
+            if self._stopped:
+                break
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                break
+
+        LOGGER.debug("MQTT asyncio transport exited.")
+
+
 class ImplicitFTP_TLS(ftplib.FTP_TLS):
     """
     FTP_TLS subclass that automatically wraps sockets in SSL to support implicit FTPS.
     see https://stackoverflow.com/a/36049814
     """
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, tls_session: ssl.SSLSession | None = None, **kwargs):
         super().__init__(*args, **kwargs)
         self._sock = None
+        # Resuming an earlier session from the same context skips most of the slow handshake on the printer.
+        self.tls_session = tls_session
 
     @property
     def sock(self):
@@ -309,7 +702,7 @@ class ImplicitFTP_TLS(ftplib.FTP_TLS):
     def sock(self, value):
         """When modifying the socket, ensure that it is ssl wrapped."""
         if value is not None and not isinstance(value, ssl.SSLSocket):
-            value = self.context.wrap_socket(value)
+            value = self.context.wrap_socket(value, session=self.tls_session)
         self._sock = value
 
     """
@@ -342,6 +735,326 @@ class ImplicitFTP_TLS(ftplib.FTP_TLS):
             conn.close()
         return self.voidresp()    
 
+
+class FtpConnectionPool:
+    """Logged in FTPS sessions to one printer, kept open between operations.
+
+    The printer's FTP server is slow to accept connections (TCP connect, implicit TLS handshake, login and PROT P
+    take seconds on a P1), so sessions are handed back here after use instead of being closed. Each session is
+    checked out by one operation at a time, checked with NOOP before reuse and closed once it has been idle for
+    idle_timeout seconds. New sessions resume the TLS session of the previous one where the printer allows it.
+    """
+
+    def __init__(self, client, max_size: int = FTP_POOL_SIZE, idle_timeout: float = FTP_IDLE_TIMEOUT):
+        self._client = client
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: list[tuple[ImplicitFTP_TLS, float]] = []
+        self._tls_session = None
+        self._cancel_expiry = None
+        # Bumped by close() so sessions checked out before then are not handed back to the pool.
+        self._generation = 0
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @contextmanager
+    def connection(self):
+        """Check out a session for the exclusive use of one operation.
+
+        The session goes back to the pool when the block exits normally. If an exception escapes, it is closed
+        since the control connection may be mid-transfer.
+        """
+        generation = self._generation
+        ftp = self._checkout()
+        reusable = False
+        try:
+            yield ftp
+            reusable = True
+        finally:
+            self._checkin(ftp, reusable and generation == self._generation)
+
+    def close(self):
+        """Drop all idle sessions without waiting on the printer, e.g. when the client disconnects."""
+        with self._lock:
+            self._generation += 1
+            idle = self._idle
+            self._idle = []
+            self._tls_session = None
+            if self._cancel_expiry is not None:
+                self._cancel_expiry()
+                self._cancel_expiry = None
+        for ftp, _ in idle:
+            ftp.close()
+
+    def _checkout(self) -> ImplicitFTP_TLS:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                # Most recently used first, it's the least likely to have been dropped by the printer.
+                ftp, last_used = self._idle.pop()
+            if time.monotonic() - last_used > self._idle_timeout:
+                self._quit(ftp)
+                continue
+            try:
+                ftp.voidcmd("NOOP")
+                return ftp
+            except Exception as e:
+                LOGGER.debug(f"Discarding stale FTP session: {e}")
+                ftp.close()
+
+        ftp = self._client.ftp_connection(tls_session=self._tls_session)
+        if isinstance(ftp.sock, ssl.SSLSocket):
+            LOGGER.debug(f"Opened FTP session. TLS session reused: {ftp.sock.session_reused}")
+            self._tls_session = ftp.sock.session
+        return ftp
+
+    def download(self, ftp: ImplicitFTP_TLS, remote_path: str, local_path: str, size: int | None = None,
+                 progress=None, verify=None, attempts: int = FTP_DOWNLOAD_ATTEMPTS):
+        """Download remote_path to local_path, resuming after dropped connections.
+
+        Data goes to local_path + '.part', which only replaces local_path once the transfer is complete and the size
+        matches. A connection failure reopens ftp and continues from the end of the partial file with REST, and a
+        partial left by an earlier failed call is resumed the same way. A resumed file is stitched together from
+        more than one transfer, so it must also pass verify(part_path), if given. An uninterrupted transfer is
+        trusted as is. progress is called with the number of bytes received so far, including any resumed ones.
+
+        Raises ftplib.error_perm if the file isn't available and IOError if the download can't be completed.
+        """
+        part_path = f"{local_path}.part"
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if size is not None and offset > size:
+            offset = 0
+        if offset:
+            LOGGER.debug(f"Resuming download of '{remote_path}' at {offset} bytes")
+
+        resumed = False
+        for attempt in range(1, attempts + 1):
+            start = time.monotonic()
+            received = offset
+            try:
+                with open(part_path, 'r+b' if offset else 'wb') as f:
+                    f.truncate(offset)
+                    f.seek(offset)
+                    received = offset
+
+                    def write(data):
+                        nonlocal received
+                        f.write(data)
+                        received += len(data)
+                        if progress is not None:
+                            progress(received)
+
+                    resumed = resumed or offset > 0
+                    ftp.retrbinary(f"RETR {remote_path}", write, rest=offset or None)
+                self._record_transfer(received - offset, start)
+                break
+            except ftplib.error_perm as e:
+                if not offset:
+                    raise
+                # Most likely REST isn't supported. Start again from scratch.
+                LOGGER.debug(f"Resume of '{remote_path}' rejected: {e}. Restarting download.")
+                offset = 0
+                resumed = False
+            except Exception as e:
+                self._record_transfer(received - offset, start)
+                offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+                if attempt == attempts:
+                    raise IOError(f"Download of '{remote_path}' failed after {attempts} attempts: {e}") from e
+                LOGGER.debug(f"Download of '{remote_path}' interrupted at {offset} bytes ({type(e).__name__}: {e}). "
+                             f"Retrying {attempt}/{attempts - 1}.")
+                self._reopen(ftp)
+        else:
+            # Every attempt failed without raising, e.g. the last resume was rejected.
+            raise IOError(f"Download of '{remote_path}' failed after {attempts} attempts")
+
+        actual_size = os.path.getsize(part_path)
+        if (size is not None and actual_size != size) or (resumed and verify is not None and not verify(part_path)):
+            # Don't resume from data that's known to be bad.
+            os.remove(part_path)
+            raise IOError(f"Downloaded '{remote_path}' failed verification ({actual_size} bytes, expected {size})")
+        os.replace(part_path, local_path)
+
+    def _record_transfer(self, size: int, start: float):
+        if size > 0:
+            self._client.ftp_scheduler.record_transfer(size, time.monotonic() - start)
+
+    def _reopen(self, ftp: ImplicitFTP_TLS):
+        ftp.close()
+        ftp.tls_session = self._tls_session
+        self._client.ftp_login(ftp)
+
+    def _checkin(self, ftp: ImplicitFTP_TLS, reusable: bool):
+        if reusable and ftp.sock is not None:
+            with self._lock:
+                if len(self._idle) < self._max_size:
+                    self._idle.append((ftp, time.monotonic()))
+                    if self._cancel_expiry is None:
+                        self._cancel_expiry = self._client.call_later(self._idle_timeout, self._expire)
+                    return
+        self._quit(ftp)
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            self._cancel_expiry = None
+            expired = [ftp for ftp, last_used in self._idle if now - last_used >= self._idle_timeout]
+            self._idle = [(ftp, last_used) for ftp, last_used in self._idle if now - last_used < self._idle_timeout]
+            if self._idle:
+                oldest = min(last_used for _, last_used in self._idle)
+                self._cancel_expiry = self._client.call_later(oldest + self._idle_timeout - now, self._expire)
+        for ftp in expired:
+            LOGGER.debug("Closing idle FTP session")
+            self._quit(ftp)
+
+    @staticmethod
+    def _quit(ftp: ImplicitFTP_TLS):
+        try:
+            ftp.quit()
+        except Exception:
+            ftp.close()
+
+
+class FtpJob:
+    """A unit of FTP work run by the FtpScheduler. The target is called with the job as its only argument."""
+
+    def __init__(self, priority: FtpPriority, name: str, target, sequence: int):
+        self.priority = priority
+        self.name = name
+        self.target = target
+        self.sequence = sequence
+        self.attempt = 1
+        self.future = concurrent.futures.Future()
+        self._cancelled = threading.Event()
+        self._retry_delay = None
+
+    def __lt__(self, other: FtpJob) -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the work is no longer wanted. Long running targets should check this and stop early."""
+        return self._cancelled.is_set()
+
+    def retry(self, delay: float):
+        """Return this from the target to run it again after delay seconds without holding a worker meanwhile."""
+        self._retry_delay = delay
+
+
+class FtpScheduler:
+    """Runs a printer's FTP work in priority order with bounded concurrency.
+
+    The printer only copes with a couple of FTP sessions at once, so instead of every download and upload starting
+    its own thread and competing for them, work is queued here and run at most max_concurrency jobs at a time
+    (matching the connection pool size). Model downloads go before uploads, which go before timelapses.
+    """
+
+    def __init__(self, client, max_concurrency: int = FTP_POOL_SIZE):
+        self._client = client
+        self._max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._queue: list[FtpJob] = []
+        self._running: set[FtpJob] = set()
+        self._waiting: set[FtpJob] = set()
+        self._sequence = itertools.count()
+        self._throughput = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs queued, running or waiting to retry."""
+        return len(self._queue) + len(self._running) + len(self._waiting)
+
+    @property
+    def throughput(self) -> float:
+        """Transfer rate of the most recent download or upload in bytes per second."""
+        return self._throughput
+
+    def submit(self, priority: FtpPriority, name: str, target) -> FtpJob:
+        job = FtpJob(priority, name, target, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._queue, job)
+        LOGGER.debug(f"Queued FTP job '{name}'. Queue depth: {self.queue_depth}")
+        self._dispatch()
+        self._notify()
+        return job
+
+    def cancel(self, job: FtpJob):
+        """Cancel a job. Queued jobs never run, running jobs see job.cancelled and shouldn't retry."""
+        with self._lock:
+            job._cancelled.set()
+            if job in self._queue:
+                self._queue.remove(job)
+                heapq.heapify(self._queue)
+                if not job.future.cancel():
+                    # Queued for a retry, its future is already running.
+                    job.future.set_result(None)
+        LOGGER.debug(f"Cancelled FTP job '{job.name}'")
+        self._notify()
+
+    def record_transfer(self, size: int, seconds: float):
+        if seconds > 0:
+            self._throughput = size / seconds
+            self._notify()
+
+    def _dispatch(self):
+        to_start = []
+        with self._lock:
+            while self._queue and len(self._running) < self._max_concurrency:
+                job = heapq.heappop(self._queue)
+                self._running.add(job)
+                to_start.append(job)
+        for job in to_start:
+            self._client.start_background(functools.partial(self._run, job),
+                                          name=f"{self._client._device.info.device_type}-FTP")
+
+    def _run(self, job: FtpJob):
+        # Retries reuse the job whose future is already running.
+        if job.attempt == 1 and not job.future.set_running_or_notify_cancel():
+            self._finish(job)
+            return
+        try:
+            result = job.target(job)
+        except Exception as e:
+            LOGGER.error(f"FTP job '{job.name}' failed with exception {e}")
+            self._finish(job)
+            job.future.set_exception(e)
+            return
+
+        if job._retry_delay is not None and not job.cancelled:
+            delay, job._retry_delay = job._retry_delay, None
+            job.attempt += 1
+            with self._lock:
+                self._waiting.add(job)
+            self._finish(job)
+            self._client.call_later(delay, functools.partial(self._requeue, job))
+            return
+
+        self._finish(job)
+        job.future.set_result(result)
+
+    def _requeue(self, job: FtpJob):
+        with self._lock:
+            self._waiting.discard(job)
+            if not job.cancelled:
+                heapq.heappush(self._queue, job)
+        if job.cancelled:
+            job.future.set_result(None)
+        self._dispatch()
+        self._notify()
+
+    def _finish(self, job: FtpJob):
+        with self._lock:
+            self._running.discard(job)
+        self._dispatch()
+        self._notify()
+
+    def _notify(self):
+        self._client.callback("event_printer_data_update", frozenset({"ftp"}))
+
+
 @dataclass
 class BambuClient:
     """Initialize Bambu Client to connect to MQTT Broker"""
@@ -366,6 +1079,9 @@ class BambuClient:
         self._local_mqtt = config.get('local_mqtt', False)
         self._serial = config.get('serial', '')
         self._enable_camera = config.get('enable_camera', True) and (self.host != "")
+        self._camera_lock = threading.Lock()
+        # Seconds the chamber camera stays connected after its last consumer went away. 0 keeps it always connected.
+        self.camera_session = CameraSession(self, float(config.get('camera_idle_timeout', 60)))
         self._enable_ftp = (self.host != "")
         if self._serial.startswith('MOCK-'):
             self._enable_ftp = False
@@ -378,8 +1094,21 @@ class BambuClient:
             # We always cache at least one model as we use that to avoid redownloading from ftp on startup.
             self._print_cache_count = 1
         self._timelapse_cache_count = max(-1, int(config.get('timelapse_cache_count', 0)))
+        self._compress_gcode = bool(config.get('compress_gcode', False))
         self._disable_ssl_verify = config.get('disable_ssl_verify', False)
         self._cache_path = config.get('file_cache_path', f'/config/www/media/ha-bambulab/{self._serial}')
+        # Opt-in: run MQTT, the watchdog and the camera on the event loop and blocking work on shared worker pools
+        # instead of dedicated threads per printer.
+        self._asyncio_transport = config.get('asyncio_transport', False)
+        self._loop = None
+        self._message_worker = SerialWorker(f"{self._serial} message")
+        self.cover_image_cache = CoverImageCache(os.path.join(self._cache_path, 'covers'))
+        self.ftp_pool = FtpConnectionPool(self)
+        self.ftp_scheduler = FtpScheduler(self)
+        self._payload_capture = None
+        if config.get('capture_raw_payloads', False):
+            self._payload_capture = RawPayloadCapture(
+                config.get('raw_payload_capture_path', os.path.join(self._cache_path, 'mqtt_payloads.log')))
 
         self._connected = False
         self._device_confirmed = False
@@ -388,11 +1117,12 @@ class BambuClient:
         self._last_error_code = 0
 
         self._device = Device(self)
-        self.bambu_cloud = BambuCloud(
+        self.bambu_cloud = BambuCloud.shared(
             region = config.get('region', ''),
             email = config.get('email', ''),
             username = config.get('username', ''),
-            auth_token = config.get('auth_token', '')
+            auth_token = config.get('auth_token', ''),
+            user = self
         )
         self._loaded_slicer_settings = False
         self.slicer_settings = SlicerSettings(self)
@@ -411,6 +1141,52 @@ class BambuClient:
     def cache_path(self):
         return self._cache_path
 
+    @property
+    def asyncio_transport(self) -> bool:
+        """Whether the asyncio transport is in use (requested and connected from an event loop)."""
+        return self._loop is not None
+
+    def start_background(self, target, name: str):
+        """Run blocking work (FTP downloads, ...) off the MQTT/event loop path.
+
+        The threaded transport starts a dedicated thread. The asyncio transport queues the work on the shared
+        background pool so the thread count doesn't grow with the number of printers. Message processing has its
+        own pool so this work can't delay it.
+        """
+        if self.asyncio_transport:
+            return background_executor().submit(target)
+        thread = threading.Thread(target=target, name=name)
+        thread.start()
+        return thread
+
+    def call_later(self, delay: float, target):
+        """Run target off the event loop after delay seconds. Returns a function that cancels it.
+
+        The threaded transport uses a timer thread. The asyncio transport schedules on the event loop and runs
+        target on the shared background pool.
+        """
+        if self.asyncio_transport:
+            loop = self._loop
+            handle = None
+            cancelled = False
+
+            def schedule():
+                nonlocal handle
+                if not cancelled:
+                    handle = loop.call_later(delay, background_executor().submit, target)
+
+            def cancel():
+                nonlocal cancelled
+                cancelled = True
+                loop.call_soon_threadsafe(lambda: handle.cancel() if handle is not None else None)
+
+            loop.call_soon_threadsafe(schedule)
+            return cancel
+        timer = threading.Timer(delay, target)
+        timer.daemon = True
+        timer.start()
+        return timer.cancel
+
     @property
     def user_language(self):
         return self._user_language
@@ -424,9 +1200,14 @@ class BambuClient:
     def camera_enabled(self):
         return self._enable_camera
 
-    def callback(self, event: str):
+    def callback(self, event: str, changed: frozenset | None = None):
+        """Forward an event to the registered callback. For event_printer_data_update, changed names the
+        Device sub-models (temperature, ams, print_job, ...) that changed. None means anything may have changed."""
         if self._callback is not None:
-            self._callback(event)
+            if changed is None:
+                self._callback(event)
+            else:
+                self._callback(event, changed)
 
     def set_camera_enabled(self, enable):
         self._enable_camera = enable and (self.host != "")
@@ -439,6 +1220,10 @@ class BambuClient:
     def ftp_enabled(self):
         return self._enable_ftp
 
+    @property
+    def compress_gcode(self) -> bool:
+        return self._compress_gcode
+
     @property
     def local_tls_context(self):
         if self._disable_ssl_verify:
@@ -464,9 +1249,16 @@ class BambuClient:
                                       clean_session=True)
             self.client.enable_logger()
         self._callback = callback
-        self.client.on_connect = self.on_connect
-        self.client.on_disconnect = self.on_disconnect
-        self.client.on_message = self.on_message
+        if self._asyncio_transport and not self._mock:
+            self._loop = asyncio.get_running_loop()
+            # paho calls these on the event loop - hand them to the printer's worker, in order.
+            self.client.on_connect = lambda *args: self._message_worker.submit(self.on_connect, *args)
+            self.client.on_disconnect = lambda *args: self._message_worker.submit(self.on_disconnect, *args)
+            self.client.on_message = lambda *args: self._message_worker.submit(self.on_message, *args)
+        else:
+            self.client.on_connect = self.on_connect
+            self.client.on_disconnect = self.on_disconnect
+            self.client.on_message = self.on_message
         # Set reconnect polling back off. Starting at 1s doubling up to 30s between connection attempts.
         self.client.reconnect_delay_set(min_delay=1, max_delay=30)
 
@@ -479,8 +1271,12 @@ class BambuClient:
         else:
             self.client.username_pw_set(self._username, password=self._auth_token)
 
-        LOGGER.debug("Starting MQTT listener thread")
-        self._mqtt = MqttThread(self)
+        if self.asyncio_transport:
+            LOGGER.debug("Starting MQTT asyncio transport")
+            self._mqtt = AsyncioMqttTransport(self, self._loop)
+        else:
+            LOGGER.debug("Starting MQTT listener thread")
+            self._mqtt = MqttThread(self)
         self._mqtt.start()
 
         await self._device.print_job.async_prune_print_history_files()
@@ -501,23 +1297,39 @@ class BambuClient:
         LOGGER.debug(f"On Connect: Connected to printer: {result_code}")
         self._on_connect()
 
-    def start_camera(self):
+    def start_camera(self) -> bool:
+        """Connect the chamber camera if it is enabled, wanted by a consumer and not already running.
+
+        Returns True if the camera was started.
+        """
         if not self._device.supports_feature(Features.CAMERA_RTSP):
             if self._device.supports_feature(Features.CAMERA_IMAGE):
-                if self._enable_camera and not self._test_mode:
+                if self._enable_camera and not self._test_mode and self._device_confirmed and self.camera_session.wanted:
                     if self._device.info.ip_address != "" and self._device.info.ip_address != "0.0.0.0" and self._access_code != "":
-                        LOGGER.debug("Starting Chamber Image thread")
-                        self._camera = ChamberImageThread(self)
-                        self._camera.start()
+                        with self._camera_lock:
+                            if self._camera is not None:
+                                return False
+                            if self.asyncio_transport:
+                                LOGGER.debug("Starting Chamber Image task")
+                                self._camera = AsyncioChamberImage(self, self._loop)
+                            else:
+                                LOGGER.debug("Starting Chamber Image thread")
+                                self._camera = ChamberImageThread(self)
+                            self._camera.start()
+                            return True
                     else:
                         LOGGER.debug("Skipping camera setup as local access details not provided.")
+        return False
 
     def stop_camera(self):
-        if self._camera is not None:
-            LOGGER.debug("Stopping Chamber Image thread")
-            self._camera.stop()
-            self._camera.join()
+        with self._camera_lock:
+            camera = self._camera
             self._camera = None
+        if camera is not None:
+            LOGGER.debug("Stopping Chamber Image thread")
+            camera.stop()
+            if camera is not threading.current_thread():
+                camera.join()
 
     def _on_connect(self):
         self._connected = True
@@ -533,11 +1345,15 @@ class BambuClient:
         LOGGER.debug("Device confirmed: first data payload received from printer")
 
         if self._device.info.ip_address != "" and self._device.info.ip_address != "0.0.0.0":
-            LOGGER.debug("Starting watchdog thread")
-            self._watchdog = WatchdogThread(self)
+            if self.asyncio_transport:
+                LOGGER.debug("Starting watchdog timer")
+                self._watchdog = AsyncioWatchdog(self, self._loop)
+            else:
+                LOGGER.debug("Starting watchdog thread")
+                self._watchdog = WatchdogThread(self)
             self._watchdog.start()
 
-        # Start camera if enabled
+        # Start camera if enabled and something is waiting for frames.
         self.start_camera()
 
     def on_disconnect(self,
@@ -579,7 +1395,7 @@ class BambuClient:
         self._device.info.set_online(False)
         self.publish(START_PUSH)
 
-    def on_jpeg_received(self, bytes):
+    def on_jpeg_received(self, bytes: bytes):
         self._device.chamber_image.set_image(bytes)
 
     def on_message(self, client, userdata, message):
@@ -589,19 +1405,17 @@ class BambuClient:
                 # We have been shut down. Drop any messages we receive late.
                 return
 
-            if not self._loaded_slicer_settings:
-                # Only update slicer settings once per successful connection to the printer.
+            if not self._loaded_slicer_settings or self.slicer_settings.refresh_due:
+                # Update slicer settings once per successful connection to the printer and again whenever the
+                # cached copy expires during a long connection.
                 self._loaded_slicer_settings = True
                 self.slicer_settings.update()
 
-            if self._refreshed:
-                # X1 mqtt payload is inconsistent. Adjust it for consistent logging.
-                clean_msg = re.sub(r"\\n *", "", str(message.payload))
-                # And adjust all payload to be meet proper json syntax instead of being pythonized so I can feed it directly into an online json prettifier
-                clean_msg = re.sub(r"\'", "\"", str(clean_msg))
-                clean_msg = re.sub(r"True", "true", str(clean_msg))
-                clean_msg = re.sub(r"False", "false", str(clean_msg))
-                LOGGER.debug(f"Received data: {clean_msg}")
+            if self._payload_capture is not None:
+                self._payload_capture.write(message.topic, message.payload)
+
+            if self._refreshed and LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(f"Received data: {format_payload_for_log(message.payload)}")
 
             json_data = safe_json_loads(message.payload)
             if json_data.get("event"):
@@ -679,11 +1493,21 @@ class BambuClient:
             self._watchdog.join(timeout=5)
             self._watchdog = None
             
-        if self._camera is not None:
-            LOGGER.debug("Stopping camera thread")
-            self._camera.stop()
-            self._camera.join(timeout=5)
+        self.camera_session.stop()
+        with self._camera_lock:
+            camera = self._camera
             self._camera = None
+        if camera is not None:
+            LOGGER.debug("Stopping camera thread")
+            camera.stop()
+            camera.join(timeout=5)
+
+        self.ftp_pool.close()
+
+        if self._payload_capture is not None:
+            self._payload_capture.close()
+
+        self.bambu_cloud.release(self)
         
         # Disconnect MQTT client
         if self.client is not None:
@@ -696,12 +1520,17 @@ class BambuClient:
                 self.client = None
 
 
-    def ftp_connection(self) -> ImplicitFTP_TLS:
-        ftp = ImplicitFTP_TLS(context=self.local_tls_context)
+    def ftp_connection(self, tls_session: ssl.SSLSession | None = None) -> ImplicitFTP_TLS:
+        """Open a new FTPS session. Prefer ftp_pool.connection() which reuses sessions between operations."""
+        ftp = ImplicitFTP_TLS(context=self.local_tls_context, tls_session=tls_session)
+        self.ftp_login(ftp)
+        return ftp
+
+    def ftp_login(self, ftp: ImplicitFTP_TLS):
+        """Connect and log in an FTPS session, e.g. to reopen one that dropped."""
         ftp.connect(host=self._device.info.ip_address, port=990, timeout=15)
         ftp.login(user='bblp', passwd=self._access_code)
         ftp.prot_p()
-        return ftp
 
     async def try_connection(self):
         """Test if we can connect to an MQTT broker."""
@@ -747,14 +1576,8 @@ class BambuClient:
         def try_on_message(client, userdata, message):
             json_data = safe_json_loads(message.payload)
 
-            # X1 mqtt payload is inconsistent. Adjust it for consistent logging.
-            clean_msg = re.sub(r"\\n *", "", str(message.payload))
-            # And adjust all payload to be meet proper json syntax instead of being pythonized so I can feed it directly into an online json prettifier
-            clean_msg = re.sub(r"\'", "\"", str(clean_msg))
-            clean_msg = re.sub(r"True", "true", str(clean_msg))
-            clean_msg = re.sub(r"False", "false", str(clean_msg))
-
-            LOGGER.debug(f"try_on_message: Got '{clean_msg}'")
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(f"try_on_message: Got '{format_payload_for_log(message.payload)}'")
             if json_data.get("info") and json_data.get("info").get("command") == "get_version":
                 LOGGER.debug("Got Version Command Data")
                 self._device.info_update(data=json_data.get("info"))
@@ -4,8 +4,16 @@ from enum import (
 )
 
 import base64
+import hashlib
 import json
+import os
 import requests
+import threading
+import time
+import weakref
+
+from collections import OrderedDict
+from urllib.parse import urlsplit
 
 cloudscraper_available = False
 try:
@@ -78,8 +86,147 @@ class CsrfError(Exception):
         super().__init__("Blocked by CSRF cookie requirement")
         self.error_code = 403
 
+class _InFlightRequest:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class CoverImageCache:
+    """Cover images by URL, kept in memory (LRU) and on disk, revalidated with ETag / If-Modified-Since.
+
+    Cover URLs are presigned so their query string changes on every task list fetch - entries are keyed by the URL
+    path which identifies the image itself.
+    """
+
+    def __init__(self, directory: str, max_disk_bytes: int = 50 * 1024 * 1024, max_memory_entries: int = 8):
+        self._directory = directory
+        self._max_disk_bytes = max_disk_bytes
+        self._max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(urlsplit(url).path.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        return os.path.join(self._directory, f"{key}.img"), os.path.join(self._directory, f"{key}.json")
+
+    def _load(self, key: str):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+        image_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            with open(image_path, "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(content).hexdigest() != meta.get("sha256"):
+            LOGGER.debug(f"Discarding corrupt cached cover image '{image_path}'")
+            return None
+        entry = (content, meta)
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _store(self, key: str, content: bytes, meta: dict):
+        self._remember(key, (content, meta))
+        image_path, meta_path = self._paths(key)
+        try:
+            os.makedirs(self._directory, exist_ok=True)
+            with open(f"{image_path}.tmp", "wb") as f:
+                f.write(content)
+            os.replace(f"{image_path}.tmp", image_path)
+            with open(f"{meta_path}.tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(f"{meta_path}.tmp", meta_path)
+            self._prune(keep=image_path)
+        except OSError as e:
+            LOGGER.debug(f"Failed to write cover image cache '{image_path}': {e}")
+
+    def _touch(self, key: str):
+        image_path, _ = self._paths(key)
+        try:
+            os.utime(image_path)
+        except OSError:
+            pass
+
+    def _prune(self, keep: str):
+        """Delete the least recently used images until the disk cache fits its size cap."""
+        images = []
+        for entry in os.scandir(self._directory):
+            if entry.name.endswith(".img"):
+                stat = entry.stat()
+                images.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in images)
+        for _, size, path in sorted(images):
+            if total <= self._max_disk_bytes:
+                break
+            if os.path.samefile(path, keep):
+                continue
+            LOGGER.debug(f"Pruning cached cover image '{path}'")
+            for file_path in (path, f"{path[:-len('.img')]}.json"):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    pass
+            total -= size
+
+    def get(self, url: str, cloud: BambuCloud) -> bytes | None:
+        """Return the image at url, from the cache if the server confirms it is unchanged."""
+        key = self._key(url)
+        entry = self._load(key)
+        headers = {}
+        if entry is not None:
+            meta = entry[1]
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = cloud.download_response(url, headers=headers)
+        if response is None or response.status_code not in (200, 304):
+            if entry is not None:
+                LOGGER.debug("Cover image download failed. Using cached image.")
+            return None if entry is None else entry[0]
+        if response.status_code == 304 and entry is not None:
+            LOGGER.debug("Cover image unchanged. Using cached image.")
+            self._touch(key)
+            return entry[0]
+
+        content = response.content
+        self._store(key, content, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        })
+        return content
+
+
+# Cloud clients shared by every printer on the same account. Entries go away with the last printer using them.
+_shared_clients = weakref.WeakValueDictionary()
+_shared_clients_lock = threading.Lock()
+
 @dataclass
 class BambuCloud:
+
+    # How long (seconds) the cached task list is used before asking the cloud again.
+    TASKLIST_TTL = 10
+    # Tasks kept per printer in the task list cache.
+    TASKLIST_MAX_TASKS_PER_DEVICE = 20
   
     def __init__(self, region: str, email: str, username: str, auth_token: str):
         self._region = region
@@ -87,6 +234,80 @@ class BambuCloud:
         self._username = username
         self._auth_token = auth_token
         self._tfaKey = None
+        # Persistent HTTP sessions (keep-alive + connection pool), one per connection mechanism.
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        # GETs currently on the wire, so concurrent identical requests share a single round trip.
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        # Task list cache: tasks by id plus, per deviceId, the ids newest first.
+        self._tasks_by_id = {}
+        self._task_ids_by_device = {}
+        self._tasklist_fetched = None
+        self._tasklist_lock = threading.Lock()
+        # Printer clients holding this instance through shared(). Weak so clients that are never disconnected, like
+        # the config flow's connection tests, don't keep it open.
+        self._users = weakref.WeakSet()
+
+    @classmethod
+    def shared(cls, region: str, email: str, username: str, auth_token: str, user=None) -> BambuCloud:
+        """Return the cloud client shared by all printers on this account.
+
+        user is the object taking the reference. Pass the same object to release() when done with it.
+        """
+        key = (region, email, username, auth_token)
+        with _shared_clients_lock:
+            cloud = _shared_clients.get(key)
+            if cloud is None:
+                cloud = cls(region=region, email=email, username=username, auth_token=auth_token)
+                _shared_clients[key] = cloud
+            if user is not None:
+                cloud._users.add(user)
+            return cloud
+
+    def release(self, user):
+        """Drop a reference taken with shared(). The last user to go closes the HTTP sessions."""
+        with _shared_clients_lock:
+            self._users.discard(user)
+            if len(self._users) > 0:
+                return
+        self.close()
+
+    def _session(self, mechanism: ConnectionMechanismEnum):
+        with self._sessions_lock:
+            session = self._sessions.get(mechanism)
+            if session is None:
+                if mechanism == ConnectionMechanismEnum.CURL_CFFI:
+                    if not curl_available:
+                        LOGGER.debug(f"Curl library is unavailable.")
+                        raise CurlUnavailableError()
+                    session = curl_requests.Session(impersonate=IMPERSONATE_BROWSER)
+                elif mechanism == ConnectionMechanismEnum.CLOUDSCRAPER:
+                    session = cloudscraper.create_scraper()
+                elif mechanism == ConnectionMechanismEnum.REQUESTS:
+                    session = requests.Session()
+                else:
+                    raise NotImplementedError()
+                self._sessions[mechanism] = session
+            return session
+
+    def _request(self, method: str, url: str, mechanism: ConnectionMechanismEnum = None, **kwargs):
+        session = self._session(CONNECTION_MECHANISM if mechanism is None else mechanism)
+        try:
+            return session.request(method, url, **kwargs)
+        finally:
+            # Only the connections are meant to be reused - keep each call as stateless as a one-off request.
+            session.cookies.clear()
+
+    def close(self):
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
 
     def _get_headers(self):
         return {
@@ -141,25 +362,39 @@ class BambuCloud:
         LOGGER.debug(f"Response: {response.status_code}")
 
     def _get(self, urlenum: BambuUrl):
+        url = get_Url(urlenum, self._region)
+        key = (url, self._auth_token)
+        with self._in_flight_lock:
+            request = self._in_flight.get(key)
+            owner = request is None
+            if owner:
+                request = _InFlightRequest()
+                self._in_flight[key] = request
+
+        if not owner:
+            LOGGER.debug(f"Joining in-flight request for {urlenum.name}")
+            request.done.wait()
+            if request.error is not None:
+                raise request.error
+            return request.response
+
+        try:
+            request.response = self._send_get(url)
+            return request.response
+        except Exception as e:
+            request.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            request.done.set()
+
+    def _send_get(self, url: str):
         try:
-            url = get_Url(urlenum, self._region)
             headers=self._get_headers_with_auth_token()
-            if CONNECTION_MECHANISM == ConnectionMechanismEnum.CURL_CFFI:
-                if not curl_available:
-                    LOGGER.debug(f"Curl library is unavailable.")
-                    raise CurlUnavailableError()
-                response = curl_requests.get(url, headers=headers, timeout=10, impersonate=IMPERSONATE_BROWSER)
-            elif CONNECTION_MECHANISM == ConnectionMechanismEnum.CLOUDSCRAPER:
-                if len(headers) == 0:
-                    headers = self._get_headers()
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(url, headers=headers, timeout=10)
-            elif CONNECTION_MECHANISM == ConnectionMechanismEnum.REQUESTS:
-                if len(headers) == 0:
-                    headers = self._get_headers()
-                response = requests.get(url, headers=headers, timeout=10)
-            else:
-                raise NotImplementedError()
+            if CONNECTION_MECHANISM != ConnectionMechanismEnum.CURL_CFFI and len(headers) == 0:
+                headers = self._get_headers()
+            response = self._request("GET", url, headers=headers, timeout=10)
         except Exception as e:
             LOGGER.error(f"Connection to Bambu Cloud failed: {e}")
             raise e
@@ -171,22 +406,9 @@ class BambuCloud:
 
     def _post(self, urlenum: BambuUrl, json: str, headers={}, return400=False):
         url = get_Url(urlenum, self._region)
-        if CONNECTION_MECHANISM == ConnectionMechanismEnum.CURL_CFFI:
-            if not curl_available:
-                LOGGER.debug(f"Curl library is unavailable.")
-                raise CurlUnavailableError()
-            response = curl_requests.post(url, headers=headers, json=json, impersonate=IMPERSONATE_BROWSER)
-        elif CONNECTION_MECHANISM == ConnectionMechanismEnum.CLOUDSCRAPER:
-            if len(headers) == 0:
-                headers = self._get_headers()
-            scraper = cloudscraper.create_scraper()
-            response = scraper.post(url, headers=headers, json=json)
-        elif CONNECTION_MECHANISM == ConnectionMechanismEnum.REQUESTS:
-            if len(headers) == 0:
-                headers = self._get_headers()
-            response = requests.post(url, headers=headers, json=json)
-        else:
-            raise NotImplementedError()
+        if CONNECTION_MECHANISM != ConnectionMechanismEnum.CURL_CFFI and len(headers) == 0:
+            headers = self._get_headers()
+        response = self._request("POST", url, headers=headers, json=json)
 
         self._test_response(response, return400)
         
@@ -563,10 +785,21 @@ class BambuCloud:
             return None
         return response.json()
 
-    def get_latest_task_for_printer(self, deviceId: str) -> dict:
+    def get_latest_task_for_printer(self, deviceId: str, task_id: str = None, subtask_name: str = None,
+                                    fresh: bool = False) -> dict:
+        """Latest cloud task for a printer.
+
+        The task list cache is shared by every printer on the account so another printer's fetch a few seconds
+        ago may predate this printer's new task. fresh skips the cache TTL (used at print start) and the list is
+        fetched again whenever the cached newest task doesn't match the task the printer reports over MQTT.
+        """
         LOGGER.debug(f"Getting latest task for printer from Bambu Cloud")
         try:
-            data = self.get_tasklist_for_printer(deviceId)
+            data = self.get_tasklist_for_printer(deviceId, fresh=fresh)
+            expected = task_id not in (None, "", "0") or bool(subtask_name)
+            if not fresh and expected and (len(data) == 0 or not self._task_matches(data[0], task_id, subtask_name)):
+                LOGGER.debug("Cached task list doesn't have the current task. Fetching it again.")
+                data = self.get_tasklist_for_printer(deviceId, fresh=True)
             if len(data) != 0:
                 return data[0]
             LOGGER.debug("No tasks found for printer")
@@ -574,14 +807,57 @@ class BambuCloud:
         except:
             return None
 
-    def get_tasklist_for_printer(self, deviceId: str) -> dict:
+    @staticmethod
+    def _task_matches(task: dict, task_id: str, subtask_name: str) -> bool:
+        if task_id not in (None, "", "0"):
+            return str(task.get('id')) == str(task_id)
+        if subtask_name:
+            return task.get('title') == subtask_name
+        return True
+
+    def get_tasklist_for_printer(self, deviceId: str, fresh: bool = False) -> dict:
         LOGGER.debug(f"Getting full task list for printer from Bambu Cloud")
-        tasks = []
+        self._refresh_tasklist(fresh)
+        with self._tasklist_lock:
+            return [self._tasks_by_id[id] for id in self._task_ids_by_device.get(deviceId, [])]
+
+    def _refresh_tasklist(self, fresh: bool = False):
+        """Bring the task list cache up to date unless it was refreshed within the TTL (or fresh is set).
+
+        The cloud returns tasks newest first. Every hit replaces the cached copy, as a task changes as it runs (end
+        time, weight...) and its presigned cover URL changes on every fetch. Each printer's list is rebuilt in the
+        order of the hits, followed by any older cached tasks that weren't returned this time, and capped at
+        TASKLIST_MAX_TASKS_PER_DEVICE.
+        """
+        with self._tasklist_lock:
+            if not fresh and self._tasklist_fetched is not None and \
+               time.monotonic() - self._tasklist_fetched < self.TASKLIST_TTL:
+                return
+
         data = self.get_tasklist()
-        for task in data['hits']:
-            if task['deviceId'] == deviceId:
-                tasks.append(task)
-        return tasks
+        if data is None:
+            if self._tasklist_fetched is None:
+                raise ValueError("Failed to get task list")
+            LOGGER.debug("Failed to refresh task list. Using cached task list.")
+            return
+
+        with self._tasklist_lock:
+            ids_by_device = {}
+            for task in data.get('hits', []):
+                id = task.get('id')
+                ids = ids_by_device.setdefault(task.get('deviceId'), [])
+                # Anything past the cap for its printer is older than every task kept.
+                if len(ids) < self.TASKLIST_MAX_TASKS_PER_DEVICE and id not in ids:
+                    ids.append(id)
+                    self._tasks_by_id[id] = task
+
+            for deviceId, ids in ids_by_device.items():
+                ids += [id for id in self._task_ids_by_device.get(deviceId, []) if id not in ids]
+                for id in ids[self.TASKLIST_MAX_TASKS_PER_DEVICE:]:
+                    self._tasks_by_id.pop(id, None)
+                self._task_ids_by_device[deviceId] = ids[:self.TASKLIST_MAX_TASKS_PER_DEVICE]
+            LOGGER.debug(f"Task list cache has {len(self._tasks_by_id)} tasks across {len(self._task_ids_by_device)} printers.")
+            self._tasklist_fetched = time.monotonic()
 
     def get_device_type_from_device_product_name(self, device_product_name: str):
         if device_product_name == "X1 Carbon":
@@ -589,17 +865,26 @@ class BambuCloud:
         return device_product_name.replace(" ", "").upper()
 
     def download(self, url: str) -> bytearray:
+        response = self.download_response(url)
+        if response is None:
+            return None
+        return response.content
+
+    def download_response(self, url: str, headers: dict = None):
         LOGGER.debug(f"Downloading cover image: {url}")
         try:
             # This is just a standard download from an unauthenticated end point.
-            response = requests.get(url)
+            return self._request("GET", url, mechanism=ConnectionMechanismEnum.REQUESTS, headers=headers, timeout=10)
         except:
             return None
-        return response.content
 
     @property
     def username(self):
         return self._username
+
+    @property
+    def region(self):
+        return self._region
     
     @property
     def auth_token(self):
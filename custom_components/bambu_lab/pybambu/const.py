@@ -82,6 +82,13 @@ class TempEnum(IntEnum):
     CHAMBER = 3
 
 
+class FtpPriority(IntEnum):
+    """Order in which queued FTP work runs. Lower runs first."""
+    MODEL = 1,
+    UPLOAD = 2,
+    TIMELAPSE = 3
+
+
 CURRENT_STAGE_IDS = {
     "default": "unknown",
     0: "printing",
@@ -318,6 +325,28 @@ UNKNOWN_TRAY_LABEL = "?"
 
 AMS_TRAY_STATE_LEGACY_MAX = 3
 
+# Largest chamber image frame accepted from the camera stream. The header allows up to 16MB but real frames are
+# well under 1MB, so anything bigger means the stream is out of sync.
+CHAMBER_IMAGE_MAX_PAYLOAD_SIZE = 4 * 1024 * 1024
+
+# Distinct thumbnail sizes of the current chamber image kept at once (dashboard tiles, notifications, ...).
+CHAMBER_IMAGE_MAX_VARIANTS = 4
+
+# Pick image object detection results remembered, so re-parsing the same plate skips the image scan.
+PICK_IMAGE_CACHE_SIZE = 8
+
+# Sidecar record of the metadata parsed from a cached 3mf, so a reprint doesn't have to parse the archive again.
+# Bump the version whenever the record's contents change.
+MODEL_METADATA_EXTENSION = ".metadata.json"
+MODEL_METADATA_VERSION = 2
+
+# Per-layer index of the plate gcode stored next to a cached 3mf. Bump the version whenever the index format changes.
+GCODE_INDEX_EXTENSION = ".gcode_index.json"
+GCODE_INDEX_VERSION = 1
+
+# Seconds an interrupted FTP download (.part file) is kept around to be resumed.
+PARTIAL_DOWNLOAD_MAX_AGE = 24 * 60 * 60
+
 class AMSTrayStateFlags(IntEnum):
     SPOOL = 0x01,
     METADATA = 0x02,
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from .const import LOGGER
+
+_LAYER_CHANGE = (b"; CHANGE_LAYER", b";LAYER_CHANGE")
+_Z_HEIGHT = (b"; Z_HEIGHT:", b";Z:")
+_START_OBJECT = b"; start printing object, unique label id:"
+_STOP_OBJECT = b"; stop printing object"
+_MOVES = (b"G0", b"G1", b"G2", b"G3")
+
+
+class GcodeIndex:
+    """Per-layer index of a plate's gcode, built in a single streaming pass.
+
+    Each layer records the byte offset it starts at, its Z height, the slicer's remaining time estimate (M73 R) and
+    the filament extruded before it per tool, so the printer's layer progress can be turned into a position in the
+    file, time left and filament used without reading the gcode again. Objects record the layers and the XY extents
+    they print over, keyed by the label id used to skip them.
+    """
+
+    def __init__(self, layers: list | None = None, filaments: list | None = None, objects: dict | None = None,
+                 total_extrusion: list | None = None):
+        # [byte offset, z, remaining minutes, [mm extruded before this layer per filament]]
+        self.layers = layers or []
+        # Tool numbers in the order they are first used. Extrusion lists are indexed the same way.
+        self.filaments = filaments or []
+        # label id -> {"layers": [first, last], "extents": [min x, min y, max x, max y]}
+        self.objects = objects or {}
+        self.total_extrusion = total_extrusion or []
+
+    @property
+    def layer_count(self) -> int:
+        return len(self.layers)
+
+    def layer(self, layer_num: int) -> list | None:
+        """The index entry for a 1-based layer number as reported by the printer."""
+        if 1 <= layer_num <= len(self.layers):
+            return self.layers[layer_num - 1]
+        return None
+
+    def extruded_before_layer(self, layer_num: int) -> dict:
+        """Filament extruded in mm per tool number before the given layer started."""
+        if layer_num > len(self.layers):
+            extrusion = self.total_extrusion
+        else:
+            entry = self.layer(max(1, layer_num))
+            extrusion = entry[3] if entry else []
+        return {tool: extrusion[i] if i < len(extrusion) else 0.0 for i, tool in enumerate(self.filaments)}
+
+    def remaining_minutes(self, layer_num: int) -> int | None:
+        entry = self.layer(layer_num)
+        return entry[2] if entry else None
+
+    def to_dict(self) -> dict:
+        return {
+            "layers": self.layers,
+            "filaments": self.filaments,
+            "objects": self.objects,
+            "total_extrusion": self.total_extrusion,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> GcodeIndex:
+        return cls(data["layers"], data["filaments"], data["objects"], data["total_extrusion"])
+
+    @classmethod
+    def build(cls, stream) -> GcodeIndex:
+        """Index gcode read line by line from a binary stream. Nothing but the current line is held in memory."""
+        layers = []
+        filaments = []
+        objects = {}
+        extruded = {}
+        tool = 0
+        absolute_xy = True
+        absolute_e = False
+        last_e = 0.0
+        x = y = 0.0
+        current_object = None
+        offset = 0
+
+        # Extents of the object currently being printed are kept in locals and merged when it stops, as moves are
+        # the bulk of the file.
+        min_x = min_y = float("inf")
+        max_x = max_y = float("-inf")
+        was_extruding = False
+        extruding_tool = None
+
+        for line in stream:
+            line_offset = offset
+            offset += len(line)
+
+            first = line[:1]
+            if first == b"G":
+                if b";" in line:
+                    line = line.split(b";", 1)[0]
+                code = line.split()
+                command = code[0] if code else b""
+                if command in _MOVES:
+                    e = None
+                    new_x, new_y = x, y
+                    try:
+                        for word in code[1:]:
+                            letter = word[0]
+                            if letter == 0x45:  # 'E'
+                                e = float(word[1:])
+                            elif letter == 0x58:  # 'X'
+                                new_x = float(word[1:]) if absolute_xy else x + float(word[1:])
+                            elif letter == 0x59:  # 'Y'
+                                new_y = float(word[1:]) if absolute_xy else y + float(word[1:])
+                    except ValueError:
+                        continue
+
+                    if e is not None:
+                        if absolute_e:
+                            e, last_e = e - last_e, e
+                        if tool != extruding_tool:
+                            if tool not in extruded:
+                                extruded[tool] = 0.0
+                                filaments.append(tool)
+                            extruding_tool = tool
+                        extruded[tool] += e
+
+                        if e > 0 and current_object is not None:
+                            # The move's start is the previous end point, already counted unless it was a travel.
+                            if not was_extruding:
+                                if x < min_x: min_x = x
+                                if x > max_x: max_x = x
+                                if y < min_y: min_y = y
+                                if y > max_y: max_y = y
+                            if new_x < min_x: min_x = new_x
+                            if new_x > max_x: max_x = new_x
+                            if new_y < min_y: min_y = new_y
+                            if new_y > max_y: max_y = new_y
+                            was_extruding = True
+                        else:
+                            was_extruding = False
+                    else:
+                        was_extruding = False
+                    x, y = new_x, new_y
+                elif command == b"G90":
+                    absolute_xy = True
+                elif command == b"G91":
+                    absolute_xy = False
+                elif command == b"G92":
+                    for word in code[1:]:
+                        if word[0] == 0x45:  # 'E'
+                            last_e = _number(word[1:])
+                continue
+
+            line = line.strip()
+            if not line:
+                continue
+
+            if first == b";":
+                if line.startswith(_LAYER_CHANGE):
+                    layers.append([line_offset, None, None, [extruded.get(t, 0.0) for t in filaments]])
+                elif line.startswith(_Z_HEIGHT):
+                    if layers and layers[-1][1] is None:
+                        layers[-1][1] = _number(line.split(b":", 1)[1])
+                elif line.startswith(_START_OBJECT):
+                    current_object = line.rsplit(b":", 1)[1].strip().decode()
+                    layer_num = len(layers)
+                    entry = objects.setdefault(current_object, {"layers": [layer_num, layer_num], "extents": None})
+                    entry["layers"][1] = layer_num
+                    extents = entry["extents"]
+                    if extents is not None:
+                        min_x, min_y, max_x, max_y = extents
+                    was_extruding = False
+                elif line.startswith(_STOP_OBJECT):
+                    if current_object is not None and min_x <= max_x:
+                        objects[current_object]["extents"] = [min_x, min_y, max_x, max_y]
+                    current_object = None
+                    min_x = min_y = float("inf")
+                    max_x = max_y = float("-inf")
+                continue
+
+            code = line.split(b";", 1)[0].split()
+            if not code:
+                continue
+            command = code[0]
+
+            if command == b"M73":
+                # M73 P<percent> R<remaining minutes>. The first one in a layer is the estimate at its start.
+                if layers and layers[-1][2] is None:
+                    for word in code[1:]:
+                        if word[0] == 0x52:  # 'R'
+                            layers[-1][2] = int(_number(word[1:]))
+            elif command[0] == 0x54:  # 'T'
+                # Tool change. Bambu also uses T255/T1000 etc. as special codes, which aren't filaments.
+                try:
+                    new_tool = int(command[1:])
+                except ValueError:
+                    continue
+                if new_tool < 255:
+                    tool = new_tool
+            elif command == b"M82":
+                absolute_e = True
+            elif command == b"M83":
+                absolute_e = False
+
+        if current_object is not None and min_x <= max_x:
+            objects[current_object]["extents"] = [min_x, min_y, max_x, max_y]
+
+        # Layers without an M73 of their own carry the estimate from the layer before.
+        remaining = None
+        for layer in layers:
+            if layer[2] is None:
+                layer[2] = remaining
+            remaining = layer[2]
+
+        total_extrusion = [round(extruded[t], 2) for t in filaments]
+        for layer in layers:
+            layer[3] = [round(mm, 2) for mm in layer[3]]
+
+        LOGGER.debug(f"Indexed {len(layers)} layers, {len(objects)} objects, {offset} bytes of gcode")
+        return cls(layers, filaments, objects, total_extrusion)
+
+
+def _number(value: bytes) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import ftplib
+import functools
 import json
 import math
 import os
@@ -8,12 +9,15 @@ import re
 import threading
 import shutil
 import time
+import zlib
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
+from io import BytesIO
 from dateutil import parser, tz
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import BadZipFile, ZipFile
 from typing import List, Union
 import xml.etree.ElementTree as ElementTree
 from PIL import Image
@@ -41,9 +45,22 @@ from .utils import (
     upgrade_template,
     get_wiki_url_for_hms_error,
     ams_tray_spool_loaded,
+    downscale_jpeg,
+    zip_crc_ok,
+    pick_image_identify_ids,
+    file_fingerprint,
+    extract_zip_member,
 )
 from .const import (
     LOGGER,
+    FtpPriority,
+    CHAMBER_IMAGE_MAX_VARIANTS,
+    PARTIAL_DOWNLOAD_MAX_AGE,
+    PICK_IMAGE_CACHE_SIZE,
+    MODEL_METADATA_EXTENSION,
+    MODEL_METADATA_VERSION,
+    GCODE_INDEX_EXTENSION,
+    GCODE_INDEX_VERSION,
     Features,
     FansEnum,
     Home_Flag_Values,
@@ -56,6 +73,7 @@ from .const import (
     TempEnum, Print_Fun_Values,
     UNKNOWN_TRAY_LABEL,
 )
+from .gcode import GcodeIndex
 from .commands import (
     CHAMBER_LIGHT_ON,
     CHAMBER_LIGHT_OFF,
@@ -72,6 +90,77 @@ from .commands import (
     HEATBED_LIGHT_OFF,
 )
 
+_UNSET = object()
+
+
+class DirtyTracking:
+    """Records which attributes hold a different value than at the last clear_changes()"""
+
+    def __setattr__(self, name, value):
+        attrs = self.__dict__
+        old_value = attrs.get(name, _UNSET)
+        object.__setattr__(self, name, value)
+        if old_value is value or name not in attrs:
+            # Same object, or a property setter that records its own backing field.
+            return
+        changes = attrs.get("_changed_fields")
+        if changes is not None and name in changes:
+            # Already changed in this update. Drop it again if it's back to where it started.
+            if changes[name] is not _UNSET and _values_equal(changes[name], value):
+                del changes[name]
+        elif not _values_equal(old_value, value):
+            self._record_change(name, old_value)
+
+    def _record_change(self, name, old_value):
+        changes = self.__dict__.get("_changed_fields")
+        if changes is None:
+            changes = {}
+            object.__setattr__(self, "_changed_fields", changes)
+        changes.setdefault(name, old_value)
+
+    def mark_changed(self, *names):
+        """Record in-place mutations (dict/list members, nested objects) that __setattr__ cannot see"""
+        for name in names:
+            self._record_change(name, _UNSET)
+
+    def discard_change(self, name):
+        changes = self.__dict__.get("_changed_fields")
+        if changes is not None:
+            changes.pop(name, None)
+
+    def clear_changes(self):
+        changes = self.__dict__.get("_changed_fields")
+        if changes:
+            changes.clear()
+
+    @property
+    def changed_fields(self) -> frozenset:
+        return frozenset(self.__dict__.get("_changed_fields", ()))
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.__dict__.get("_changed_fields"))
+
+    def _set_item(self, name, key, value):
+        container = self.__dict__[name]
+        try:
+            unchanged = _values_equal(container[key], value)
+        except (KeyError, IndexError):
+            unchanged = False
+        container[key] = value
+        if not unchanged:
+            self.mark_changed(name)
+
+
+def _values_equal(a, b) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
 class Device:
     def __init__(self, client):
         self._client = client
@@ -100,26 +189,47 @@ class Device:
         self.print_fun = PrintFun(client = client)
 
     def print_update(self, data) -> bool:
-        send_event = False
-        send_event = send_event | self.info.print_update(data = data)
-        send_event = send_event | self.upgrade.print_update(data = data)
-        send_event = send_event | self.print_job.print_update(data = data)
-        send_event = send_event | self.lights.print_update(data = data)
-        send_event = send_event | self.fans.print_update(data = data)
-        send_event = send_event | self.speed.print_update(data = data)
-        send_event = send_event | self.stage.print_update(data = data)
-        send_event = send_event | self.extruder.print_update(data = data) # Must be before the AMS and external spools and temperature
-        send_event = send_event | self.temperature.print_update(data = data)
-        send_event = send_event | self.ams.print_update(data = data)
-        send_event = send_event | self.external_spool[0].print_update(data = data)
-        send_event = send_event | self.external_spool[1].print_update(data = data)
-        send_event = send_event | self.hms.print_update(data = data)
-        send_event = send_event | self.print_error.print_update(data = data)
-        send_event = send_event | self.camera.print_update(data = data)
-        send_event = send_event | self.home_flag.print_update(data = data)
-        send_event = send_event | self.print_fun.print_update(data = data)
-        send_event = send_event | self.extruder_tool.print_update(data = data)
-        send_event = send_event | self.hotend_rack.print_update(data = data)
+        changed = set()
+        if self.info.print_update(data = data):
+            changed.add("info")
+        if self.upgrade.print_update(data = data):
+            changed.add("upgrade")
+        if self.print_job.print_update(data = data):
+            changed.add("print_job")
+        if self.lights.print_update(data = data):
+            changed.add("lights")
+        if self.fans.print_update(data = data):
+            changed.add("fans")
+        if self.speed.print_update(data = data):
+            changed.add("speed")
+        if self.stage.print_update(data = data):
+            changed.add("stage")
+        if self.extruder.print_update(data = data): # Must be before the AMS and external spools and temperature
+            changed.add("extruder")
+        if self.temperature.print_update(data = data):
+            changed.add("temperature")
+        if self.ams.print_update(data = data):
+            changed.add("ams")
+        # Evaluate both external spools - each needs to parse its own slot.
+        if self.external_spool[0].print_update(data = data) | self.external_spool[1].print_update(data = data):
+            changed.add("external_spool")
+        if self.hms.print_update(data = data):
+            changed.add("hms")
+        if self.print_error.print_update(data = data):
+            changed.add("print_error")
+        if self.camera.print_update(data = data):
+            changed.add("camera")
+        if self.home_flag.print_update(data = data):
+            changed.add("home_flag")
+        if self.print_fun.print_update(data = data):
+            changed.add("print_fun")
+        if self.extruder_tool.print_update(data = data):
+            changed.add("extruder_tool")
+        if self.hotend_rack.print_update(data = data):
+            changed.add("hotend_rack")
+        if self.info.has_changes:
+            # Print job state transitions accumulate usage hours on the info model after it has been updated.
+            changed.add("info")
 
         if data.get("command") == "push_status":
             if data.get("msg", 0) == 0:
@@ -130,16 +240,22 @@ class Device:
                 if send_ready_event:
                     self._client.callback("event_printer_ready")
 
-        self._client.callback("event_printer_data_update")
+        if changed:
+            self._client.callback("event_printer_data_update", frozenset(changed))
+        return len(changed) != 0
 
     @property
     def has_full_printer_data(self):
         return (self.push_all_data != None) and (self.get_version_data != None)
 
     def info_update(self, data):
-        self.info.info_update(data = data)
-        self.home_flag.info_update(data = data)
-        self.ams.info_update(data = data)
+        changed = set()
+        if self.info.info_update(data = data):
+            changed.add("info")
+        if self.home_flag.info_update(data = data):
+            changed.add("home_flag")
+        if self.ams.info_update(data = data):
+            changed.add("ams")
 
         if data.get("command") == "get_version":
             send_ready_event = self.get_version_data is None and self.push_all_data is not None
@@ -149,11 +265,27 @@ class Device:
             if send_ready_event:
                 self._client.callback("event_printer_ready")
 
+        # Firmware versions (and the features they enable) and AMS serials only arrive here.
+        if changed:
+            self._client.callback("event_printer_data_update", frozenset(changed))
 
     def observe_system_command(self, data):
         if data.get("command") == "ledctrl" and data.get("led_node") == "heatbed_light":
             self.lights.observe_system_command(data)
 
+    def refresh_filament_names(self):
+        """Re-resolve tray filament names after the custom filament definitions were (re)loaded."""
+        changed = set()
+        for ams in list(self.ams.data.values()):
+            for tray in ams.tray:
+                if tray is not None and tray.refresh_name():
+                    changed.add("ams")
+        for spool in self.external_spool:
+            if spool.refresh_name():
+                changed.add("external_spool")
+        if changed:
+            self._client.callback("event_printer_data_update", frozenset(changed))
+
     def supports_feature(self, feature):
         a1_printers = {Printers.A1, Printers.A1MINI}
         a2_printers = {Printers.A2L}
@@ -320,7 +452,7 @@ class Device:
                 self.info.device_type != Printers.A2L)
 
 @dataclass
-class Lights:
+class Lights(DirtyTracking):
     """Return all light related info"""
     chamber_light: str
     chamber_light2: str
@@ -349,7 +481,7 @@ class Lights:
         return self.heatbed_light == "on"
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         # "lights_report": [
         #     {
@@ -387,7 +519,7 @@ class Lights:
         # Currently, the status of headbed light is not available (even switching it using printer UI shows an
         #   error in MQTT: "did not find the valid led: heatbed_light"). Therefore, it is initially in an unknown state.
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     def observe_system_command(self, data):
         # State can be inferred from system->command = ledctrl, but the initial state is still not known.
@@ -424,7 +556,7 @@ class Lights:
 
 
 @dataclass
-class Camera:
+class Camera(DirtyTracking):
     """Return camera related info"""
     recording: str
     resolution: str
@@ -441,7 +573,7 @@ class Camera:
         self._fired_camera_disabled_event = False
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         # "ipcam": {
         #   "ipcam_dev": "1",
@@ -463,10 +595,10 @@ class Camera:
                     self._fired_camera_disabled_event = True
                     self._client.callback("event_printer_live_view_disabled")
         
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
 @dataclass
-class Temperature:
+class Temperature(DirtyTracking):
     """Return all temperature related info"""
     bed_temp: int
     target_bed_temp: int
@@ -510,7 +642,7 @@ class Temperature:
         return self.target_nozzle_temps[0]
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         # New firmware puts bed temperature in two different places. Low word is current value. High word is the target.
         # "device": {
@@ -569,13 +701,13 @@ class Temperature:
             for entry in extruder_data:
                 if entry.get("id") in (0, 1):
                     if "temp" in entry:
-                        self.nozzle_temps[entry["id"]] = entry["temp"] & 0xFFFF
-                        self.target_nozzle_temps[entry["id"]] = (entry["temp"] >> 16) & 0xFFFF
+                        self._set_item("nozzle_temps", entry["id"], entry["temp"] & 0xFFFF)
+                        self._set_item("target_nozzle_temps", entry["id"], (entry["temp"] >> 16) & 0xFFFF)
         else:
-            self.nozzle_temps[0] = round(data.get("nozzle_temper", self.nozzle_temps[0]))
-            self.target_nozzle_temps[0] = round(data.get("nozzle_target_temper", self.target_nozzle_temps[0]))
+            self._set_item("nozzle_temps", 0, round(data.get("nozzle_temper", self.nozzle_temps[0])))
+            self._set_item("target_nozzle_temps", 0, round(data.get("nozzle_target_temper", self.target_nozzle_temps[0])))
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     def set_target_temp(self, temp: TempEnum, temperature: int):
         command = set_temperature_to_gcode(temp, temperature, self._client._device.info.device_type)
@@ -592,7 +724,7 @@ class Temperature:
 
 
 @dataclass
-class Fans:
+class Fans(DirtyTracking):
     """Return all fan related info"""
     _aux_fan_speed_percentage: int
     _aux_fan_speed: int
@@ -635,7 +767,7 @@ class Fans:
         self._secondary_aux_fan_speed_override_time = None
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         self._aux_fan_speed = data.get("big_fan1_speed", self._aux_fan_speed)
         self._aux_fan_speed_percentage = fan_percentage(self._aux_fan_speed)
@@ -672,7 +804,7 @@ class Fans:
             if delta.seconds > 5:
                 self._secondary_aux_fan_speed_override_time = None
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     def set_fan_speed(self, fan: FansEnum, percentage: int):
         """Set fan speed"""
@@ -721,7 +853,7 @@ class Fans:
             return self._secondary_aux_fan_speed_percentage
 
 @dataclass
-class Upgrade:
+class Upgrade(DirtyTracking):
     """ Upgrade class """
     printer_name: str
     upgrade_progress: int
@@ -772,7 +904,7 @@ class Upgrade:
                 
     def print_update(self, data) -> bool:
         """Update the upgrade state"""
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
         
         # Example payload for P1 printer
         # "upgrade_state": {
@@ -874,11 +1006,11 @@ class Upgrade:
                 else:
                     LOGGER.error(f"Unable to interpret {state}")
             
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
 
 @dataclass
-class PrintJob:
+class PrintJob(DirtyTracking):
     """Return all information related content"""
 
     print_percentage: int
@@ -887,6 +1019,7 @@ class PrintJob:
     gcode_file: str
     gcode_file_downloaded: str
     _subtask_name: str
+    _task_id: str
     start_time: datetime
     end_time: datetime
     remaining_time: int
@@ -901,10 +1034,15 @@ class PrintJob:
     _ams_print_lengths: float
     _skipped_objects: list
     _printable_objects: dict
+    _pick_image_cache: OrderedDict
+    _gcode_index: GcodeIndex
+    _gcode_index_source: str
+    _model_filaments: list
+    _layer_weights: dict
     _gcode_file_prepare_percent: int
     _loaded_model_data: bool
     _ftpRunAgain: bool
-    _ftpThread: threading.Thread
+    _ftp_job: object
     _ftp_download_percentage: int
 
     def __init__(self, client):
@@ -914,6 +1052,7 @@ class PrintJob:
         self.gcode_file = ""
         self.gcode_file_downloaded = ""
         self._subtask_name = ""
+        self._task_id = None
         self.start_time = None
         self.end_time = None
         self.remaining_time = 0
@@ -929,17 +1068,27 @@ class PrintJob:
         self.file_type_icon = "mdi:file"
         self._print_type = ""
         self._printable_objects = {}
+        self._pick_image_cache = OrderedDict()
+        self._gcode_lock = threading.Lock()
+        self._gcode_index = None
+        self._gcode_index_source = None
+        self._model_filaments = []
+        self._layer_weights = {}
         self._skipped_objects = []
         self._gcode_file_prepare_percent = -1
         self._loaded_model_data = False
         self._ftpRunAgain = False
-        self._ftpThread = None
+        self._ftp_job = None
         self._ftp_download_percentage = 100
 
     @property
     def model_download_percentage(self) -> int:
         return self._ftp_download_percentage
 
+    @property
+    def gcode_index(self) -> GcodeIndex | None:
+        return self._gcode_index
+
     @property
     def get_printable_objects(self) -> json:
         return self._printable_objects
@@ -978,6 +1127,97 @@ class PrintJob:
                     values[f"AMS {ams_index} Tray {ams_tray}"] = self._ams_print_lengths[i]
         return values
     
+    def _weight_used_before_layer(self, key) -> float | None:
+        weights = self._layer_weights.get(key)
+        if weights is None:
+            return None
+        if self.gcode_state == "FINISH":
+            return weights[-1]
+        if self.current_layer <= 0:
+            return 0.0
+        return weights[min(self.current_layer, len(weights)) - 1]
+
+    @property
+    def print_weight_used(self) -> float | None:
+        """Grams of filament extruded before the current layer, from the plate gcode index."""
+        return self._weight_used_before_layer("total")
+
+    @property
+    def print_weight_remaining(self) -> float | None:
+        used = self._weight_used_before_layer("total")
+        return None if used is None else round(self._layer_weights["total"][-1] - used, 2)
+
+    def _get_layer_weights(self, remaining: bool) -> dict:
+        values = {}
+        if "total" not in self._layer_weights:
+            return values
+        def weight(key):
+            used = self._weight_used_before_layer(key)
+            return round(self._layer_weights[key][-1] - used, 2) if remaining else used
+        if self._client._device.external_spool[0].active:
+            values["External Spool"] = weight("total")
+        elif self._client._device.external_spool[1].active:
+            values["External Spool 2"] = weight("total")
+        else:
+            for i in range(16):
+                if i in self._layer_weights:
+                    ams_index = (i // 4) + 1
+                    ams_tray = (i % 4) + 1
+                    values[f"AMS {ams_index} Tray {ams_tray}"] = weight(i)
+        return values
+
+    @property
+    def get_print_weights_used(self) -> dict:
+        return self._get_layer_weights(remaining=False)
+
+    @property
+    def get_print_weights_remaining(self) -> dict:
+        return self._get_layer_weights(remaining=True)
+
+    def _build_layer_weights(self):
+        """Precompute grams extruded before each layer, in total and per AMS tray, once per print.
+
+        The gcode index tracks millimetres per slicer filament. Each is converted with that filament's
+        weight/length ratio from slice_info.config and mapped to its tray through the AMS mapping, so the
+        sensors only need an index lookup with the current layer on every update. The last entry is the total.
+        """
+        index = self._gcode_index
+        if index is None or not self._model_filaments:
+            self._layer_weights = {}
+            return
+
+        grams_per_mm = {}
+        for filament in self._model_filaments:
+            try:
+                tool = int(filament.get('id')) - 1
+                used_m = float(filament.get('used_m'))
+                if used_m > 0:
+                    grams_per_mm[tool] = float(filament.get('used_g')) / (used_m * 1000)
+            except (TypeError, ValueError):
+                continue
+
+        keys = []
+        for tool in index.filaments:
+            key = None
+            if tool < len(self.ams_mapping) and self.ams_mapping[tool] < 16:
+                key = self.ams_mapping[tool]
+            keys.append(key)
+
+        layer_weights = {"total": []}
+        for key in keys:
+            if key is not None:
+                layer_weights[key] = []
+        for extrusion in [layer[3] for layer in index.layers] + [index.total_extrusion]:
+            totals = dict.fromkeys(layer_weights, 0.0)
+            for i, mm in enumerate(extrusion):
+                grams = mm * grams_per_mm.get(index.filaments[i], 0.0)
+                totals["total"] += grams
+                if keys[i] is not None:
+                    totals[keys[i]] += grams
+            for key, grams in totals.items():
+                layer_weights[key].append(round(grams, 2))
+        self._layer_weights = layer_weights
+
     @property
     def subtask_name(self) -> str:
         return None if self._subtask_name == "" else self._subtask_name
@@ -987,7 +1227,7 @@ class PrintJob:
         return "unknown" if self._print_type == "" else self._print_type
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         # Example payload:
         # {
@@ -1026,6 +1266,7 @@ class PrintJob:
             if self._print_type != "":
                 LOGGER.debug(f"Unknown print_type. Please log an issue : '{self._print_type}'")
             self._print_type = "unknown"
+        self._task_id = data.get("task_id", self._task_id)
         old_subtask_name = self._subtask_name
         self._subtask_name = data.get("subtask_name", self._subtask_name)
         if old_subtask_name != self._subtask_name:
@@ -1038,7 +1279,7 @@ class PrintJob:
 
         # Initialize task data at startup.
         if previous_gcode_state == "unknown" and self.gcode_state != "unknown":
-            self._update_task_data()
+            self._update_task_data(print_start=False)
             self._download_timelapse()
 
         # Generate the end_time from the remaining_time mqtt payload value if present.
@@ -1062,6 +1303,9 @@ class PrintJob:
             # Make sure we catch that case too. And Lan Mode never sets this - make sure we init it to 0.
             self._gcode_file_prepare_percent = 0
 
+            # Any model download still queued or retrying is for the previous print.
+            self._cancel_model_download()
+
             # Clear existing cover & pick image data before attempting any fresh download.
             self._clear_model_data()
 
@@ -1150,7 +1394,7 @@ class PrintJob:
                 LOGGER.debug(f"NEW USAGE HOURS: {new_hours}")
                 self._client._device.info.usage_hours += new_hours
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     # FTP implementation differences between P1 and X1 printers:
     # - X1 includes the path in the returned filenames for the NLST command
@@ -1243,7 +1487,10 @@ class PrintJob:
                     ".3mf",
                     ".gcode",
                     ".png",
+                    ".pick.png",
                     ".slice_info.config",
+                    MODEL_METADATA_EXTENSION,
+                    GCODE_INDEX_EXTENSION,
                 ]
                 # Base path without the final suffix (so we can swap extensions)
                 for extension in extensions:
@@ -1266,10 +1513,10 @@ class PrintJob:
             last_log_percentage = 0
 
             self._ftp_download_percentage = 0
-            def download_progress_callback(data):
+            def download_progress_callback(received):
                 nonlocal total_downloaded, last_log_percentage
                 try:
-                    total_downloaded += len(data)
+                    total_downloaded = received
                     percentage = int((total_downloaded / size) * 100)
                     
                     # Only log every 10 seconds
@@ -1286,15 +1533,11 @@ class PrintJob:
                     LOGGER.debug(f"Error in progress callback: {e}")
                     # Don't let progress callback errors break the download
 
-            with open(str(cache_file_path), 'wb') as f:
-                # Create a wrapper function that combines file writing and progress tracking
-                def write_with_progress(data):
-                    f.write(data)
-                    download_progress_callback(data)
-                
-                ftp.retrbinary(f"RETR {file_path}", write_with_progress)
-                f.flush()
-            
+            # Resumes a partial download left by a dropped connection. The 3mf is a zip so its member CRCs double
+            # as a checksum of the whole transfer.
+            self._client.ftp_pool.download(ftp, file_path, str(cache_file_path), size=size,
+                                           progress=download_progress_callback, verify=zip_crc_ok)
+
             # Calculate download statistics
             self._ftp_download_percentage = 100
             end_time = time.time()
@@ -1453,7 +1696,7 @@ class PrintJob:
         self._prune_old_files(directory=cache_file_path,
                               extensions=['.3mf'],
                               keep=self._client._print_cache_count,
-                              extra_extensions=['.jpg', '.png', '.slice_info.config', '.gcode'])
+                              extra_extensions=['.jpg', '.png', '.pick.png', '.slice_info.config', '.gcode', '.gcode.gz', MODEL_METADATA_EXTENSION, GCODE_INDEX_EXTENSION])
 
     async def async_prune_timelapse_files(self):
         loop = asyncio.get_event_loop()
@@ -1481,6 +1724,15 @@ class PrintJob:
             return
         
         LOGGER.debug(f"{dir_path}")
+
+        # Partial downloads are kept so an interrupted transfer can resume, but not indefinitely.
+        for partial_file in dir_path.rglob('*.part'):
+            try:
+                if time.time() - partial_file.stat().st_mtime > PARTIAL_DOWNLOAD_MAX_AGE:
+                    os.remove(partial_file)
+                    LOGGER.debug(f"Deleted stale partial download: {partial_file}")
+            except Exception as e:
+                LOGGER.error(f"Failed to delete {partial_file}: {e}")
         
         # Get list of files matching the provided list of extensions
         matching_files = [
@@ -1525,68 +1777,63 @@ class PrintJob:
             return
         if self._client._timelapse_cache_count == 0:
             return
-        thread = threading.Thread(target=self._async_download_timelapse)
-        thread.start()
+        self._client.ftp_scheduler.submit(FtpPriority.TIMELAPSE, "timelapse download", self._async_download_timelapse)
         
-    def _async_download_timelapse(self):
-        current_thread = threading.current_thread()
-        current_thread.setName(f"{self._client._device.info.device_type}-FTP-{threading.get_native_id()}")
+    def _async_download_timelapse(self, job=None):
+        if not self._client.asyncio_transport:
+            current_thread = threading.current_thread()
+            current_thread.setName(f"{self._client._device.info.device_type}-FTP-{threading.get_native_id()}")
         start_time = datetime.now()
         LOGGER.debug(f"Downloading latest timelapse by FTP")
 
-        # Open the FTP connection
-        ftp = self._client.ftp_connection()
-        video_extensions = ['.mp4','.avi']
-        file_path = self._find_latest_file(ftp, ['/timelapse'], video_extensions)
-        if file_path is not None:
-            # timelapse_path is of form '/timelapse/foo.mp4'
-            local_file_path = os.path.join(self._client.cache_path, file_path.lstrip('/'))
-            directory_path = os.path.dirname(local_file_path)
-            os.makedirs(directory_path, exist_ok=True)
+        # Check out a pooled FTP connection
+        with self._client.ftp_pool.connection() as ftp:
+            video_extensions = ['.mp4','.avi']
+            file_path = self._find_latest_file(ftp, ['/timelapse'], video_extensions)
+            if file_path is not None:
+                # timelapse_path is of form '/timelapse/foo.mp4'
+                local_file_path = os.path.join(self._client.cache_path, file_path.lstrip('/'))
+                directory_path = os.path.dirname(local_file_path)
+                os.makedirs(directory_path, exist_ok=True)
 
-            try:
-                # Get the file size from FTP
-                size = ftp.size(file_path)
-                LOGGER.debug(f"Timelapse file exists. Size: {size} bytes.")
+                try:
+                    # Get the file size from FTP
+                    size = ftp.size(file_path)
+                    LOGGER.debug(f"Timelapse file exists. Size: {size} bytes.")
                 
-                # Check if file already exists with same size
-                should_download = False
-                if os.path.exists(local_file_path):
-                    local_file_size = os.path.getsize(local_file_path)
-                    if local_file_size == size:
-                        LOGGER.debug(f"Timelapse file found in cache.")
+                    # Check if file already exists with same size
+                    should_download = False
+                    if os.path.exists(local_file_path):
+                        local_file_size = os.path.getsize(local_file_path)
+                        if local_file_size == size:
+                            LOGGER.debug(f"Timelapse file found in cache.")
+                        else:
+                            LOGGER.debug(f"Timelapse file size differs (local: {local_file_size}, remote: {size}). Re-downloading.")
+                            should_download = True
                     else:
-                        LOGGER.debug(f"Timelapse file size differs (local: {local_file_size}, remote: {size}). Re-downloading.")
+                        LOGGER.debug(f"Timelapse file doesn't exist locally. Downloading.")
                         should_download = True
-                else:
-                    LOGGER.debug(f"Timelapse file doesn't exist locally. Downloading.")
-                    should_download = True
                 
-                if should_download:
-                    # Download video
-                    with open(local_file_path, 'wb') as f:
+                    if should_download:
+                        # Download video. Timelapses run to hundreds of MB so a dropped connection resumes rather than
+                        # starting over.
                         LOGGER.debug(f"Downloading '{file_path}'")
-                        ftp.retrbinary(f"RETR {file_path}", f.write)
-                        f.flush()
-                    
-                    # Download thumbnail
-                    filename = os.path.basename(file_path)
-                    filename_without_extension, _ = os.path.splitext(filename)
-                    thumbnail_filename = f"{filename_without_extension}.jpg"
-                    thumbnail_path = os.path.join(os.path.dirname(file_path), 'thumbnail', thumbnail_filename)
-                    thumbnail_local_path = os.path.join(os.path.dirname(local_file_path), thumbnail_filename)
-                    with open(thumbnail_local_path, 'wb') as f:
+                        self._client.ftp_pool.download(ftp, file_path, local_file_path, size=int(size))
+
+                        # Download thumbnail
+                        filename = os.path.basename(file_path)
+                        filename_without_extension, _ = os.path.splitext(filename)
+                        thumbnail_filename = f"{filename_without_extension}.jpg"
+                        thumbnail_path = os.path.join(os.path.dirname(file_path), 'thumbnail', thumbnail_filename)
+                        thumbnail_local_path = os.path.join(os.path.dirname(local_file_path), thumbnail_filename)
                         LOGGER.info(f"Downloading '{thumbnail_path}'")
-                        ftp.retrbinary(f"RETR {thumbnail_path}", f.write)
-                        f.flush()
+                        self._client.ftp_pool.download(ftp, thumbnail_path, thumbnail_local_path)
                     
-            except ftplib.error_perm as e:
-                if '550' not in str(e.args): # 550 is unavailable.
-                    LOGGER.debug(f"Failed to download timelapse at '{file_path}': {e}")
-            except Exception as e:
-                LOGGER.debug(f"Unexpected exception downloading timelapse at '{file_path}': {type(e)} Args: {e}")
-
-        ftp.quit()
+                except ftplib.error_perm as e:
+                    if '550' not in str(e.args): # 550 is unavailable.
+                        LOGGER.debug(f"Failed to download timelapse at '{file_path}': {e}")
+                except Exception as e:
+                    LOGGER.debug(f"Unexpected exception downloading timelapse at '{file_path}': {type(e)} Args: {e}")
 
         end_time = datetime.now()
 
@@ -1594,31 +1841,53 @@ class PrintJob:
 
         LOGGER.debug(f"Done downloading timelapse by FTP. Elapsed time = {(end_time-start_time).seconds}s") 
 
-    def _update_task_data(self):
+    def _update_task_data(self, print_start: bool = True):
         self._loaded_model_data = True
 
         # If we are running in connection test mode, skip updating the last print task data.
         if self._client._test_mode:
             return
         
-        self._download_task_data_from_cloud()
+        self._download_task_data_from_cloud(print_start)
         if self._client.ftp_enabled:
             self._download_task_data_from_printer()
 
     def _download_task_data_from_printer(self):
-        if self._ftpThread is None:
-            # Only start a new thread if there
-            LOGGER.debug("Starting FTP thread.")
-            self._ftpThread = threading.Thread(target=self._async_download_task_data_from_printer)
-            self._ftpThread.start()
+        if self._ftp_job is None:
+            # Only queue a new download if there isn't one already queued, running or waiting to retry.
+            LOGGER.debug("Queueing model download.")
+            self._ftp_job = self._client.ftp_scheduler.submit(FtpPriority.MODEL, "model download",
+                                                              self._async_download_task_data_from_printer)
+            self._ftp_job.future.add_done_callback(functools.partial(self._model_download_done, self._ftp_job))
         else:
-            LOGGER.debug("FTP thread already running.")
+            LOGGER.debug("Model download already queued.")
             self._ftpRunAgain = True
 
+    def _model_download_done(self, job, _future):
+        if self._ftp_job is not job:
+            # Cancelled and replaced by a download for a newer print.
+            return
+        self._ftp_job = None
+        if self._ftpRunAgain and not job.cancelled:
+            self._ftpRunAgain = False
+            LOGGER.debug("Model download re-running.")
+            self._download_task_data_from_printer()
+
+    def _cancel_model_download(self):
+        job = self._ftp_job
+        if job is not None:
+            self._ftp_job = None
+            self._ftpRunAgain = False
+            self._client.ftp_scheduler.cancel(job)
+
     def _clear_model_data(self):
         LOGGER.debug("Clearing model data")
         self._loaded_model_data = False
         self._client._device.cover_image.set_image(None)
+        self._gcode_index = None
+        self._gcode_index_source = None
+        self._model_filaments = []
+        self._layer_weights = {}
         self._clear_pick_data()
 
     def _clear_pick_data(self):
@@ -1626,211 +1895,374 @@ class PrintJob:
         self._client._device.pick_image.set_image(None)
         self._printable_objects = {}
 
-    def _async_download_task_data_from_printer(self):
-        current_thread = threading.current_thread()
-        current_thread.setName(f"{self._client._device.info.device_type}-FTP-{threading.get_native_id()}")
-        LOGGER.debug(f"FTP thread starting.")
+    def _async_download_task_data_from_printer(self, job):
+        if not self._client.asyncio_transport:
+            current_thread = threading.current_thread()
+            current_thread.setName(f"{self._client._device.info.device_type}-FTP-{threading.get_native_id()}")
+        LOGGER.debug(f"Model download starting. Try #{job.attempt}")
 
+        start_time = datetime.now()
         try:
-            while True:
-                self._ftpRunAgain = False
-                start_time = datetime.now()
-                self._async_download_task_data_from_printer_worker()
-                if not self._ftpRunAgain:
-                    break
-                end_time = datetime.now()
-                LOGGER.debug("FTP thread re-running. Elapsed time = {(end_time-start_time).seconds}s")
+            return self._async_download_task_data_from_printer_worker(job)
         except Exception as e:
-            LOGGER.error(f"FTP thread failed with exception {e}")
-
-        end_time = datetime.now()
-        LOGGER.info(f"FTP thread exiting. Elapsed time = {(end_time-start_time).seconds}s")
-        self._ftpThread = None
-
-    def _async_download_task_data_from_printer_worker(self):
-        # Open the FTP connection
-        ftp = self._client.ftp_connection()
+            LOGGER.error(f"Model download failed with exception {e}")
+        finally:
+            end_time = datetime.now()
+            LOGGER.info(f"Model download finished. Elapsed time = {(end_time-start_time).seconds}s")
 
-        for i in range(1,13):
+    def _async_download_task_data_from_printer_worker(self, job):
+        # Check out a pooled FTP connection
+        with self._client.ftp_pool.connection() as ftp:
             model_file_path = self._attempt_ftp_download(ftp)
-            if model_file_path is not None:
-                break
 
-            if not self._client._device.supports_feature(Features.SUPPORTS_EARLY_FTP_DOWNLOAD):
-                # The X1 has a weird behavior where the downloaded file doesn't exist for several seconds into the RUNNING phase and even
-                # then it is still being downloaded in place so we might try to grab it mid-download and get a corrupt file. Try 13 times
-                # 5 seconds apart over 60s.
-                if i != 12:
-                    LOGGER.debug(f"Sleeping 5s for X1/H2/P2 retry")
-                    time.sleep(5)
-                    LOGGER.debug(f"Try #{i+1} for X1/H2/P2")
-            else:
-                break
-
-        ftp.quit()
+        if model_file_path is None and not self._client._device.supports_feature(Features.SUPPORTS_EARLY_FTP_DOWNLOAD):
+            # The X1 has a weird behavior where the downloaded file doesn't exist for several seconds into the RUNNING phase and even
+            # then it is still being downloaded in place so we might try to grab it mid-download and get a corrupt file. Try 12 times
+            # 5 seconds apart over 60s. The job is requeued in between so it doesn't hold an FTP worker while waiting.
+            if job.attempt < 12 and not job.cancelled:
+                LOGGER.debug(f"Retrying in 5s for X1/H2/P2")
+                return job.retry(5)
 
         if model_file_path is None:
             LOGGER.debug("No model file found.")
             return
 
+        if job.cancelled:
+            LOGGER.debug("Model download cancelled, a new print has started.")
+            return
+
         result = False
-        
+
         try:
             LOGGER.debug(f"File size is {os.path.getsize(model_file_path)} bytes")
 
-            model_dir = os.path.dirname(model_file_path)
+            # A reprint or a restart mid-print finds the 3mf already cached. Its sidecar record then has everything
+            # needed so the archive doesn't have to be opened and parsed again.
+            metadata = self._load_model_metadata(model_file_path)
+            if metadata is None:
+                metadata = self._parse_model_file(model_file_path)
+                self._save_model_metadata(model_file_path, metadata)
 
-            # Open the 3mf zip archive
-            with ZipFile(model_file_path) as archive:
-                # Extract the slicer XML config and parse the plate tree
-                plate = ElementTree.fromstring(archive.read('Metadata/slice_info.config')).find('plate')
-                
-                # Iterate through each config element and extract the data
-                # Example contents:
-                # {'key': 'index', 'value': '2'}
-                # {'key': 'printer_model_id', 'value': 'C12'}
-                # {'key': 'nozzle_diameters', 'value': '0.4'}
-                # {'key': 'timelapse_type', 'value': '0'}
-                # {'key': 'prediction', 'value': '5935'}
-                # {'key': 'weight', 'value': '20.91'}
-                # {'key': 'outside', 'value': 'false'}
-                # {'key': 'support_used', 'value': 'false'}
-                # {'key': 'label_object_enabled', 'value': 'true'}
-                # {'identify_id': '123', 'name': 'ModelObjectOne.stl', 'skipped': 'false'}
-                # {'identify_id': '394', 'name': 'ModelObjectTwo.stl', 'skipped': 'false'}
-                # {'id': '1', 'tray_info_idx': 'GFA01', 'type': 'PLA', 'color': '#000000', 'used_m': '5.45', 'used_g': '17.32'}
-                # {'id': '2', 'tray_info_idx': 'GFA01', 'type': 'PLA', 'color': '#8D8C8F', 'used_m': '0.84', 'used_g': '2.66'}
-                # {'id': '3', 'tray_info_idx': 'GFA01', 'type': 'PLA', 'color': '#FFFFFF', 'used_m': '0.29', 'used_g': '0.93'}
-                
-                # Start a total print length count to be compiled from each filament
-                print_length = 0
-                plate_number = None
-                _printable_objects = {}
-                filament_count = len(self.ams_mapping)
-                plate_filament_count = len(plate.findall('filament'))
-
-                # Reset filament data
-                self._ams_print_weights = [0.0] * 136 # TODO: Convert to a dict in the future?
-                self._ams_print_lengths = [0.0] * 136 # TODO: Convert to a dict in the future?
-
-                for metadata in plate:
-                    if (metadata.get('key') == 'index'):
-                        # Index is the plate number being printed
-                        plate_number = metadata.get('value')
-                        LOGGER.debug(f"Plate: {plate_number}")
-                        
-                        # Now we have the plate number, extract the cover image from the archive
-                        self._client._device.cover_image.set_image(archive.read(f"Metadata/plate_{plate_number}.png"))
-                        LOGGER.debug(f"Cover image: Metadata/plate_{plate_number}.png")
+            self._apply_model_metadata(metadata)
 
-                        # Save the cover image to the cache
-                        try:
-                            # Save the cover image directly to the cache
-                            cover_filename = os.path.splitext(os.path.basename(model_file_path))[0] + '.png'
-                            cover_path = os.path.join(model_dir, cover_filename)
-                            with archive.open(f"Metadata/plate_{plate_number}.png") as cover_entry, open(cover_path, "wb") as target_path:
-                                shutil.copyfileobj(cover_entry, target_path)
-                            LOGGER.debug(f"Cover image saved to: {cover_path}")
-                        except Exception as e:
-                            LOGGER.error(f"Failed to save cover image: {e}")
+            self._client.callback("event_printer_data_update")
+            result = True
 
-                        try:
-                            # Save the gcode file to the cache
-                            gcode_filename = os.path.splitext(os.path.basename(model_file_path))[0] + '.gcode'
-                            gcode_path = os.path.join(model_dir, gcode_filename)
-                            with archive.open(f"Metadata/plate_{plate_number}.gcode") as gcode_entry, open(gcode_path, "wb") as target_path:
-                                shutil.copyfileobj(gcode_entry, target_path)
-                                self.gcode_file_downloaded = gcode_filename
-                        except Exception as e:
-                            self.gcode_file_downloaded = "ERROR"
-                            LOGGER.error(f"Error while extracting gcode zip entry to target path. {repr(e)}")
-                        
-                        # And extract the plate type from the plate json.
-                        self.print_bed_type = json.loads(archive.read(f"Metadata/plate_{plate_number}.json")).get('bed_type')
-                    elif (metadata.get('key') == 'weight'):
-                        LOGGER.debug(f"Weight: {metadata.get('value')}")
-                        self.print_weight = metadata.get('value')
-                    elif (metadata.get('key') == 'prediction'):
-                        # Estimated print length in seconds
-                        LOGGER.debug(f"Print time: {metadata.get('value')}s")
-                    elif (metadata.tag == 'object'):
-                        # Get the list of printable objects present on the plate before slicing.
-                        # This includes hidden objects which need to be filtered out later.
-                        if metadata.get('skipped') == f"false":
-                            _printable_objects[metadata.get('identify_id')] = metadata.get('name')
-                    elif (metadata.tag == 'filament'):
-                        try:
-                            # Filament used for the current print job. The plate info contains filaments
-                            # identified in the order they appear in the slicer. These IDs must be
-                            # mapped to the AMS tray mappings provided by MQTT print.ams_mapping
-
-                            # Zero-index the filament ID
-                            filament_index = int(metadata.get('id')) - 1
-                            log_label = f"External spool"
-                            
-                            # Filament count should be greater than the zero-indexed filament ID
-                            if filament_count > filament_index:
-                                ams_index = self.ams_mapping[filament_index]
-                                if ams_index < 16: # BUG - This will not yet handle AMS HT devices
-                                    # We add the filament as you can map multiple slicer filaments to the same physical filament.
-                                    self._ams_print_weights[ams_index] += float(metadata.get('used_g'))
-                                    self._ams_print_lengths[ams_index] += float(metadata.get('used_m'))
-                                    log_label = f"AMS Tray {ams_index + 1}"
-                                else:
-                                    LOGGER.debug(f"ams_mapping: {self.ams_mapping}")
-                            elif plate_filament_count > 0:
-                                # Multi filament print but the AMS mapping is unknown
-                                # The data is only sent in the mqtt payload once and isn't part of the 'full' data so the integration must be
-                                # live and listening to capture it.
-                                LOGGER.debug(f"filament_index: {filament_index}")
-                                log_label = f"AMS Tray unknown"
-                            else:
-                                LOGGER.debug(f"plate_filament_count: {plate_filament_count}")
-
-                            LOGGER.debug(f"{log_label}: {metadata.get('used_m')}m | {metadata.get('used_g')}g")
-
-                            # Increase the total print length
-                            print_length += float(metadata.get('used_m'))
-                        except Exception as e:
-                            LOGGER.error(f"Failed to parse filament data: {e}")
-                
-                self.print_length = print_length
+            if metadata.get("gcode_member"):
+                # Indexing reads the whole plate gcode so it runs on its own rather than holding an FTP worker.
+                self._gcode_index_source = model_file_path
+                self._client.start_background(functools.partial(self._load_gcode_index, model_file_path, metadata["gcode_member"]),
+                                              name=f"{self._client._device.info.device_type}-GcodeIndex")
+        except Exception as e:
+            LOGGER.error(f"Unexpected error parsing model data: {e}")
+
+        self.prune_print_history_files()
 
-                if plate_number is not None:
+        return result
+
+    def _parse_model_file(self, model_file_path: str) -> dict:
+        base_path = os.path.splitext(model_file_path)[0]
+        metadata = {
+            "plate": None,
+            "weight": None,
+            "bed_type": None,
+            "filaments": [],
+            "printable_objects": {},
+            "gcode_file": None,
+            "gcode_member": None,
+        }
+
+        # Open the 3mf zip archive
+        with ZipFile(model_file_path) as archive:
+            # Extract the slicer XML config and parse the plate tree
+            plate = ElementTree.fromstring(archive.read('Metadata/slice_info.config')).find('plate')
+
+            # Iterate through each config element and extract the data
+            # Example contents:
+            # {'key': 'index', 'value': '2'}
+            # {'key': 'printer_model_id', 'value': 'C12'}
+            # {'key': 'nozzle_diameters', 'value': '0.4'}
+            # {'key': 'timelapse_type', 'value': '0'}
+            # {'key': 'prediction', 'value': '5935'}
+            # {'key': 'weight', 'value': '20.91'}
+            # {'key': 'outside', 'value': 'false'}
+            # {'key': 'support_used', 'value': 'false'}
+            # {'key': 'label_object_enabled', 'value': 'true'}
+            # {'identify_id': '123', 'name': 'ModelObjectOne.stl', 'skipped': 'false'}
+            # {'identify_id': '394', 'name': 'ModelObjectTwo.stl', 'skipped': 'false'}
+            # {'id': '1', 'tray_info_idx': 'GFA01', 'type': 'PLA', 'color': '#000000', 'used_m': '5.45', 'used_g': '17.32'}
+            # {'id': '2', 'tray_info_idx': 'GFA01', 'type': 'PLA', 'color': '#8D8C8F', 'used_m': '0.84', 'used_g': '2.66'}
+            # {'id': '3', 'tray_info_idx': 'GFA01', 'type': 'PLA', 'color': '#FFFFFF', 'used_m': '0.29', 'used_g': '0.93'}
+
+            plate_number = None
+            _printable_objects = {}
+
+            for metadata_entry in plate:
+                if (metadata_entry.get('key') == 'index'):
+                    # Index is the plate number being printed
+                    plate_number = metadata_entry.get('value')
+                    metadata["plate"] = plate_number
+                    LOGGER.debug(f"Plate: {plate_number}")
+
+                    # Now we have the plate number, extract the cover image from the archive
+                    self._client._device.cover_image.set_image(archive.read(f"Metadata/plate_{plate_number}.png"))
+                    LOGGER.debug(f"Cover image: Metadata/plate_{plate_number}.png")
+
+                    # Save the cover image to the cache
                     try:
-                        image = archive.read(f"Metadata/pick_{plate_number}.png")
-                        self._client._device.pick_image.set_image(image)
-                        # Process the pick image for objects
-                        pick_image = Image.open(archive.open(f"Metadata/pick_{plate_number}.png"))
-                        identify_ids = self._identify_objects_in_pick_image(image=pick_image)
-                        
-                        # Filter the printable objects from slice_info.config, removing
-                        # any that weren't detected in the pick image
-                        self._printable_objects = {k: _printable_objects[k] for k in identify_ids if k in _printable_objects}
-                    except:
-                        LOGGER.debug(f"Unable to load 'Metadata/pick_{plate_number}.png' from archive")
+                        # Save the cover image directly to the cache
+                        cover_path = base_path + '.png'
+                        with archive.open(f"Metadata/plate_{plate_number}.png") as cover_entry, open(cover_path, "wb") as target_path:
+                            shutil.copyfileobj(cover_entry, target_path)
+                        LOGGER.debug(f"Cover image saved to: {cover_path}")
+                    except Exception as e:
+                        LOGGER.error(f"Failed to save cover image: {e}")
 
-                # Save the slice_info.config file only if file cache is enabled
+                    # The plate gcode can be hundreds of MB so it's only extracted when something asks for it.
+                    try:
+                        gcode_member = f"Metadata/plate_{plate_number}.gcode"
+                        archive.getinfo(gcode_member)
+                        metadata["gcode_member"] = gcode_member
+                        metadata["gcode_file"] = os.path.basename(base_path) + '.gcode'
+                    except KeyError as e:
+                        metadata["gcode_file"] = "ERROR"
+                        LOGGER.error(f"Plate gcode missing from archive. {repr(e)}")
+
+                    # And extract the plate type from the plate json.
+                    metadata["bed_type"] = json.loads(archive.read(f"Metadata/plate_{plate_number}.json")).get('bed_type')
+                elif (metadata_entry.get('key') == 'weight'):
+                    LOGGER.debug(f"Weight: {metadata_entry.get('value')}")
+                    metadata["weight"] = metadata_entry.get('value')
+                elif (metadata_entry.get('key') == 'prediction'):
+                    # Estimated print length in seconds
+                    LOGGER.debug(f"Print time: {metadata_entry.get('value')}s")
+                elif (metadata_entry.tag == 'object'):
+                    # Get the list of printable objects present on the plate before slicing.
+                    # This includes hidden objects which need to be filtered out later.
+                    if metadata_entry.get('skipped') == f"false":
+                        _printable_objects[metadata_entry.get('identify_id')] = metadata_entry.get('name')
+                elif (metadata_entry.tag == 'filament'):
+                    # Filament used for the current print job, mapped to AMS trays when the model is applied
+                    # as the AMS mapping can differ between prints of the same file.
+                    metadata["filaments"].append({key: metadata_entry.get(key) for key in ('id', 'type', 'color', 'used_m', 'used_g')})
+
+            if plate_number is not None:
                 try:
-                    slice_info_bytes = archive.read('Metadata/slice_info.config')
-                    # Save the slice_info.config in the same directory as the model file
-                    slice_info_filename = os.path.splitext(os.path.basename(model_file_path))[0] + '.slice_info.config'
-                    slice_info_path = os.path.join(model_dir, slice_info_filename)
-                    with open(slice_info_path, "wb") as f:
-                        f.write(slice_info_bytes)
-                except Exception as e:
-                    LOGGER.error(f"Failed to save slice_info.config: {e}")
+                    pick_info = archive.getinfo(f"Metadata/pick_{plate_number}.png")
+                    image = archive.read(pick_info)
+                    self._client._device.pick_image.set_image(image)
+                    with open(base_path + '.pick.png', "wb") as f:
+                        f.write(image)
+                    # Process the pick image for objects
+                    identify_ids = self._identify_objects_in_pick_image(image, plate_number, pick_info.CRC)
+
+                    # Filter the printable objects from slice_info.config, removing
+                    # any that weren't detected in the pick image
+                    metadata["printable_objects"] = {k: _printable_objects[k] for k in identify_ids if k in _printable_objects}
+                except:
+                    LOGGER.debug(f"Unable to load 'Metadata/pick_{plate_number}.png' from archive")
+
+            # Save the slice_info.config file only if file cache is enabled
+            try:
+                slice_info_bytes = archive.read('Metadata/slice_info.config')
+                # Save the slice_info.config in the same directory as the model file
+                slice_info_path = base_path + '.slice_info.config'
+                with open(slice_info_path, "wb") as f:
+                    f.write(slice_info_bytes)
+            except Exception as e:
+                LOGGER.error(f"Failed to save slice_info.config: {e}")
 
-            archive.close()
+        return metadata
 
-            self._client.callback("event_printer_data_update")
-            result = True
+    def _read_model_metadata(self, model_file_path: str) -> dict | None:
+        base_path = os.path.splitext(model_file_path)[0]
+        try:
+            with open(base_path + MODEL_METADATA_EXTENSION, "r") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            LOGGER.error(f"Unexpected error parsing model data: {e}")
-        
-        self.prune_print_history_files()
+            LOGGER.debug(f"Ignoring unreadable model metadata: {e}")
+            return None
 
-        return result
+        if not isinstance(metadata, dict) or metadata.get("version") != MODEL_METADATA_VERSION or \
+           metadata.get("fingerprint") != list(file_fingerprint(model_file_path)):
+            LOGGER.debug(f"Model metadata for '{model_file_path}' is stale")
+            return None
+        return metadata
+
+    def _load_model_metadata(self, model_file_path: str) -> dict | None:
+        metadata = self._read_model_metadata(model_file_path)
+        if metadata is None:
+            return None
+
+        base_path = os.path.splitext(model_file_path)[0]
+        plate_number = metadata.get("plate")
+        if plate_number is not None:
+            # The images were extracted next to the 3mf when the record was written. If they have been
+            # removed since, parse the archive again to restore them.
+            try:
+                with open(base_path + '.png', "rb") as f:
+                    self._client._device.cover_image.set_image(f.read())
+                if os.path.exists(base_path + '.pick.png'):
+                    with open(base_path + '.pick.png', "rb") as f:
+                        self._client._device.pick_image.set_image(f.read())
+            except OSError:
+                return None
+
+        LOGGER.debug(f"Loaded model metadata for plate {plate_number} without opening the archive")
+        return metadata
+
+    def _save_model_metadata(self, model_file_path: str, metadata: dict):
+        record = dict(metadata, version=MODEL_METADATA_VERSION, fingerprint=file_fingerprint(model_file_path))
+        path = os.path.splitext(model_file_path)[0] + MODEL_METADATA_EXTENSION
+        try:
+            with open(path + '.tmp', "w") as f:
+                json.dump(record, f, separators=(',', ':'))
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            LOGGER.error(f"Failed to save model metadata: {e}")
+
+    def _load_gcode_index(self, model_file_path: str, gcode_member: str):
+        index_path = os.path.splitext(model_file_path)[0] + GCODE_INDEX_EXTENSION
+        fingerprint = list(file_fingerprint(model_file_path))
+        index = None
+        try:
+            with open(index_path, "r") as f:
+                record = json.load(f)
+            if record.get("version") == GCODE_INDEX_VERSION and record.get("fingerprint") == fingerprint:
+                index = GcodeIndex.from_dict(record)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            LOGGER.debug(f"Ignoring unreadable gcode index: {e}")
+
+        if index is None:
+            start_time = time.monotonic()
+            try:
+                # Streamed straight out of the archive so the gcode doesn't have to be extracted first.
+                with ZipFile(model_file_path) as archive, archive.open(gcode_member) as gcode:
+                    index = GcodeIndex.build(gcode)
+            except Exception as e:
+                LOGGER.error(f"Failed to index gcode: {e}")
+                return
+            LOGGER.debug(f"Gcode indexed in {time.monotonic() - start_time:.1f}s")
+
+            try:
+                record = dict(index.to_dict(), version=GCODE_INDEX_VERSION, fingerprint=fingerprint)
+                with open(index_path + '.tmp', "w") as f:
+                    json.dump(record, f, separators=(',', ':'))
+                os.replace(index_path + '.tmp', index_path)
+            except Exception as e:
+                LOGGER.error(f"Failed to save gcode index: {e}")
+
+        if self._gcode_index_source != model_file_path:
+            # A new print started while this one was being indexed.
+            return
+        self._gcode_index = index
+        self._build_layer_weights()
+        self._client.callback("event_printer_data_update")
+
+    def cached_gcode_size(self, gcode_path: str) -> int | None:
+        """Size of the plate gcode ensure_gcode_file() can extract for gcode_path, or None if there's none to extract."""
+        model_file_path = os.path.splitext(gcode_path)[0] + '.3mf'
+        metadata = self._read_model_metadata(model_file_path) if os.path.isfile(model_file_path) else None
+        if metadata is None or not metadata.get("gcode_member"):
+            return None
+        try:
+            # Only the archive's central directory is read.
+            with ZipFile(model_file_path) as archive:
+                return archive.getinfo(metadata["gcode_member"]).file_size
+        except (BadZipFile, KeyError, OSError) as e:
+            LOGGER.debug(f"Unable to read gcode size from '{model_file_path}': {e}")
+            return None
+
+    def ensure_gcode_file(self, gcode_path: str) -> str | None:
+        """Extract the plate gcode of a cached 3mf on first use.
+
+        gcode_path is where the uncompressed gcode lives next to its 3mf. Returns the path actually holding it,
+        which ends in .gz when gcode compression is enabled, or None if there's no cached 3mf to extract it from.
+        """
+        base_path = os.path.splitext(gcode_path)[0]
+        with self._gcode_lock:
+            for path in (gcode_path, gcode_path + '.gz'):
+                if os.path.isfile(path):
+                    return path
+
+            model_file_path = base_path + '.3mf'
+            metadata = self._read_model_metadata(model_file_path) if os.path.isfile(model_file_path) else None
+            if metadata is None or not metadata.get("gcode_member"):
+                return None
+
+            target_path = gcode_path + '.gz' if self._client.compress_gcode else gcode_path
+            start_time = time.monotonic()
+            try:
+                extract_zip_member(model_file_path, metadata["gcode_member"], target_path, compress=self._client.compress_gcode)
+            except Exception as e:
+                LOGGER.error(f"Error while extracting gcode zip entry to target path. {repr(e)}")
+                return None
+            LOGGER.debug(f"Extracted '{target_path}' in {time.monotonic() - start_time:.1f}s")
+            return target_path
+
+    def _apply_model_metadata(self, metadata: dict):
+        if metadata.get("weight") is not None:
+            self.print_weight = metadata["weight"]
+        if metadata.get("bed_type") is not None:
+            self.print_bed_type = metadata["bed_type"]
+        if metadata.get("gcode_file") is not None:
+            self.gcode_file_downloaded = metadata["gcode_file"]
+        # Always replace the objects so a plate without a pick image doesn't keep the previous print's list.
+        self._printable_objects = metadata.get("printable_objects", {})
+
+        # Start a total print length count to be compiled from each filament
+        print_length = 0
+        filaments = metadata.get("filaments", [])
+        self._model_filaments = filaments
+        filament_count = len(self.ams_mapping)
+        plate_filament_count = len(filaments)
+
+        # Reset filament data
+        self._ams_print_weights = [0.0] * 136 # TODO: Convert to a dict in the future?
+        self._ams_print_lengths = [0.0] * 136 # TODO: Convert to a dict in the future?
+
+        for filament in filaments:
+            try:
+                # Filament used for the current print job. The plate info contains filaments
+                # identified in the order they appear in the slicer. These IDs must be
+                # mapped to the AMS tray mappings provided by MQTT print.ams_mapping
+
+                # Zero-index the filament ID
+                filament_index = int(filament.get('id')) - 1
+                log_label = f"External spool"
+
+                # Filament count should be greater than the zero-indexed filament ID
+                if filament_count > filament_index:
+                    ams_index = self.ams_mapping[filament_index]
+                    if ams_index < 16: # BUG - This will not yet handle AMS HT devices
+                        # We add the filament as you can map multiple slicer filaments to the same physical filament.
+                        self._ams_print_weights[ams_index] += float(filament.get('used_g'))
+                        self._ams_print_lengths[ams_index] += float(filament.get('used_m'))
+                        log_label = f"AMS Tray {ams_index + 1}"
+                    else:
+                        LOGGER.debug(f"ams_mapping: {self.ams_mapping}")
+                elif plate_filament_count > 0:
+                    # Multi filament print but the AMS mapping is unknown
+                    # The data is only sent in the mqtt payload once and isn't part of the 'full' data so the integration must be
+                    # live and listening to capture it.
+                    LOGGER.debug(f"filament_index: {filament_index}")
+                    log_label = f"AMS Tray unknown"
+                else:
+                    LOGGER.debug(f"plate_filament_count: {plate_filament_count}")
+
+                LOGGER.debug(f"{log_label}: {filament.get('used_m')}m | {filament.get('used_g')}g")
+
+                # Increase the total print length
+                print_length += float(filament.get('used_m'))
+            except Exception as e:
+                LOGGER.error(f"Failed to parse filament data: {e}")
+
+        self.print_length = print_length
+        self._build_layer_weights()
 
     # The task list is of the following form with a 'hits' array with typical 20 entries.
     #
@@ -1874,12 +2306,13 @@ class PrintJob:
     #     "bedType": "textured_plate"
     #     },
 
-    def _download_task_data_from_cloud(self):
+    def _download_task_data_from_cloud(self, print_start: bool = True):
         # Must have an auth token for this to be possible
         if self._client.bambu_cloud.auth_token == "":
             return
 
-        self._task_data = self._client.bambu_cloud.get_latest_task_for_printer(self._client._serial)
+        self._task_data = self._client.bambu_cloud.get_latest_task_for_printer(
+            self._client._serial, task_id=self._task_id, subtask_name=self._subtask_name, fresh=print_start)
         self._ams_print_weights = [0.0] * 136 # TODO: Convert to a dict in the future?
         self._ams_print_lengths = [0.0] * 136 # TODO: Convert to a dict in the future?
         if self._task_data is None:
@@ -1894,7 +2327,7 @@ class PrintJob:
             LOGGER.debug("Updating bambu cloud task data found for printer.")
             url = self._task_data.get('cover', '')
             if url != "":
-                data = self._client.bambu_cloud.download(url)
+                data = self._client.cover_image_cache.get(url, self._client.bambu_cloud)
                 self._client._device.cover_image.set_image(data)
 
             self.print_length = self._task_data.get('length', self.print_length * 100) / 100
@@ -1943,66 +2376,59 @@ class PrintJob:
                     self.start_time = cloud_dt.astimezone(tz.UTC)
                     LOGGER.debug(f"CLOUD END TIME2: {self.end_time}")
 
-    def _identify_objects_in_pick_image(self, image: Image) -> set:
+    def _identify_objects_in_pick_image(self, image: bytes, plate_number, crc: int) -> set:
+        # The zip entry's CRC identifies the pick image content, so re-parsing the same plate (a reprint or
+        # a re-run download) reuses the earlier result instead of decoding and scanning it again.
+        key = (plate_number, crc, len(image))
+        seen_identify_ids = self._pick_image_cache.get(key)
+        if seen_identify_ids is not None:
+            self._pick_image_cache.move_to_end(key)
+            LOGGER.debug(f"Reusing pick image objects for plate {plate_number}")
+            return seen_identify_ids
+
         LOGGER.debug(f"Processing the pick image for objects")
-        # Open the pick image so we can detect objects present
-        image_width, image_height = image.size
-        
-        seen_colors = set()
-        seen_identify_ids = set()
-
-        # Loop through every pixel and label the first occurrence of each unique color
-        pixels = image.load()
-        for y in range(image_height):
-            for x in range(image_width):
-                current_color = pixels[x, y]
-                r, g, b, a = current_color
-
-                # Skip this pixel if it's transparent or already identified
-                if a == 0 or current_color in seen_colors:
-                    continue
-
-                # Convert the colour to the decimal representation of its hex value
-                identify_id = int(f"0x{b:02X}{g:02X}{r:02X}", 16)
-                seen_colors.add(current_color)
-                seen_identify_ids.add(str(identify_id))
-        
+        with Image.open(BytesIO(image)) as pick_image:
+            seen_identify_ids = pick_image_identify_ids(pick_image)
+
+        self._pick_image_cache[key] = seen_identify_ids
+        while len(self._pick_image_cache) > PICK_IMAGE_CACHE_SIZE:
+            self._pick_image_cache.popitem(last=False)
+
         object_count = len(seen_identify_ids)
         LOGGER.debug(f"Finished proccessing pick image, found {object_count} object{'s'[:object_count^1]}")
         return seen_identify_ids
 
     async def async_ftp_file_check(self, file_path: str, expected_size: int) -> bool:
         """Async check if a file exists on the printer via FTP and matches the expected size."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_ftp_check, file_path, expected_size)
+        job = self._client.ftp_scheduler.submit(FtpPriority.UPLOAD, "file check",
+                                                lambda job: self._sync_ftp_check(file_path, expected_size))
+        return await asyncio.wrap_future(job.future)
 
     def _sync_ftp_check(self, file_path: str, expected_size: int) -> bool:
         """Synchronous FTP check method to run in executor."""
-        ftp = None
         try:
-            # Use the connection helper from bambu_client
-            ftp = self._client.ftp_connection()
-            
-            LOGGER.debug(f"FTP file check: Getting file size for {file_path}")
-            # Get file size
-            size = ftp.size(file_path)
-            LOGGER.debug(f"FTP file check: File size is {size}, expected {expected_size}")
-            
-            return int(size) == expected_size
-            
+            # Pooled so the checks and the upload that usually follows share one session
+            with self._client.ftp_pool.connection() as ftp:
+                LOGGER.debug(f"FTP file check: Getting file size for {file_path}")
+                # Get file size
+                try:
+                    size = ftp.size(file_path)
+                except ftplib.error_perm as e:
+                    # File not present. The session itself is fine to reuse.
+                    LOGGER.debug(f"FTP file check failed for {file_path}: {e}")
+                    return False
+                LOGGER.debug(f"FTP file check: File size is {size}, expected {expected_size}")
+
+                return int(size) == expected_size
+
         except Exception as e:
             LOGGER.debug(f"FTP file check failed for {file_path}: {e}")
             return False
-        finally:
-            if ftp:
-                try:
-                    ftp.quit()
-                except Exception:
-                    pass
 
     async def async_ftp_upload_file(self, local_path: str, remote_path: str, progress_callback=None) -> bool:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._sync_ftp_upload, local_path, remote_path, progress_callback)
+        job = self._client.ftp_scheduler.submit(FtpPriority.UPLOAD, "upload",
+                                                lambda job: self._sync_ftp_upload(local_path, remote_path, progress_callback))
+        return await asyncio.wrap_future(job.future)
 
     def _sync_ftp_upload(self, local_path: str, remote_path: str, progress_callback=None) -> bool:
         try:
@@ -2015,69 +2441,63 @@ class PrintJob:
         except Exception as e:
             LOGGER.error(f"Failed to copy file to local cache: {e}")
 
-        ftp = None
         try:
-            ftp = self._client.ftp_connection()
-
-            # Ensure remote directory exists
-            dirs = remote_path.strip('/').split('/')[:-1]
-            current = ''
-            for d in dirs:
-                current += f'/{d}'
-                try:
-                    ftp.mkd(current)
-                except Exception:
-                    pass  # Directory may already exist which is fine
-
-            LOGGER.debug(f"FTP upload: Starting file upload")
-            file_size = os.path.getsize(local_path)
-            filename = os.path.basename(local_path)
-            total_sent = 0
-            chunk_size = 8192
-
-            def internal_progress_callback(data):
-                nonlocal total_sent
-                total_sent += len(data)
-                if progress_callback:
-                    progress_callback({
-                        "serial": self._client._serial,
-                        "filename": filename,
-                        "bytes_sent": total_sent,
-                        "total": file_size,
-                    })
-
-            with open(local_path, 'rb') as f:
-                try:
-                    ftp.storbinary_no_unwrap(f'STOR {remote_path}', f, blocksize=chunk_size, callback=internal_progress_callback)
-                except Exception as e:
-                    # Handle the benign 426 “Failure reading network stream” case
-                    if "426" in str(e):
-                        LOGGER.warning(f"Ignoring benign FTP 426 for {remote_path}: {e}")
-                    else:
-                        raise
+            with self._client.ftp_pool.connection() as ftp:
+                # Ensure remote directory exists
+                dirs = remote_path.strip('/').split('/')[:-1]
+                current = ''
+                for d in dirs:
+                    current += f'/{d}'
+                    try:
+                        ftp.mkd(current)
+                    except Exception:
+                        pass  # Directory may already exist which is fine
+
+                LOGGER.debug(f"FTP upload: Starting file upload")
+                file_size = os.path.getsize(local_path)
+                filename = os.path.basename(local_path)
+                total_sent = 0
+                chunk_size = 8192
+
+                def internal_progress_callback(data):
+                    nonlocal total_sent
+                    total_sent += len(data)
+                    if progress_callback:
+                        progress_callback({
+                            "serial": self._client._serial,
+                            "filename": filename,
+                            "bytes_sent": total_sent,
+                            "total": file_size,
+                        })
+
+                start_time = time.monotonic()
+                with open(local_path, 'rb') as f:
+                    try:
+                        ftp.storbinary_no_unwrap(f'STOR {remote_path}', f, blocksize=chunk_size, callback=internal_progress_callback)
+                    except Exception as e:
+                        # Handle the benign 426 “Failure reading network stream” case
+                        if "426" in str(e):
+                            LOGGER.warning(f"Ignoring benign FTP 426 for {remote_path}: {e}")
+                        else:
+                            raise
 
-            # Verify upload really succeeded by comparing file size
-            remote_size = ftp.size(remote_path)
-            if remote_size != file_size:
-                LOGGER.error(f"Size mismatch after FTP upload ({remote_size} != expected {file_size})")
-                raise ValueError(f"FTP upload verification failed: remote={remote_size}, local={file_size}")
+                # Verify upload really succeeded by comparing file size
+                remote_size = ftp.size(remote_path)
+                if remote_size != file_size:
+                    LOGGER.error(f"Size mismatch after FTP upload ({remote_size} != expected {file_size})")
+                    raise ValueError(f"FTP upload verification failed: remote={remote_size}, local={file_size}")
 
-            LOGGER.debug(f"FTP upload: Upload completed successfully")
+                LOGGER.debug(f"FTP upload: Upload completed successfully")
+                self._client.ftp_scheduler.record_transfer(file_size, time.monotonic() - start_time)
 
-            return True
+                return True
 
         except Exception as e:
             LOGGER.debug(f"FTP upload failed for {local_path} to {remote_path}: {e}")
             return False
-        finally:
-            if ftp:
-                try:
-                    ftp.quit()
-                except Exception:
-                    pass
 
 @dataclass
-class Info:
+class Info(DirtyTracking):
     """Return all device related content"""
 
     # Device state
@@ -2135,7 +2555,7 @@ class Info:
             self.online = online
             self._client.callback("event_printer_data_update")
 
-    def info_update(self, data):
+    def info_update(self, data) -> bool:
 
         # Example payload:
         # {
@@ -2157,6 +2577,7 @@ class Info:
         #         "hw_ver": "AP04",
         #         "sn": "..."
         #     },
+        self.clear_changes()
         modules = data.get("module", [])
         old_device_type = self.device_type
         self.device_type = get_printer_type(modules, self.device_type)
@@ -2165,9 +2586,10 @@ class Info:
         self.hw_ver = get_hw_version(modules, self.hw_ver)
         self.sw_ver = get_sw_version(modules, self.sw_ver)
         self._client.callback("event_printer_info_update")
+        return self.has_changes
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         # Example payload:
         # {
@@ -2291,13 +2713,13 @@ class Info:
         if nozzle_data is not None and isinstance(nozzle_data, list):
             for entry in nozzle_data:
                 if entry.get("id") in (0, 1):
-                    self.nozzle_diameters[entry["id"]] = float(entry.get("diameter", 0))
-                    self.nozzle_types[entry["id"]] = Info._nozzle_type_name(entry.get("type", ""))
+                    self._set_item("nozzle_diameters", entry["id"], float(entry.get("diameter", 0)))
+                    self._set_item("nozzle_types", entry["id"], Info._nozzle_type_name(entry.get("type", "")))
         else:
             if "nozzle_diameter" in data:
-                self.nozzle_diameters[0] = float(data["nozzle_diameter"])
+                self._set_item("nozzle_diameters", 0, float(data["nozzle_diameter"]))
             if "nozzle_type" in data:
-                self.nozzle_types[0] = data["nozzle_type"]
+                self._set_item("nozzle_types", 0, data["nozzle_type"])
 
         # Door status may be provided in two places depending on printer model.
         # X1 example:
@@ -2326,24 +2748,22 @@ class Info:
                 if entry.get("modeId") in AIRDUCT_MODES
             ]
 
-        # Compute if there's a delta before we check the wifi_signal value.
-        changed = (old_data != f"{self.__dict__}")
-
-        # Now test the wifi signal to minimize how frequently we sent data upates to home assistant. We want
-        # these changes to be done outside the delta test above so that we don't trigger an update every 2-3s
-        # due the noise in this value on A1/P1 printers.
+        # Now test the wifi signal to minimize how frequently we sent data upates to home assistant. We drop
+        # the change from the tracked set unless it's been long enough so that we don't trigger an update every
+        # 2-3s due the noise in this value on A1/P1 printers.
         old_wifi_signal = self.wifi_signal
         self.wifi_signal = int(data.get("wifi_signal", str(self.wifi_signal)).replace("dBm", ""))
         if (self.wifi_signal != old_wifi_signal) :
             if (datetime.now() - self.wifi_sent) > timedelta(seconds=60):
                 # It's been long enough. We can send this one.
                 self.wifi_sent = datetime.now()
-                changed = True
+            else:
+                self.discard_change("wifi_signal")
         
         # "hw_switch_state": 1,
         self.extruder_filament_state = bool(data.get("hw_switch_state", self.extruder_filament_state))
 
-        return changed
+        return self.has_changes
 
     @property
     def active_nozzle_diameter(self) -> float | None:
@@ -2430,7 +2850,7 @@ class Info:
         return flow_prefix + _MATERIALS.get(material_code, "unknown")
 
 
-class Hotend:
+class Hotend(DirtyTracking):
     """Represents a single hotend in the Hotend Rack."""
 
     def __init__(self, hotend_id: int):
@@ -2466,7 +2886,7 @@ class Hotend:
         return {0: "normal", 1: "abnormal", 2: "unknown"}.get(status_bits, "unknown")
 
     def print_update(self, data: dict) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
         self.diameter = data.get("diameter", self.diameter)
         type_code = data.get("type", self.type_code)
         if type_code != self.type_code:
@@ -2478,7 +2898,7 @@ class Hotend:
         self.stat = data.get("stat", self.stat)
         self.color_m = data.get("color_m", self.color_m)
         self.fila_id = data.get("fila_id", self.fila_id)
-        return old_data != f"{self.__dict__}"
+        return self.has_changes
 
 
 class HotendRack:
@@ -2562,7 +2982,7 @@ class HotendRack:
 
 
 @dataclass
-class AMSInstance:
+class AMSInstance(DirtyTracking):
     """Return all AMS instance related info"""
     model: str
     tray: list[AMSTray]
@@ -2599,7 +3019,7 @@ class AMSInstance:
 
 
 @dataclass
-class AMSList:
+class AMSList(DirtyTracking):
     """Return all AMS related info"""
     data: dict[int, AMSInstance]
 
@@ -2640,8 +3060,8 @@ class AMSList:
         else:
             return self.data[self.active_ams_index].tray[self.active_tray_index]
 
-    def info_update(self, data):
-        old_data = f"{self.__dict__}"
+    def info_update(self, data) -> bool:
+        self.clear_changes()
 
         # First determine if this the version info data or the json payload data. We use the version info to determine
         # what devices to add to humidity_index assistant and add all the sensors as entities. And then then json payload data
@@ -2695,6 +3115,7 @@ class AMSList:
                     if index not in self.data:
                         data_changed = True
                         self.data[index] = AMSInstance(self._client, model, index)
+                        self.mark_changed("data")
                     if self.data[index].model != model:
                         data_changed = True
                         self.data[index].model = model
@@ -2711,10 +3132,16 @@ class AMSList:
                 self._first_initialization_done = True
                 data_changed = True
 
-        data_changed = data_changed or (old_data != f"{self.__dict__}")
+        if data_changed:
+            self.mark_changed("data")
+        return self.has_changes
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
+        for ams in self.data.values():
+            ams.clear_changes()
+            for tray in ams.tray:
+                tray.clear_changes()
 
         # AMS json payload is of the form:
         # "ams": {
@@ -2782,28 +3209,28 @@ class AMSList:
                 if entry.get("id") in (0, 1):
                     if "snow" in entry:
                         tray_now = entry["snow"]
-                        self._nozzle_ams_index[entry["id"]] = tray_now >> 8
-                        self._nozzle_tray_index[entry["id"]] = tray_now & 0x3
+                        self._set_item("_nozzle_ams_index", entry["id"], tray_now >> 8)
+                        self._set_item("_nozzle_tray_index", entry["id"], tray_now & 0x3)
         else:
             tray_now = ams_data.get('tray_now')
             if tray_now is not None:
                 tray_now = int(tray_now)
                 if tray_now == 255:
                     # In the legacy mqtt payloads 255 nothing active
-                    self._nozzle_ams_index[0] = 255
-                    self._nozzle_tray_index[0] = 255
+                    self._set_item("_nozzle_ams_index", 0, 255)
+                    self._set_item("_nozzle_tray_index", 0, 255)
                 elif tray_now == 254:
                     # In the legacy mqtt payloads 254 = external spool active
-                    self._nozzle_ams_index[0] = 255
-                    self._nozzle_tray_index[0] = 0
+                    self._set_item("_nozzle_ams_index", 0, 255)
+                    self._set_item("_nozzle_tray_index", 0, 0)
                 elif tray_now >= 80:
                     # AMS HT's are indices 128-135 (0x80-0x87)
-                    self._nozzle_ams_index[0] = tray_now
-                    self._nozzle_tray_index[0] = 0
+                    self._set_item("_nozzle_ams_index", 0, tray_now)
+                    self._set_item("_nozzle_tray_index", 0, 0)
                 else:
                     # Otherwise we need to shift the index down by 2 to get the correct AMS index
-                    self._nozzle_ams_index[0] = tray_now >> 2
-                    self._nozzle_tray_index[0] = tray_now & 0x3
+                    self._set_item("_nozzle_ams_index", 0, tray_now >> 2)
+                    self._set_item("_nozzle_tray_index", 0, tray_now & 0x3)
 
         if len(ams_data) != 0:
             ams_list = ams_data.get("ams", [])
@@ -2812,6 +3239,7 @@ class AMSList:
                 # May get data before info so create entry if necessary
                 if index not in self.data:
                     self.data[index] = AMSInstance(self._client, "Unknown", index)
+                    self.mark_changed("data")
 
                 # Sometimes when the AMS is being powered on it may send bogus humidity and temperature values.
                 # So ignore these values if they are out of a sensible range.
@@ -2858,11 +3286,16 @@ class AMSList:
                 active_tray = (index == self.active_ams_index) and (self.active_tray_index == tray_id)
                 tray.active = active_tray
 
-        data_changed = (old_data != f"{self.__dict__}")
-        return data_changed
+        # Nested AMS and tray changes surface as a change to data.
+        for ams in self.data.values():
+            if ams.has_changes or any(tray.has_changes for tray in ams.tray):
+                self.mark_changed("data")
+                break
+
+        return self.has_changes
 
 @dataclass
-class AMSTray:
+class AMSTray(DirtyTracking):
     """Return all AMS tray related info"""
     empty: bool
     state: int
@@ -2950,6 +3383,16 @@ class AMSTray:
         self.dry_time = 0
         self.bed_temp = 0
 
+    def refresh_name(self) -> bool:
+        """Re-resolve the name of a loaded tray. Returns True if it changed."""
+        if not self.idx or self.name == "Empty":
+            return False
+        name = self._resolve_tray_name(self.idx, self.type)
+        if name == self.name:
+            return False
+        self.name = name
+        return True
+
     def _resolve_tray_name(self, idx: str, tray_type: str) -> str:
         """Human-readable tray name; empty tray_type means unknown (?)."""
         if not tray_type or tray_type in ("", "Empty"):
@@ -2961,7 +3404,7 @@ class AMSTray:
         return tray_type
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         metadata_only = ('id' in data) and set(data.keys()).issubset({'id', 'state'})
 
@@ -2989,7 +3432,7 @@ class AMSTray:
 
         self._resolve_loaded_state(metadata_only)
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     def _resolve_loaded_state(self, metadata_only: bool) -> None:
         """Determine empty/loaded status based on AMS tray state field."""
@@ -3161,7 +3604,7 @@ class ExternalSpool(AMSTray):
 
 
 @dataclass
-class Speed:
+class Speed(DirtyTracking):
     """Return speed profile information"""
     _id: int
     name: str
@@ -3174,13 +3617,13 @@ class Speed:
         self.modifier = 100
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         self._id = int(data.get("spd_lvl", self._id))
         self.name = get_speed_name(self._id)
         self.modifier = int(data.get("spd_mag", self.modifier))
         
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     def SetSpeed(self, option: str):
         for id, speed in SPEED_PROFILE.items():
@@ -3194,7 +3637,7 @@ class Speed:
 
 
 @dataclass
-class StageAction:
+class StageAction(DirtyTracking):
     """Return Stage Action information"""
     _id: int
     _print_type: str
@@ -3206,7 +3649,7 @@ class StageAction:
         self.description = get_current_stage(self._id)
 
     def print_update(self, data) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         self._print_type = data.get("print_type", self._print_type)
         if self._print_type.lower() not in PRINT_TYPE_OPTIONS:
@@ -3221,7 +3664,7 @@ class StageAction:
             self._id = 255
         self.description = get_current_stage(self._id)
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
 @dataclass
 class HMSList:
@@ -3397,16 +3840,57 @@ class ChamberImage:
     """Returns the latest jpeg data from the P1P camera"""
     def __init__(self, client):
         self._client = client
-        self._bytes = bytearray()
+        self._bytes = b""
         self._image_last_updated = None
-
-    def set_image(self, bytes):
-        self._bytes = bytes
-        self._image_last_updated = datetime.now()
+        self._fingerprint = None
+        self._new_image = threading.Condition()
+        # Downscaled copies of _variants_frame keyed by requested size, dropped once a newer frame is requested.
+        self._variants: dict[tuple, bytes] = {}
+        self._variants_frame = None
+        self._variants_lock = threading.Lock()
+
+    def set_image(self, bytes: bytes):
+        # The printer keeps sending identical frames when nothing in view changes (e.g. lights off). Length plus a
+        # crc32 is cheap next to decoding and enough to spot those, so unchanged frames don't trigger updates.
+        fingerprint = (len(bytes), zlib.crc32(bytes))
+        with self._new_image:
+            if fingerprint == self._fingerprint:
+                # Still wake anyone waiting for a frame, the current one is as fresh as it gets.
+                self._new_image.notify_all()
+                return
+            # Frames are immutable bytes so every consumer can share them without copying.
+            self._bytes = bytes
+            self._fingerprint = fingerprint
+            self._image_last_updated = datetime.now()
+            self._new_image.notify_all()
         self._client.callback("event_printer_chamber_image_update")
 
-    def get_image(self) -> bytearray:
-        return self._bytes.copy()
+    def get_image(self) -> bytes:
+        return self._bytes
+
+    def get_scaled_image(self, width: int | None, height: int | None) -> bytes:
+        """Return the current frame shrunk to fit width x height. Each size is only decoded once per frame."""
+        if not width and not height:
+            return self._bytes
+        key = (width, height)
+        with self._variants_lock:
+            frame = self._bytes
+            if self._variants_frame is not frame:
+                self._variants = {}
+                self._variants_frame = frame
+            variant = self._variants.get(key)
+            if variant is None:
+                variant = downscale_jpeg(frame, width, height)
+                if len(self._variants) >= CHAMBER_IMAGE_MAX_VARIANTS:
+                    self._variants.pop(next(iter(self._variants)))
+                self._variants[key] = variant
+        return variant
+
+    def wait_for_image(self, timeout: float) -> bytes:
+        """Block until the next frame arrives or timeout expires and return the latest frame."""
+        with self._new_image:
+            self._new_image.wait(timeout)
+            return self._bytes
     
     def get_last_update_time(self) -> datetime:
         return self._image_last_updated
@@ -3457,7 +3941,7 @@ class PickImage:
 
 
 @dataclass
-class HomeFlag:
+class HomeFlag(DirtyTracking):
     """Contains parsed _values from the homeflag sensor"""
     _value: int
     _sw_ver: str
@@ -3471,13 +3955,15 @@ class HomeFlag:
         self._device_type = ""
         self._fired_missing_sdcard_event = False
 
-    def info_update(self, data):
+    def info_update(self, data) -> bool:
+        self.clear_changes()
         modules = data.get("module", [])
         self._device_type = get_printer_type(modules, self._device_type)
         self._sw_ver = get_sw_version(modules, self._sw_ver)
+        return self.has_changes
 
     def print_update(self, data: dict) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
         self._value = int(data.get("home_flag", str(self._value)))
         if self.sdcard_status == "missing":
             if not self._fired_missing_sdcard_event:
@@ -3485,7 +3971,7 @@ class HomeFlag:
                 self._client.callback("event_printer_missing_sdcard")
         else:
             self._fired_missing_sdcard_event = False
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     @property
     def sdcard_status(self) -> str:
@@ -3553,7 +4039,7 @@ class HomeFlag:
 
 
 @dataclass
-class PrintFun:
+class PrintFun(DirtyTracking):
     """Contains parsed _values from the print->fun sensor"""
     _value: str
     _int_value: int
@@ -3568,7 +4054,7 @@ class PrintFun:
         self._fired_encryption_enabled_event = False
 
     def print_update(self, data: dict) -> bool:
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
         self._value = data.get("fun", str(self._value))
         self._int_value = int(self._value, 16) if self._value else 0
         self._encryption_enabled = (self._int_value & Print_Fun_Values.MQTT_SIGNATURE_REQUIRED) != 0
@@ -3577,7 +4063,7 @@ class PrintFun:
                 self._fired_encryption_enabled_event = True
                 self._client.callback("event_printer_mqtt_encryption_enabled")
 
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     @property
     def mqtt_signature_required(self) -> bool:
@@ -3613,18 +4099,78 @@ class FilamentInfo:
 #   "nozzle_hrc": 3
 # },
       
+class _AccountSlicerSettingsCache:
+    """Slicer settings fetched from the cloud, shared by every printer on the same account.
+
+    Fetches run as background work of the requesting printer's client and concurrent requests for the same account
+    share a single fetch. A result older than the TTL is still handed out immediately while a refresh runs in the
+    background.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._waiters = {}
+
+    def get(self, key, ttl: float, fetch, on_result, start_background):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= ttl:
+                waiters = self._waiters.get(key)
+                if waiters is None:
+                    self._waiters[key] = [on_result]
+                    start_background(functools.partial(self._fetch, key, fetch), "bambu_slicer_settings")
+                elif on_result not in waiters:
+                    waiters.append(on_result)
+        if entry is not None:
+            on_result(entry[1])
+
+    def _fetch(self, key, fetch):
+        try:
+            settings = fetch()
+        except Exception as e:
+            LOGGER.error(f"Failed to fetch slicer settings: {e}")
+            settings = None
+        with self._lock:
+            stale = key in self._entries
+            if settings is not None:
+                self._entries[key] = (time.monotonic(), settings)
+            waiters = self._waiters.pop(key, [])
+        if settings is None and stale:
+            # Keep using the previous result rather than report a failed background refresh.
+            return
+        for on_result in waiters:
+            on_result(settings)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_slicer_settings_cache = _AccountSlicerSettingsCache()
+
+
 class SlicerSettings:
     custom_filaments: dict = field(default_factory=dict)
 
+    # How long fetched slicer settings are reused before being refreshed from the cloud.
+    CACHE_TTL = 6 * 60 * 60
+
     def __init__(self, client):
         self._client = client
         self.custom_filaments = {}
+        self._last_update = None
 
     @property
     def filaments(self):
         return self.custom_filaments
 
+    @property
+    def refresh_due(self) -> bool:
+        """Whether update() hasn't been called yet or was last called longer ago than the TTL."""
+        return self._last_update is None or time.monotonic() - self._last_update >= self.CACHE_TTL
+
     def _load_custom_filaments(self, slicer_settings: dict):
+        custom_filaments = {}
         filaments = slicer_settings.get("filament")
         if filaments is not None:
             private_filaments = filaments.get("private", {})
@@ -3634,7 +4180,7 @@ class SlicerSettings:
                     if " @" in name:
                         name = name[:name.index(" @")]
                     id = filament["filament_id"]
-                    self.custom_filaments[id] = FilamentInfo(
+                    custom_filaments[id] = FilamentInfo(
                         name=name,
                         filament_vendor=filament["filament_vendor"],
                         filament_type=filament["filament_type"],
@@ -3643,22 +4189,37 @@ class SlicerSettings:
                         nozzle_temperature_range_high=filament["nozzle_temperature"][1],
                         nozzle_temperature_range_low=filament["nozzle_temperature"][0]
                     )
-            LOGGER.debug(f"Got {len(self.custom_filaments)} custom filaments.")
+            LOGGER.debug(f"Got {len(custom_filaments)} custom filaments.")
         else:
             LOGGER.debug(f"Received no filament data: {filaments}")
+        # Swap in the new dict in one go as readers run on other threads.
+        self.custom_filaments = custom_filaments
 
     def update(self):
-        self.custom_filaments = {}
-        if self._client.bambu_cloud.auth_token != "":
-            LOGGER.debug(f"Loading slicer settings for {self._client._device.info.device_type} / {self._client._serial}")
-            slicer_settings = self._client.bambu_cloud.get_slicer_settings()
-            if slicer_settings is None:
-                LOGGER.debug(f"Failed to get slicer settings for {self._client._device.info.device_type} / {self._client._serial}")
-                self._client.callback("event_printer_bambu_authentication_failed")
-            else:
-                self._load_custom_filaments(slicer_settings)
+        """Load the slicer settings without blocking the caller. The cloud fetch runs as background work."""
+        self._last_update = time.monotonic()
+        bambu_cloud = self._client.bambu_cloud
+        if bambu_cloud.auth_token == "":
+            self.custom_filaments = {}
+            return
+        LOGGER.debug(f"Loading slicer settings for {self._client._device.info.device_type} / {self._client._serial}")
+        _slicer_settings_cache.get((bambu_cloud.region, bambu_cloud.auth_token),
+                                   self.CACHE_TTL,
+                                   bambu_cloud.get_slicer_settings,
+                                   self._on_slicer_settings,
+                                   self._client.start_background)
+
+    def _on_slicer_settings(self, slicer_settings: dict | None):
+        if slicer_settings is None:
+            LOGGER.debug(f"Failed to get slicer settings for {self._client._device.info.device_type} / {self._client._serial}")
+            self._client.callback("event_printer_bambu_authentication_failed")
+            return
+        previous = self.custom_filaments
+        self._load_custom_filaments(slicer_settings)
+        if self.custom_filaments != previous:
+            self._client._device.refresh_filament_names()
 
-class ExtruderTool:
+class ExtruderTool(DirtyTracking):
     """Contains parsed _values from the ext_tool sensor"""
     state: str
 
@@ -3668,7 +4229,7 @@ class ExtruderTool:
 
     def print_update (self, data):
         # Handle ext_tool update
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         if "device" in data and "ext_tool" in data["device"]:
             ext_tool = data["device"]["ext_tool"]
@@ -3686,9 +4247,9 @@ class ExtruderTool:
             elif mount == 1 and tool_type:
                 self.state = None
         
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
     
-class Extruder:
+class Extruder(DirtyTracking):
     _active_nozzle_index: int
 
     def __init__(self, client):
@@ -3697,13 +4258,13 @@ class Extruder:
 
     def print_update (self, data):
         # Handle ext_tool update
-        old_data = f"{self.__dict__}"
+        self.clear_changes()
 
         extruder_state = data.get("device", {}).get("extruder", {}).get("state")
         if extruder_state is not None:
             self._active_nozzle_index = (extruder_state >> 4) & 0xF
                         
-        return (old_data != f"{self.__dict__}")
+        return self.has_changes
 
     @property
     def active_nozzle_index(self):
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import paho.mqtt.client as mqtt
+
+from ..bambu_client import AsyncioMqttTransport
+from ..utils import BACKGROUND_EXECUTOR_WORKERS, SerialWorker, background_executor
+
+
+class TestSerialWorker(unittest.TestCase):
+
+    def test_runs_in_order_off_the_calling_thread(self):
+        worker = SerialWorker("test")
+        done = threading.Event()
+        seen = []
+
+        def record(value):
+            seen.append((value, threading.current_thread() is threading.main_thread()))
+            if value == 99:
+                done.set()
+
+        for value in range(100):
+            worker.submit(record, value)
+        self.assertTrue(done.wait(5))
+        self.assertEqual([value for value, _ in seen], list(range(100)))
+        self.assertFalse(any(on_main for _, on_main in seen))
+
+    def test_exception_does_not_stop_the_worker(self):
+        worker = SerialWorker("test")
+        done = threading.Event()
+        worker.submit(lambda: 1 / 0)
+        worker.submit(done.set)
+        self.assertTrue(done.wait(5))
+
+    def test_blocked_background_work_does_not_delay_messages(self):
+        # Long FTP downloads or connect attempts occupying every background thread.
+        release = threading.Event()
+        blocked = [background_executor().submit(release.wait, 10) for _ in range(BACKGROUND_EXECUTOR_WORKERS + 2)]
+        try:
+            worker = SerialWorker("test")
+            done = threading.Event()
+            worker.submit(done.set)
+            self.assertTrue(done.wait(1))
+        finally:
+            release.set()
+            for future in blocked:
+                future.result(5)
+
+
+class TestAsyncioMqttTransport(unittest.TestCase):
+    """Runs the transport against a minimal in-process MQTT broker."""
+
+    PORT = 18883
+
+    async def _broker(self, reader, writer):
+        await reader.read(1024)  # CONNECT
+        writer.write(bytes([0x20, 2, 0, 0]))  # CONNACK, accepted
+        topic = b"device/SERIAL/report"
+        payload = b'{"print": {"command": "push_status"}}'
+        body = len(topic).to_bytes(2, 'big') + topic + payload
+        writer.write(bytes([0x30, len(body)]) + body)  # PUBLISH, qos 0
+        await writer.drain()
+        await asyncio.sleep(0.5)
+        writer.close()
+
+    def test_receives_messages_and_reconnects_on_the_event_loop(self):
+        events = []
+
+        async def run():
+            server = await asyncio.start_server(self._broker, "127.0.0.1", self.PORT)
+            client = MagicMock()
+            client.host = "127.0.0.1"
+            client._local_mqtt = True
+            client._port = self.PORT
+            client.client = mqtt.Client(client_id="test")
+            client.client.on_connect = lambda *args: events.append("connect")
+            client.client.on_message = lambda c, u, message: events.append(message.payload)
+            client.client.on_disconnect = lambda *args: events.append("disconnect")
+
+            transport = AsyncioMqttTransport(client, asyncio.get_running_loop())
+            transport.start()
+            for _ in range(50):
+                if events.count("connect") >= 2:
+                    break
+                await asyncio.sleep(0.1)
+            transport.stop()
+            client.client.disconnect()
+            server.close()
+            await asyncio.sleep(0.1)
+
+        asyncio.run(run())
+        self.assertEqual(events[:3], ["connect", b'{"print": {"command": "push_status"}}', "disconnect"])
+        self.assertEqual(events.count("connect"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ..bambu_cloud import BambuCloud, ConnectionMechanismEnum, CoverImageCache
+from ..const import BambuUrl
+
+
+def _response(status_code, json_data):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = ""
+    response.json.return_value = json_data
+    return response
+
+
+class TestSharedCloud(unittest.TestCase):
+
+    def test_shared_returns_one_client_per_account(self):
+        first = BambuCloud.shared("Europe", "a@example.com", "u_1", "token")
+        second = BambuCloud.shared("Europe", "a@example.com", "u_1", "token")
+        other = BambuCloud.shared("Europe", "b@example.com", "u_2", "token2")
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_last_user_closes_the_sessions(self):
+        first, second = MagicMock(), MagicMock()
+        cloud = BambuCloud.shared("Europe", "c@example.com", "u_3", "token", user=first)
+        BambuCloud.shared("Europe", "c@example.com", "u_3", "token", user=second)
+        with patch.object(cloud, "close") as close:
+            cloud.release(first)
+            close.assert_not_called()
+            cloud.release(second)
+            close.assert_called_once()
+
+    def test_session_is_reused(self):
+        cloud = BambuCloud("Europe", "a@example.com", "u_1", "token")
+        with patch("requests.Session") as session_class:
+            session_class.return_value.request.return_value = _response(200, {})
+            cloud._request("GET", "https://example.com/a", mechanism=ConnectionMechanismEnum.REQUESTS)
+            cloud._request("GET", "https://example.com/b", mechanism=ConnectionMechanismEnum.REQUESTS)
+        session_class.assert_called_once()
+        self.assertEqual(session_class.return_value.request.call_count, 2)
+        # Cookies must not leak from one call into the next.
+        self.assertEqual(session_class.return_value.cookies.clear.call_count, 2)
+
+
+class TestInFlightDeduplication(unittest.TestCase):
+
+    def test_concurrent_gets_share_one_request(self):
+        cloud = BambuCloud("Europe", "a@example.com", "u_1", "token")
+        release = threading.Event()
+        calls = []
+
+        def send_get(url):
+            calls.append(url)
+            release.wait(5)
+            return _response(200, {"hits": []})
+
+        results = []
+        with patch.object(cloud, "_send_get", side_effect=send_get):
+            threads = [threading.Thread(target=lambda: results.append(cloud.get_tasklist())) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            # Give every thread time to join the in-flight request before it completes.
+            threading.Event().wait(0.2)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"hits": []}] * 10)
+
+    def test_failure_is_shared_and_not_cached(self):
+        cloud = BambuCloud("Europe", "a@example.com", "u_1", "token")
+        with patch.object(cloud, "_send_get", side_effect=PermissionError(500, "")):
+            self.assertIsNone(cloud.get_tasklist())
+        self.assertEqual(cloud._in_flight, {})
+        with patch.object(cloud, "_send_get", return_value=_response(200, {"hits": [1]})):
+            self.assertEqual(cloud.get_tasklist(), {"hits": [1]})
+
+
+class TestTasklistCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cloud = BambuCloud("Europe", "a@example.com", "u_1", "token")
+        self.pages = []
+        self.fetches = 0
+
+        def get_tasklist():
+            self.fetches += 1
+            return self.pages.pop(0)
+
+        self.cloud.get_tasklist = get_tasklist
+
+    def _task(self, id, device, weight=1.0):
+        return {"id": id, "deviceId": device, "weight": weight}
+
+    def test_latest_task_is_indexed_by_device_and_cached(self):
+        self.pages.append({"hits": [self._task(3, "A"), self._task(2, "B"), self._task(1, "A")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A")["id"], 3)
+        self.assertEqual(self.cloud.get_latest_task_for_printer("B")["id"], 2)
+        self.assertIsNone(self.cloud.get_latest_task_for_printer("C"))
+        self.assertEqual(self.fetches, 1)
+
+    def test_refresh_merges_new_and_updated_tasks(self):
+        self.pages.append({"hits": [self._task(2, "A", weight=0), self._task(1, "A")]})
+        self.assertEqual([t["id"] for t in self.cloud.get_tasklist_for_printer("A")], [2, 1])
+
+        # Task 2 finished (weight known now) and task 3 started.
+        self.pages.append({"hits": [self._task(3, "A"), self._task(2, "A", weight=5.0), self._task(1, "A"), self._task(0, "A")]})
+        self.cloud._tasklist_fetched -= BambuCloud.TASKLIST_TTL
+        tasks = self.cloud.get_tasklist_for_printer("A")
+        self.assertEqual([t["id"] for t in tasks], [3, 2, 1, 0])
+        self.assertEqual(tasks[1]["weight"], 5.0)
+
+    def test_older_tasks_on_other_printers_are_updated(self):
+        self.pages.append({"hits": [self._task(2, "B"), self._task(1, "A", weight=0)]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A")["weight"], 0)
+
+        # B's newer task is unchanged but A's task has finished since.
+        self.pages.append({"hits": [self._task(2, "B"), self._task(1, "A", weight=5.0)]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A", fresh=True)["weight"], 5.0)
+
+    def test_latest_task_survives_trimming(self):
+        hits = [self._task(id, "A") for id in range(100, 75, -1)]
+        for _ in range(2):
+            self.pages.append({"hits": hits})
+            self.assertEqual(self.cloud.get_latest_task_for_printer("A", fresh=True)["id"], 100)
+        self.assertEqual(len(self.cloud.get_tasklist_for_printer("A")), BambuCloud.TASKLIST_MAX_TASKS_PER_DEVICE)
+        self.assertEqual(len(self.cloud._tasks_by_id), BambuCloud.TASKLIST_MAX_TASKS_PER_DEVICE)
+
+    def test_failed_refresh_keeps_cached_tasks(self):
+        self.pages.append({"hits": [self._task(1, "A")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A")["id"], 1)
+        self.pages.append(None)
+        self.cloud._tasklist_fetched -= BambuCloud.TASKLIST_TTL
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A")["id"], 1)
+
+    def test_print_start_skips_the_ttl(self):
+        self.pages.append({"hits": [self._task(1, "A")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A")["id"], 1)
+        self.pages.append({"hits": [self._task(2, "A"), self._task(1, "A")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A", fresh=True)["id"], 2)
+        self.assertEqual(self.fetches, 2)
+
+    def test_refetches_when_cached_task_is_not_the_current_one(self):
+        # Printer B's fetch fills the cache just before printer A starts a new print.
+        self.pages.append({"hits": [self._task(2, "B"), self._task(1, "A")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("B", task_id="2")["id"], 2)
+
+        self.pages.append({"hits": [self._task(3, "A"), self._task(2, "B"), self._task(1, "A")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A", task_id="3")["id"], 3)
+        self.assertEqual(self.fetches, 2)
+
+        # A matching cached task is served from the cache, matched on name when there's no task id.
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A", task_id="3")["id"], 3)
+        self.assertEqual(self.fetches, 2)
+        self.pages.append({"hits": [dict(self._task(4, "A"), title="Cube")]})
+        self.assertEqual(self.cloud.get_latest_task_for_printer("A", task_id="0", subtask_name="Cube")["id"], 4)
+        self.assertEqual(self.fetches, 3)
+
+    def test_failed_first_fetch_returns_none(self):
+        self.pages.append(None)
+        self.assertIsNone(self.cloud.get_latest_task_for_printer("A"))
+
+
+class TestCoverImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "covers")
+        self.cloud = MagicMock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _download(self, status_code, content=b"", headers={}):
+        response = MagicMock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = headers
+        self.cloud.download_response.return_value = response
+
+    def test_revalidates_with_etag_and_survives_restart(self):
+        cache = CoverImageCache(self.directory)
+        self._download(200, b"png-1", {"ETag": '"abc"', "Last-Modified": "Wed, 21 Oct 2025 07:28:00 GMT"})
+        self.assertEqual(cache.get("https://cdn.example.com/cover/1.png?sig=1", self.cloud), b"png-1")
+        self.cloud.download_response.assert_called_with("https://cdn.example.com/cover/1.png?sig=1", headers={})
+
+        # A new instance (restart) with a freshly signed URL for the same image revalidates from disk.
+        cache = CoverImageCache(self.directory)
+        self._download(304)
+        self.assertEqual(cache.get("https://cdn.example.com/cover/1.png?sig=2", self.cloud), b"png-1")
+        self.cloud.download_response.assert_called_with("https://cdn.example.com/cover/1.png?sig=2", headers={
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2025 07:28:00 GMT",
+        })
+
+    def test_changed_image_replaces_cached_copy(self):
+        cache = CoverImageCache(self.directory)
+        self._download(200, b"png-1", {"ETag": '"abc"'})
+        cache.get("https://cdn.example.com/cover/1.png", self.cloud)
+        self._download(200, b"png-2", {"ETag": '"def"'})
+        self.assertEqual(cache.get("https://cdn.example.com/cover/1.png", self.cloud), b"png-2")
+        self._download(304)
+        self.assertEqual(CoverImageCache(self.directory).get("https://cdn.example.com/cover/1.png", self.cloud), b"png-2")
+
+    def test_failed_download_falls_back_to_cache(self):
+        cache = CoverImageCache(self.directory)
+        self._download(403, b"<Error/>")
+        self.assertIsNone(cache.get("https://cdn.example.com/cover/1.png", self.cloud))
+        self._download(200, b"png-1")
+        cache.get("https://cdn.example.com/cover/1.png", self.cloud)
+        self.cloud.download_response.return_value = None
+        self.assertEqual(cache.get("https://cdn.example.com/cover/1.png", self.cloud), b"png-1")
+
+    def test_disk_cache_is_size_capped(self):
+        cache = CoverImageCache(self.directory, max_disk_bytes=25)
+        for index in range(5):
+            self._download(200, bytes([index]) * 10)
+            cache.get(f"https://cdn.example.com/cover/{index}.png", self.cloud)
+        images = [name for name in os.listdir(self.directory) if name.endswith(".img")]
+        self.assertEqual(len(images), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
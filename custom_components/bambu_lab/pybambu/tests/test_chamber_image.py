@@ -0,0 +1,144 @@
+import ssl
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from ..bambu_client import BambuClient, CameraSession, ChamberImageThread
+from ..models import ChamberImage
+from .test_utils import make_jpeg
+
+
+class FakeSslSocket:
+    """Delivers the queued chunks one recv_into at a time, with SSLWantReadError in between like a real socket."""
+
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+        self.want_read = 0
+
+    def recv_into(self, view):
+        chunk = self._chunks.pop(0)
+        if chunk is None:
+            self.want_read += 1
+            raise ssl.SSLWantReadError()
+        count = min(len(chunk), len(view))
+        view[:count] = chunk[:count]
+        if count < len(chunk):
+            self._chunks.insert(0, chunk[count:])
+        return count
+
+
+class TestChamberImageReader(unittest.TestCase):
+
+    def setUp(self):
+        self.thread = ChamberImageThread(MagicMock())
+        self.selector = MagicMock()
+
+    def tearDown(self):
+        self.thread._wakeup_read.close()
+        self.thread._wakeup_write.close()
+
+    def test_reads_exactly_the_requested_length(self):
+        sock = FakeSslSocket([b"\x01\x02", None, b"\x03\x04\x05", None, None, b"\x06\x07\x08\x09"])
+        buffer = bytearray(8)
+        self.assertTrue(self.thread._recv_exactly(sock, self.selector, memoryview(buffer)))
+        self.assertEqual(buffer, bytearray(range(1, 9)))
+        # Waited in the selector once per SSLWantReadError, never by sleeping.
+        self.assertEqual(self.selector.select.call_count, sock.want_read)
+        # The remaining byte is left for the next frame.
+        self.assertEqual(sock._chunks, [b"\x09"])
+
+    def test_stop_interrupts_the_read(self):
+        sock = FakeSslSocket([b"\x01", None])
+        self.selector.select.side_effect = lambda: self.thread.stop()
+        self.assertFalse(self.thread._recv_exactly(sock, self.selector, memoryview(bytearray(4))))
+
+    def test_closed_connection_raises(self):
+        sock = FakeSslSocket([b""])
+        with self.assertRaises(RuntimeError):
+            self.thread._recv_exactly(sock, self.selector, memoryview(bytearray(16)))
+
+
+class TestCameraSession(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.asyncio_transport = False
+        self.client.call_later = lambda delay, target: BambuClient.call_later(self.client, delay, target)
+        self.session = CameraSession(self.client, 0.05)
+
+    def tearDown(self):
+        self.session.stop()
+
+    def test_not_wanted_until_requested(self):
+        self.assertFalse(self.session.wanted)
+        self.session.request()
+        self.assertTrue(self.session.wanted)
+        self.client.start_camera.assert_called_once()
+
+    def test_disconnects_after_last_consumer_is_idle(self):
+        release_first = self.session.acquire()
+        release_second = self.session.acquire()
+        release_first()
+        release_first()  # Releasing twice must not drop the other consumer.
+        self.assertEqual(self.session.consumers, 1)
+        time.sleep(0.1)
+        self.client.stop_camera.assert_not_called()
+
+        release_second()
+        self.assertTrue(self.session.wanted)
+        time.sleep(0.15)
+        self.assertFalse(self.session.wanted)
+        self.client.stop_camera.assert_called_once()
+
+    def test_acquire_cancels_pending_idle_disconnect(self):
+        self.session.request()
+        release = self.session.acquire()
+        time.sleep(0.1)
+        self.client.stop_camera.assert_not_called()
+        release()
+
+    def test_zero_timeout_is_always_on(self):
+        session = CameraSession(self.client, 0)
+        self.assertTrue(session.wanted)
+        session.acquire()()
+        time.sleep(0.05)
+        self.assertTrue(session.wanted)
+        self.client.stop_camera.assert_not_called()
+
+
+class TestChamberImageVariants(unittest.TestCase):
+
+    def setUp(self):
+        self.chamber_image = ChamberImage(MagicMock())
+        self.chamber_image.set_image(make_jpeg(1280, 720))
+
+    def test_variant_is_reused_until_the_next_frame(self):
+        first = self.chamber_image.get_scaled_image(320, 180)
+        self.assertLess(len(first), len(self.chamber_image.get_image()))
+        self.assertIs(self.chamber_image.get_scaled_image(320, 180), first)
+
+        self.chamber_image.set_image(make_jpeg(1280, 720, color=(200, 80, 40)))
+        self.assertIsNot(self.chamber_image.get_scaled_image(320, 180), first)
+
+    def test_full_frame_without_size(self):
+        self.assertIs(self.chamber_image.get_scaled_image(None, None), self.chamber_image.get_image())
+
+    def test_unchanged_frame_is_not_published(self):
+        client = self.chamber_image._client
+        client.callback.reset_mock()
+        updated = self.chamber_image.get_last_update_time()
+        self.chamber_image.set_image(bytes(self.chamber_image.get_image()))
+        client.callback.assert_not_called()
+        self.assertEqual(self.chamber_image.get_last_update_time(), updated)
+
+        self.chamber_image.set_image(make_jpeg(640, 360))
+        client.callback.assert_called_once_with("event_printer_chamber_image_update")
+
+    def test_variant_count_is_bounded(self):
+        for width in range(100, 400, 20):
+            self.chamber_image.get_scaled_image(width, None)
+        self.assertLessEqual(len(self.chamber_image._variants), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,265 @@
+import ftplib
+import io
+import os
+import ssl
+import tempfile
+import time
+import unittest
+import zipfile
+from unittest.mock import MagicMock
+
+from ..bambu_client import BambuClient, FtpConnectionPool, FtpScheduler
+from ..const import FtpPriority
+from ..utils import zip_crc_ok
+
+
+class TestFtpConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.asyncio_transport = False
+        self.client.call_later = lambda delay, target: BambuClient.call_later(self.client, delay, target)
+        self.client.ftp_connection.side_effect = self._connect
+        self.pool = FtpConnectionPool(self.client, max_size=2, idle_timeout=0.05)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def _connect(self, tls_session=None):
+        ftp = MagicMock(name="ftp")
+        ftp.sock = MagicMock(spec=ssl.SSLSocket)
+        return ftp
+
+    def test_session_is_reused_after_noop_check(self):
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            self.assertIs(second, first)
+        first.voidcmd.assert_called_once_with("NOOP")
+        self.assertEqual(self.client.ftp_connection.call_count, 1)
+        first.quit.assert_not_called()
+
+    def test_concurrent_operations_get_their_own_session(self):
+        with self.pool.connection() as first:
+            with self.pool.connection() as second:
+                self.assertIsNot(second, first)
+        self.assertEqual(self.pool.idle_count, 2)
+
+    def test_stale_session_is_replaced(self):
+        with self.pool.connection() as first:
+            pass
+        first.voidcmd.side_effect = EOFError()
+        with self.pool.connection() as second:
+            self.assertIsNot(second, first)
+        first.close.assert_called_once()
+
+    def test_session_is_closed_when_operation_fails(self):
+        with self.assertRaises(ftplib.error_temp):
+            with self.pool.connection() as ftp:
+                raise ftplib.error_temp("426 Failure reading network stream")
+        ftp.quit.assert_called_once()
+        self.assertEqual(self.pool.idle_count, 0)
+
+    def test_idle_sessions_expire(self):
+        with self.pool.connection() as ftp:
+            pass
+        self.assertEqual(self.pool.idle_count, 1)
+        time.sleep(0.15)
+        self.assertEqual(self.pool.idle_count, 0)
+        ftp.quit.assert_called_once()
+
+    def test_tls_session_is_offered_to_new_connections(self):
+        with self.pool.connection() as first:
+            with self.pool.connection():
+                pass
+        calls = self.client.ftp_connection.call_args_list
+        self.assertIsNone(calls[0].kwargs["tls_session"])
+        self.assertIs(calls[1].kwargs["tls_session"], first.sock.session)
+
+
+class FakeFtp:
+    """Serves one file, dropping the connection after drop_after bytes of each of the first drops transfers."""
+
+    def __init__(self, content: bytes, drop_after: int = 0, drops: int = 0, reject_rest: bool = False):
+        self.content = content
+        self.reject_rest = reject_rest
+        self.drop_after = drop_after
+        self.drops = drops
+        self.rests = []
+        self.sock = MagicMock()
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        if cmd != "RETR /file":
+            raise ftplib.error_perm("550 Failed to open file.")
+        self.rests.append(rest)
+        if rest and self.reject_rest:
+            raise ftplib.error_perm("502 REST not implemented.")
+        data = self.content[rest or 0:]
+        if self.drops:
+            self.drops -= 1
+            callback(data[:self.drop_after])
+            raise ConnectionResetError("Connection reset by peer")
+        for i in range(0, len(data), blocksize):
+            callback(data[i:i + blocksize])
+
+    def close(self):
+        pass
+
+
+class TestFtpDownload(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.pool = FtpConnectionPool(self.client)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.3mf")
+        self.content = os.urandom(100_000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resumes_after_dropped_connection(self):
+        ftp = FakeFtp(self.content, drop_after=30_000, drops=2)
+        progress = []
+        self.pool.download(ftp, "/file", self.path, size=len(self.content), progress=progress.append)
+
+        self.assertEqual(ftp.rests, [None, 30_000, 60_000])
+        self.assertEqual(self.client.ftp_login.call_count, 2)
+        self.assertEqual(progress[-1], len(self.content))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertFalse(os.path.exists(f"{self.path}.part"))
+
+    def test_partial_file_is_kept_for_next_attempt(self):
+        ftp = FakeFtp(self.content, drop_after=40_000, drops=10)
+        with self.assertRaises(IOError):
+            self.pool.download(ftp, "/file", self.path, size=len(self.content), attempts=1)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.path.getsize(f"{self.path}.part"), 40_000)
+
+        self.pool.download(FakeFtp(self.content), "/file", self.path, size=len(self.content))
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_rejected_resume_on_last_attempt_fails(self):
+        ftp = FakeFtp(self.content, drop_after=30_000, drops=1, reject_rest=True)
+        with self.assertRaises(IOError):
+            self.pool.download(ftp, "/file", self.path, attempts=2)
+        self.assertEqual(ftp.rests, [None, 30_000])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_missing_file_is_not_retried(self):
+        ftp = FakeFtp(self.content)
+        with self.assertRaises(ftplib.error_perm):
+            self.pool.download(ftp, "/missing", self.path)
+        self.client.ftp_login.assert_not_called()
+
+    def test_failed_verification_discards_resumed_download(self):
+        with self.assertRaises(IOError):
+            self.pool.download(FakeFtp(self.content, drop_after=30_000, drops=1), "/file", self.path,
+                               verify=zip_crc_ok)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(f"{self.path}.part"))
+
+    def test_uninterrupted_download_is_not_verified(self):
+        verify = MagicMock(return_value=False)
+        self.pool.download(FakeFtp(self.content), "/file", self.path, size=len(self.content), verify=verify)
+        verify.assert_not_called()
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_zip_crc_check(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("Metadata/slice_info.config", "x" * 1000)
+        good = os.path.join(self.tmp.name, "good.3mf")
+        with open(good, "wb") as f:
+            f.write(buffer.getvalue())
+        self.assertTrue(zip_crc_ok(good))
+
+        corrupt = bytearray(buffer.getvalue())
+        corrupt[60] ^= 0xff
+        bad = os.path.join(self.tmp.name, "bad.3mf")
+        with open(bad, "wb") as f:
+            f.write(corrupt)
+        self.assertFalse(zip_crc_ok(bad))
+
+
+class TestFtpScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.asyncio_transport = False
+        self.client.call_later = lambda delay, target: BambuClient.call_later(self.client, delay, target)
+        # Hold started jobs so the test decides when each one runs.
+        self.started = []
+        self.client.start_background.side_effect = lambda target, name=None: self.started.append(target)
+        self.scheduler = FtpScheduler(self.client, max_concurrency=1)
+        self.ran = []
+
+    def _job(self, name, result=None):
+        def target(job):
+            self.ran.append(name)
+            return result
+        return target
+
+    def test_runs_in_priority_order_within_concurrency(self):
+        first = self.scheduler.submit(FtpPriority.TIMELAPSE, "timelapse", self._job("timelapse"))
+        self.scheduler.submit(FtpPriority.TIMELAPSE, "timelapse 2", self._job("timelapse 2"))
+        self.scheduler.submit(FtpPriority.UPLOAD, "upload", self._job("upload"))
+        model = self.scheduler.submit(FtpPriority.MODEL, "model", self._job("model", result=True))
+        self.assertEqual(len(self.started), 1)
+        self.assertEqual(self.scheduler.queue_depth, 4)
+
+        while self.started:
+            self.started.pop(0)()
+        self.assertEqual(self.ran, ["timelapse", "model", "upload", "timelapse 2"])
+        self.assertTrue(first.future.done())
+        self.assertTrue(model.future.result())
+        self.assertEqual(self.scheduler.queue_depth, 0)
+
+    def test_cancelled_job_never_runs(self):
+        self.scheduler.submit(FtpPriority.UPLOAD, "upload", self._job("upload"))
+        model = self.scheduler.submit(FtpPriority.MODEL, "model", self._job("model"))
+        self.scheduler.cancel(model)
+        self.assertTrue(model.future.cancelled())
+        while self.started:
+            self.started.pop(0)()
+        self.assertEqual(self.ran, ["upload"])
+
+    def test_retry_releases_the_worker(self):
+        def target(job):
+            self.ran.append(f"model #{job.attempt}")
+            if job.attempt < 2:
+                return job.retry(0.05)
+            return "done"
+
+        model = self.scheduler.submit(FtpPriority.MODEL, "model", target)
+        self.started.pop(0)()
+        self.assertFalse(model.future.done())
+        self.assertEqual(self.scheduler.queue_depth, 1)
+
+        # Other work runs while the model download waits to retry.
+        self.scheduler.submit(FtpPriority.UPLOAD, "upload", self._job("upload"))
+        self.started.pop(0)()
+        time.sleep(0.15)
+        self.started.pop(0)()
+        self.assertEqual(self.ran, ["model #1", "upload", "model #2"])
+        self.assertEqual(model.future.result(), "done")
+
+    def test_cancel_while_waiting_to_retry(self):
+        model = self.scheduler.submit(FtpPriority.MODEL, "model", lambda job: job.retry(0.05))
+        self.started.pop(0)()
+        self.scheduler.cancel(model)
+        time.sleep(0.15)
+        self.assertEqual(self.started, [])
+        self.assertIsNone(model.future.result(timeout=1))
+        self.assertEqual(self.scheduler.queue_depth, 0)
+
+    def test_throughput(self):
+        self.scheduler.record_transfer(2_000_000, 2.0)
+        self.assertEqual(self.scheduler.throughput, 1_000_000)
+        self.client.callback.assert_called_with("event_printer_data_update", frozenset({"ftp"}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import io
+import unittest
+
+from ..gcode import GcodeIndex
+
+GCODE = b"""; HEADER_BLOCK_START
+; total layer number: 3
+; HEADER_BLOCK_END
+M83
+G28
+M73 P0 R12
+T0
+G1 X1 Y1 E2 ; purge line
+; CHANGE_LAYER
+; Z_HEIGHT: 0.2
+; LAYER_HEIGHT: 0.2
+M73 P10 R10
+; start printing object, unique label id: 77
+G1 X10 Y10 F3000
+G1 X20 Y10 E1.5
+G1 X20 Y30 E2.5
+G1 E-0.8
+; stop printing object, unique label id: 77
+; start printing object, unique label id: 88
+G1 X50 Y50
+G1 X60 Y55 E1
+; stop printing object, unique label id: 88
+; CHANGE_LAYER
+; Z_HEIGHT: 0.4
+M620 S1A
+T1
+M621 S1A
+; start printing object, unique label id: 77
+G1 X15 Y5
+G1 X25 Y5 E3
+; stop printing object, unique label id: 77
+; CHANGE_LAYER
+; Z_HEIGHT: 0.6
+M73 P90 R1
+T1000
+G1 X30 Y30 E1
+"""
+
+
+class TestGcodeIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GcodeIndex.build(io.BytesIO(GCODE))
+
+    def test_layers(self):
+        self.assertEqual(self.index.layer_count, 3)
+        self.assertEqual([layer[1] for layer in self.index.layers], [0.2, 0.4, 0.6])
+        for layer in self.index.layers:
+            self.assertTrue(GCODE[layer[0]:].startswith(b"; CHANGE_LAYER"))
+        self.assertIsNone(self.index.layer(0))
+        self.assertIsNone(self.index.layer(4))
+
+    def test_remaining_time_carries_over(self):
+        self.assertEqual([self.index.remaining_minutes(n) for n in (1, 2, 3)], [10, 10, 1])
+
+    def test_extrusion_per_tool(self):
+        self.assertEqual(self.index.filaments, [0, 1])
+        self.assertEqual(self.index.extruded_before_layer(1), {0: 2.0, 1: 0.0})
+        self.assertEqual(self.index.extruded_before_layer(2), {0: 6.2, 1: 0.0})
+        self.assertEqual(self.index.extruded_before_layer(3), {0: 6.2, 1: 3.0})
+        # T1000 isn't a filament so the last move still counts against T1.
+        self.assertEqual(self.index.extruded_before_layer(4), {0: 6.2, 1: 4.0})
+
+    def test_absolute_extrusion(self):
+        index = GcodeIndex.build(io.BytesIO(b"M82\n; CHANGE_LAYER\nG1 X1 E5\nG1 X2 E8\nG92 E0\n; CHANGE_LAYER\nG1 X3 E1\n"))
+        self.assertEqual(index.extruded_before_layer(2), {0: 8.0})
+        self.assertEqual(index.total_extrusion, [9.0])
+
+    def test_objects(self):
+        self.assertEqual(self.index.objects["77"], {"layers": [1, 2], "extents": [10.0, 5.0, 25.0, 30.0]})
+        self.assertEqual(self.index.objects["88"], {"layers": [1, 1], "extents": [50.0, 50.0, 60.0, 55.0]})
+
+    def test_round_trip(self):
+        index = GcodeIndex.from_dict(self.index.to_dict())
+        self.assertEqual(index.to_dict(), self.index.to_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,13 +4,21 @@ from unittest.mock import call, MagicMock
 from datetime import datetime
 import sys
 import os
+import gzip
 import json
+import tempfile
+import threading
+import zipfile
+from io import BytesIO
+from unittest.mock import patch
+from PIL import Image
 
 # Add the parent directory to the Python path to find pybambu
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from pybambu.models import PrintJob, Info, AMSList, Extruder, Fans, HMSList, PrintError, Temperature
+from pybambu.models import Device, PrintJob, Info, AMSList, Extruder, Fans, HMSList, PrintError, SlicerSettings, Temperature, _slicer_settings_cache
 from pybambu.const import FansEnum, Printers
+from pybambu.gcode import GcodeIndex
 
 class TestPrintJob(unittest.TestCase):
     def setUp(self):
@@ -32,6 +40,154 @@ class TestPrintJob(unittest.TestCase):
         self.assertEqual(self.print_job.current_layer, 1)
         self.assertEqual(self.print_job.total_layers, 70)
 
+class TestModelMetadata(unittest.TestCase):
+
+    SLICE_INFO = """<?xml version="1.0" encoding="UTF-8"?>
+<config><plate>
+  <metadata key="index" value="1"/>
+  <metadata key="weight" value="20.91"/>
+  <object identify_id="77" name="Cube.stl" skipped="false"/>
+  <object identify_id="88" name="Hidden.stl" skipped="false"/>
+  <filament id="1" type="PLA" color="#000000" used_m="5.45" used_g="17.32"/>
+  <filament id="2" type="PLA" color="#FFFFFF" used_m="0.84" used_g="2.66"/>
+</plate></config>"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.directory.name, "1234-cube.3mf")
+        pick = Image.new("RGBA", (16, 16), (0, 0, 0, 0))
+        pick.paste((77, 0, 0, 255), (2, 2, 8, 8))
+        pick_png = BytesIO()
+        pick.save(pick_png, format="PNG")
+        with zipfile.ZipFile(self.model_path, "w") as archive:
+            archive.writestr("Metadata/slice_info.config", self.SLICE_INFO)
+            archive.writestr("Metadata/plate_1.png", b"cover")
+            archive.writestr("Metadata/plate_1.gcode", b"G28\n")
+            archive.writestr("Metadata/plate_1.json", json.dumps({"bed_type": "textured_plate"}))
+            archive.writestr("Metadata/pick_1.png", pick_png.getvalue())
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _load(self):
+        print_job = PrintJob(MagicMock())
+        print_job.ams_mapping = [2, 0]
+        job = MagicMock(attempt=1, cancelled=False)
+        with patch.object(print_job, "_attempt_ftp_download", return_value=self.model_path), \
+             patch.object(print_job, "prune_print_history_files"):
+            self.assertTrue(print_job._async_download_task_data_from_printer_worker(job))
+        return print_job
+
+    def _assert_loaded(self, print_job):
+        self.assertEqual(print_job.print_weight, "20.91")
+        self.assertEqual(print_job.print_bed_type, "textured_plate")
+        self.assertEqual(print_job.gcode_file_downloaded, "1234-cube.gcode")
+        self.assertEqual(print_job.get_printable_objects, {"77": "Cube.stl"})
+        self.assertAlmostEqual(print_job.print_length, 6.29)
+        self.assertAlmostEqual(print_job._ams_print_weights[2], 17.32)
+        self.assertAlmostEqual(print_job._ams_print_weights[0], 2.66)
+        print_job._client._device.cover_image.set_image.assert_called_with(b"cover")
+
+    def test_cached_model_is_not_reparsed(self):
+        self._assert_loaded(self._load())
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "1234-cube.metadata.json")))
+
+        with patch("pybambu.models.ZipFile", side_effect=AssertionError("archive opened")):
+            self._assert_loaded(self._load())
+
+    def test_printable_objects_are_replaced_by_the_next_model(self):
+        print_job = self._load()
+        print_job._apply_model_metadata({"plate": "1", "printable_objects": {}})
+        self.assertEqual(print_job.get_printable_objects, {})
+
+    def test_gcode_is_extracted_on_demand(self):
+        print_job = self._load()
+        gcode_path = os.path.join(self.directory.name, "1234-cube.gcode")
+        self.assertFalse(os.path.exists(gcode_path))
+        self.assertEqual(print_job.cached_gcode_size(gcode_path), 4)
+        self.assertIsNone(print_job.cached_gcode_size(os.path.join(self.directory.name, "other.gcode")))
+
+        print_job._client.compress_gcode = False
+        self.assertEqual(print_job.ensure_gcode_file(gcode_path), gcode_path)
+        with open(gcode_path, "rb") as f:
+            self.assertEqual(f.read(), b"G28\n")
+
+    def test_gcode_can_be_kept_compressed(self):
+        print_job = self._load()
+        print_job._client.compress_gcode = True
+        gcode_path = os.path.join(self.directory.name, "1234-cube.gcode")
+        self.assertEqual(print_job.ensure_gcode_file(gcode_path), gcode_path + ".gz")
+        with gzip.open(gcode_path + ".gz", "rb") as f:
+            self.assertEqual(f.read(), b"G28\n")
+        self.assertFalse(os.path.exists(gcode_path))
+
+    def test_gcode_index_is_stored_with_the_model(self):
+        print_job = self._load()
+        print_job._client.start_background.assert_called_once()
+        print_job._client.start_background.call_args.args[0]()
+        self.assertEqual(print_job.gcode_index.filaments, [])
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, "1234-cube.gcode_index.json")))
+
+        print_job = self._load()
+        with patch("pybambu.models.ZipFile", side_effect=AssertionError("archive opened")):
+            print_job._client.start_background.call_args.args[0]()
+        self.assertIsNotNone(print_job.gcode_index)
+
+    def test_no_gcode_without_cached_model(self):
+        print_job = PrintJob(MagicMock())
+        self.assertIsNone(print_job.ensure_gcode_file(os.path.join(self.directory.name, "other.gcode")))
+
+    def test_changed_model_is_reparsed(self):
+        self._load()
+        with zipfile.ZipFile(self.model_path, "a") as archive:
+            archive.writestr("Metadata/extra.txt", b"changed")
+        with patch("pybambu.models.ZipFile", side_effect=AssertionError("archive opened")):
+            print_job = PrintJob(MagicMock())
+            self.assertIsNone(print_job._load_model_metadata(self.model_path))
+        self._assert_loaded(self._load())
+
+
+class TestLayerWeights(unittest.TestCase):
+
+    def setUp(self):
+        self.print_job = PrintJob(MagicMock())
+        self.print_job._client._device.external_spool = [MagicMock(active=False), MagicMock(active=False)]
+        self.print_job.ams_mapping = [2, 5]
+        self.print_job._model_filaments = [
+            {"id": "1", "used_m": "1.0", "used_g": "3.0"},
+            {"id": "2", "used_m": "2.0", "used_g": "4.0"},
+        ]
+        # Tool 0 extrudes 1000mm over layers 1-2, tool 1 2000mm in layer 3.
+        self.print_job._gcode_index = GcodeIndex(
+            layers=[[0, 0.2, 10, [0.0]], [100, 0.4, 8, [500.0]], [200, 0.6, 5, [1000.0, 0.0]]],
+            filaments=[0, 1],
+            total_extrusion=[1000.0, 2000.0])
+        self.print_job._build_layer_weights()
+
+    def test_used_and_remaining_follow_the_current_layer(self):
+        self.print_job.current_layer = 0
+        self.assertEqual(self.print_job.print_weight_used, 0.0)
+        self.print_job.current_layer = 2
+        self.assertEqual(self.print_job.print_weight_used, 1.5)
+        self.assertEqual(self.print_job.print_weight_remaining, 5.5)
+        self.print_job.current_layer = 3
+        self.assertEqual(self.print_job.get_print_weights_used, {"AMS 1 Tray 3": 3.0, "AMS 2 Tray 2": 0.0})
+        self.assertEqual(self.print_job.get_print_weights_remaining, {"AMS 1 Tray 3": 0.0, "AMS 2 Tray 2": 4.0})
+
+    def test_finished_print_has_used_everything(self):
+        self.print_job.current_layer = 1
+        self.print_job.gcode_state = "FINISH"
+        self.assertEqual(self.print_job.print_weight_used, 7.0)
+        self.assertEqual(self.print_job.print_weight_remaining, 0.0)
+
+    def test_unknown_without_gcode_index(self):
+        self.print_job._gcode_index = None
+        self.print_job._build_layer_weights()
+        self.assertIsNone(self.print_job.print_weight_used)
+        self.assertIsNone(self.print_job.print_weight_remaining)
+        self.assertEqual(self.print_job.get_print_weights_used, {})
+
+
 class TestInfo(unittest.TestCase):
     def setUp(self):
         self.client = MagicMock()
@@ -640,5 +796,205 @@ class TestFans(unittest.TestCase):
         )
 
 
+class TestDirtyTracking(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client._device = MagicMock()
+        self.client._device.extruder = Extruder(self.client._device)
+        with open(os.path.join(os.path.dirname(__file__), 'P1P.json'), 'r') as f:
+            self.test_data = json.load(f)
+
+    def test_repeated_payload_is_not_a_change(self):
+        temperature = Temperature(self.client)
+        data = self.test_data['push_all']
+
+        self.assertTrue(temperature.print_update(data))
+        self.assertIn("bed_temp", temperature.changed_fields)
+        self.assertFalse(temperature.print_update(data))
+        self.assertEqual(temperature.changed_fields, frozenset())
+
+    def test_changed_fields_lists_only_touched_fields(self):
+        temperature = Temperature(self.client)
+        data = self.test_data['push_all']
+        temperature.print_update(data)
+
+        self.assertTrue(temperature.print_update({**data, "bed_target_temper": 60}))
+        self.assertEqual(temperature.changed_fields, frozenset({"target_bed_temp"}))
+
+    def test_in_place_container_update_is_tracked(self):
+        temperature = Temperature(self.client)
+        data = self.test_data['push_all']
+        temperature.print_update(data)
+
+        self.assertTrue(temperature.print_update({**data, "nozzle_temper": 215}))
+        self.assertEqual(temperature.changed_fields, frozenset({"nozzle_temps"}))
+
+    def test_nested_ams_tray_change_marks_data(self):
+        ams_list = AMSList(self.client)
+        data = self.test_data['push_all']
+        self.client._device.extruder.print_update(data)
+        ams_list.print_update(data)
+        self.assertFalse(ams_list.print_update(data))
+
+        changed = json.loads(json.dumps(data))
+        changed['ams']['ams'][0]['humidity'] = "2"
+        self.assertTrue(ams_list.print_update(changed))
+        self.assertEqual(ams_list.changed_fields, frozenset({"data"}))
+        self.assertEqual(ams_list.data[0].changed_fields, frozenset({"humidity_index"}))
+
+    def test_value_restored_within_an_update_is_not_a_change(self):
+        ams_list = AMSList(self.client)
+        data = self.test_data['push_all']
+        self.client._device.extruder.print_update(data)
+        ams_list.print_update(data)
+
+        # Unloaded trays parse the payload and are then reset to their empty values.
+        self.assertFalse(ams_list.print_update(data))
+        self.assertEqual(ams_list.data[0].tray[0].changed_fields, frozenset())
+
+    def test_throttled_wifi_signal_is_not_a_change(self):
+        info = Info(self.client)
+        data = self.test_data['push_all']
+        info.print_update(data)
+        info.wifi_sent = datetime.now()
+
+        self.assertFalse(info.print_update({**data, "wifi_signal": "-70dBm"}))
+        self.assertEqual(info.wifi_signal, -70)
+
+
+class TestDevice(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client._test_mode = True
+        self.client._usage_hours = 0
+        self.client.settings = {}
+        self.client._device = Device(self.client)
+        self.device = self.client._device
+        with open(os.path.join(os.path.dirname(__file__), 'P1P.json'), 'r') as f:
+            self.test_data = json.load(f)
+
+    def _data_update_calls(self):
+        return [c for c in self.client.callback.call_args_list if c.args[0] == "event_printer_data_update"]
+
+    def test_data_update_carries_changed_subsystems(self):
+        self.assertTrue(self.device.print_update(self.test_data['push_all']))
+
+        calls = self._data_update_calls()
+        self.assertEqual(len(calls), 1)
+        self.assertIn("temperature", calls[0].args[1])
+        self.assertIn("print_job", calls[0].args[1])
+
+    def test_no_op_payload_does_not_fire_data_update(self):
+        data = self.test_data['push_all']
+        self.device.print_update(data)
+        self.client.callback.reset_mock()
+
+        self.assertFalse(self.device.print_update(data))
+        self.assertEqual(self._data_update_calls(), [])
+
+    def test_only_changed_subsystem_is_reported(self):
+        data = self.test_data['push_all']
+        self.device.print_update(data)
+        self.client.callback.reset_mock()
+
+        self.device.print_update({"bed_target_temper": 65, "command": "push_status", "msg": 1})
+        self.client.callback.assert_called_once_with("event_printer_data_update", frozenset({"temperature"}))
+
+    def test_firmware_update_is_reported(self):
+        data = json.loads(json.dumps(self.test_data['get_version']))
+        self.device.info_update(data)
+        self.assertIn("info", self._data_update_calls()[0].args[1])
+        self.client.callback.reset_mock()
+
+        self.device.info_update(data)
+        self.assertEqual(self._data_update_calls(), [])
+
+        for module in data["module"]:
+            if module["name"] == "ota":
+                module["sw_ver"] = "01.08.00.00"
+        self.device.info_update(data)
+        self.assertEqual(self.device.info.sw_ver, "01.08.00.00")
+        self.assertEqual(self._data_update_calls()[0].args[1], frozenset({"info", "home_flag"}))
+
+
 if __name__ == '__main__':
     unittest.main()
+
+
+class TestSlicerSettings(unittest.TestCase):
+    SETTINGS = {"filament": {"private": [{
+        "filament_id": "P12345",
+        "name": "My PLA @BBL X1C",
+        "filament_vendor": "Acme",
+        "filament_type": "PLA",
+        "nozzle_temperature": [190, 230],
+    }]}}
+
+    def setUp(self):
+        _slicer_settings_cache.clear()
+        self.fetched = threading.Event()
+        self.release = threading.Event()
+        self.fetch_count = 0
+
+        def fetch():
+            self.fetch_count += 1
+            self.release.wait(5)
+            self.fetched.set()
+            return self.SETTINGS
+
+        self.clients = []
+        for _ in range(2):
+            client = MagicMock()
+            client.bambu_cloud.auth_token = "token"
+            client.bambu_cloud.region = "Europe"
+            client.bambu_cloud.get_slicer_settings = fetch
+            client.start_background = lambda target, name: threading.Thread(target=target, name=name).start()
+            self.clients.append(client)
+
+    def tearDown(self):
+        _slicer_settings_cache.clear()
+
+    def _wait_for(self, predicate):
+        for _ in range(100):
+            if predicate():
+                return
+            threading.Event().wait(0.01)
+        self.fail("Timed out waiting for slicer settings")
+
+    def test_update_does_not_block_and_is_shared_per_account(self):
+        first = SlicerSettings(self.clients[0])
+        second = SlicerSettings(self.clients[1])
+
+        first.update()
+        second.update()
+        # Neither call waited on the (still blocked) cloud fetch.
+        self.assertEqual(first.custom_filaments, {})
+
+        self.release.set()
+        self._wait_for(lambda: "P12345" in first.custom_filaments and "P12345" in second.custom_filaments)
+        self.assertEqual(self.fetch_count, 1)
+        self.assertEqual(first.custom_filaments["P12345"].name, "My PLA")
+        self.clients[0]._device.refresh_filament_names.assert_called_once()
+
+        # A reconnect within the TTL is served from the cache synchronously.
+        third = SlicerSettings(self.clients[0])
+        third.update()
+        self.assertIn("P12345", third.custom_filaments)
+        self.assertEqual(self.fetch_count, 1)
+
+    def test_failed_fetch_reports_authentication_failure(self):
+        self.clients[0].bambu_cloud.get_slicer_settings = lambda: None
+        settings = SlicerSettings(self.clients[0])
+        settings.update()
+        self._wait_for(lambda: self.clients[0].callback.called)
+        self.clients[0].callback.assert_called_once_with("event_printer_bambu_authentication_failed")
+
+    def test_refresh_is_due_after_the_ttl(self):
+        settings = SlicerSettings(self.clients[0])
+        self.assertTrue(settings.refresh_due)
+        self.release.set()
+        settings.update()
+        self.assertFalse(settings.refresh_due)
+        self._wait_for(lambda: "P12345" in settings.custom_filaments)
+        settings._last_update -= SlicerSettings.CACHE_TTL
+        self.assertTrue(settings.refresh_due)
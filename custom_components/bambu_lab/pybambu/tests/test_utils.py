@@ -3,12 +3,16 @@ from unittest.mock import MagicMock
 import json
 import os
 import asyncio
+import tempfile
+from io import BytesIO
+from PIL import Image
 from typing import Dict, Any, Callable, Optional
 
 from ..const import (
     LOGGER,
 )
-from ..utils import safe_json_loads, fan_percentage
+from .. import utils
+from ..utils import RawPayloadCapture, downscale_jpeg, format_payload_for_log, safe_json_loads, fan_percentage, pick_image_identify_ids
 
 
 class TestFanPercentage(unittest.TestCase):
@@ -52,6 +56,105 @@ class TestFanPercentage(unittest.TestCase):
         self.assertEqual(fan_percentage(4), 30)
         self.assertEqual(fan_percentage(5), 40)
 
+
+class TestSafeJsonLoads(unittest.TestCase):
+    """safe_json_loads must parse MQTT bytes directly and only fall back to latin-1 for non UTF-8 payloads."""
+
+    def test_utf8_payload(self):
+        payload = '{"print": {"subtask_name": "Bénchy 🚤", "mc_percent": 42}}'.encode("utf-8")
+        self.assertEqual(safe_json_loads(payload), {"print": {"subtask_name": "Bénchy 🚤", "mc_percent": 42}})
+
+    def test_latin1_payload(self):
+        payload = '{"print": {"subtask_name": "Bénchy"}}'.encode("latin-1")
+        self.assertEqual(safe_json_loads(payload), {"print": {"subtask_name": "Bénchy"}})
+
+    def test_malformed_payload_raises(self):
+        with self.assertRaises(ValueError):
+            safe_json_loads(b'{"print": {"mc_percent": 42}')
+
+    def test_malformed_latin1_payload_raises(self):
+        with self.assertRaises(ValueError):
+            safe_json_loads('{"print": {"subtask_name": "Bénchy"}'.encode("latin-1"))
+
+    def test_matches_stdlib_for_mock_payloads(self):
+        tests_dir = os.path.dirname(__file__)
+        for name in sorted(os.listdir(tests_dir)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(tests_dir, name), 'rb') as f:
+                raw_bytes = f.read()
+            with self.subTest(payload=name):
+                self.assertEqual(safe_json_loads(raw_bytes), json.loads(raw_bytes.decode("utf-8")))
+
+
+class TestPayloadLogging(unittest.TestCase):
+
+    def test_format_payload_for_log(self):
+        payload = b"{'print': {'flag': True,\n    'other': False}}"
+        self.assertEqual(format_payload_for_log(payload), 'b"{"print": {"flag": true,"other": false}}"')
+
+    def test_raw_payload_capture_records_exact_bytes_and_rotates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "capture", "mqtt_payloads.log")
+            capture = RawPayloadCapture(path, max_bytes=200, backup_count=2)
+            payload = '{"print": {"subtask_name": "Bénchy"}}'.encode("latin-1")
+            for _ in range(10):
+                capture.write("device/SERIAL/report", payload)
+            capture.close()
+
+            self.assertTrue(os.path.exists(f"{path}.1"))
+            self.assertTrue(os.path.exists(f"{path}.2"))
+            self.assertFalse(os.path.exists(f"{path}.3"))
+            with open(path, "rb") as f:
+                header, rest = f.read().split(b"\n", 1)
+            _, topic, length = header.decode("utf-8").split(" ")
+            self.assertEqual(topic, "device/SERIAL/report")
+            self.assertEqual(rest[:int(length)], payload)
+
+
+def make_jpeg(width: int, height: int, color=(40, 80, 120)) -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (width, height), color=color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+class TestDownscaleJpeg(unittest.TestCase):
+
+    def test_fits_within_requested_size_keeping_aspect_ratio(self):
+        scaled = downscale_jpeg(make_jpeg(1280, 720), 320, 320)
+        with Image.open(BytesIO(scaled)) as img:
+            self.assertEqual(img.format, "JPEG")
+            self.assertEqual(img.size, (320, 180))
+
+    def test_single_dimension(self):
+        with Image.open(BytesIO(downscale_jpeg(make_jpeg(1280, 720), None, 90))) as img:
+            self.assertEqual(img.size, (160, 90))
+
+    def test_never_upscales(self):
+        jpeg = make_jpeg(640, 360)
+        self.assertIs(downscale_jpeg(jpeg, 1920, 1080), jpeg)
+        self.assertIs(downscale_jpeg(jpeg, None, None), jpeg)
+
+
+class TestPickImageIdentifyIds(unittest.TestCase):
+
+    def setUp(self):
+        # Two objects on a transparent background, plus a fully transparent pixel that still carries a colour.
+        self.image = Image.new("RGBA", (64, 48), (0, 0, 0, 0))
+        self.image.paste((0x4D, 0x02, 0x00, 255), (4, 4, 20, 20))
+        self.image.paste((0x0A, 0x0B, 0x0C, 255), (30, 10, 60, 40))
+        self.image.putpixel((0, 0), (0x11, 0x22, 0x33, 0))
+        self.expected = {str(0x024D), str(0x0C0B0A)}
+
+    def test_identify_ids(self):
+        self.assertEqual(pick_image_identify_ids(self.image), self.expected)
+
+    def test_pure_python_fallback(self):
+        self.assertEqual(utils._pick_image_identify_ids_python(self.image), self.expected)
+
+    def test_converts_to_rgba(self):
+        self.assertEqual(pick_image_identify_ids(Image.new("RGB", (8, 8), (1, 0, 0))), {"1"})
+
 class MqttMessageInfo:
     """Mock MQTT message info object."""
     def __init__(self, mid: int = 1):
@@ -3,14 +3,23 @@ import gzip
 import json
 import logging
 import math
+import os
 import requests
 import socket
 import re
+import shutil
+import threading
+import zlib
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from PIL import Image
 from urllib3.exceptions import ReadTimeoutError
 from bs4 import BeautifulSoup
 from pathlib import Path
+from zipfile import BadZipFile, ZipFile
 
 from .const import (
     CURRENT_STAGE_IDS,
@@ -28,6 +37,27 @@ from .const import (
 )
 from .commands import SEND_GCODE_TEMPLATE, UPGRADE_CONFIRM_TEMPLATE
 
+orjson_available = False
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson_available = False
+
+msgspec_available = False
+try:
+    import msgspec
+    msgspec_available = True
+except ImportError:
+    msgspec_available = False
+
+numpy_available = False
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 def search(lst, predicate, default={}):
     """Search an array for a string"""
     if lst is None:
@@ -430,17 +460,275 @@ def upgrade_template(url: str) -> dict:
     template["upgrade"]["version"] = version
     return template
 
-def safe_json_loads(raw_bytes):
-    # 1. Try proper UTF-8 first (JSON spec default)
+if orjson_available:
+    JSON_DECODER = "orjson"
+    _json_loads = orjson.loads
+    _json_decode_errors = (orjson.JSONDecodeError, UnicodeDecodeError)
+elif msgspec_available:
+    JSON_DECODER = "msgspec"
+    _json_loads = msgspec.json.decode
+    _json_decode_errors = (msgspec.DecodeError, UnicodeDecodeError)
+else:
+    JSON_DECODER = "json"
+    _json_loads = json.loads
+    _json_decode_errors = (json.JSONDecodeError, UnicodeDecodeError)
+
+# Worker pools shared by every printer using the asyncio transport, so the number of threads stays flat as printers
+# are added. MQTT message processing has a pool of its own: long blocking work (FTP transfers, gcode indexing,
+# connect attempts to offline printers) goes to the background pool and can fill it without holding up messages.
+MESSAGE_EXECUTOR_WORKERS = 4
+BACKGROUND_EXECUTOR_WORKERS = 8
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _shared_pool(name: str, max_workers: int) -> ThreadPoolExecutor:
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"bambu_{name}")
+        return executor
+
+def message_executor() -> ThreadPoolExecutor:
+    return _shared_pool("message", MESSAGE_EXECUTOR_WORKERS)
+
+def background_executor() -> ThreadPoolExecutor:
+    return _shared_pool("background", BACKGROUND_EXECUTOR_WORKERS)
+
+
+class SerialWorker:
+    """Run submitted callables one at a time and in order on the shared message executor.
+
+    Gives each printer the ordering guarantees of a dedicated thread without holding on to one while idle.
+    """
+
+    def __init__(self, name: str = ""):
+        self._name = name
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def submit(self, fn, *args):
+        with self._lock:
+            self._queue.append((fn, args))
+            if self._running:
+                return
+            self._running = True
+        message_executor().submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._running = False
+                    return
+                fn, args = self._queue.popleft()
+            try:
+                fn(*args)
+            except Exception as e:
+                LOGGER.error(f"{self._name} worker exception occurred:")
+                LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
+
+
+def downscale_jpeg(jpeg: bytes, width: int | None, height: int | None, quality: int = 75) -> bytes:
+    """Shrink a jpeg to fit within width x height, keeping its aspect ratio. Never upscales.
+
+    The jpeg decoder's draft mode decodes straight at 1/2, 1/4 or 1/8 scale, so only the final step from the nearest
+    draft size is resampled instead of decoding the full frame first.
+    """
+    if not jpeg or (not width and not height):
+        return jpeg
+    with Image.open(BytesIO(jpeg)) as img:
+        target = (width or img.width, height or img.height)
+        if target[0] >= img.width and target[1] >= img.height:
+            return jpeg
+        img.draft("RGB", target)
+        img.thumbnail(target)
+        buf = BytesIO()
+        img.save(buf, format="JPEG", quality=quality)
+        return buf.getvalue()
+
+
+def pick_image_identify_ids(image: Image.Image) -> set:
+    """Return the identify_id of every object drawn in a slicer pick image.
+
+    Each object is painted in a flat colour whose little-endian RGB value is its identify_id, on a transparent
+    background. The image is scanned in C (NumPy, or PIL's colour histogram without it) rather than per pixel.
+    """
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    if numpy_available:
+        # Each RGBA pixel read as one little-endian uint32 is 0xAABBGGRR, i.e. alpha over the identify_id.
+        pixels = np.asarray(image).view("<u4").ravel()
+        ids = np.unique(pixels[pixels >= 0x01000000] & 0x00FFFFFF)
+        return {str(identify_id) for identify_id in ids.tolist()}
+    return _pick_image_identify_ids_python(image)
+
+
+def _pick_image_identify_ids_python(image: Image.Image) -> set:
+    colors = image.getcolors(maxcolors=image.width * image.height) or []
+    return {str(r | (g << 8) | (b << 16)) for _, (r, g, b, a) in colors if a != 0}
+
+
+def file_fingerprint(path: str, tail: int = 65536) -> tuple:
+    """Cheaply identify the content of a zip archive (3mf files are zips) without reading all of it.
+
+    The central directory at the end of a zip holds the CRC of every member, so the size plus a CRC of the last
+    few KB changes whenever any member does. The mtime can't be used as cached files are touched when reused.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(max(0, size - tail))
+        return size, zlib.crc32(f.read())
+
+
+def extract_zip_member(archive_path: str, member: str, target_path: str, compress: bool = False):
+    """Stream one member of a zip archive to target_path, gzip compressed if asked.
+
+    It's written to a temporary file first so a concurrent reader never sees a partial file.
+    """
+    temp_path = target_path + '.tmp'
+    opener = functools.partial(gzip.open, compresslevel=6) if compress else open
     try:
-        return json.loads(raw_bytes.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError):
-        pass
+        with ZipFile(archive_path) as archive, archive.open(member) as source, opener(temp_path, 'wb') as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(temp_path, target_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def zip_crc_ok(path: str) -> bool:
+    """Check every member of a zip archive (3mf files are zips) against its stored CRC."""
+    try:
+        with ZipFile(path) as archive:
+            bad_member = archive.testzip()
+    except (BadZipFile, OSError) as e:
+        LOGGER.debug(f"'{path}' is not a readable zip archive: {e}")
+        return False
+    if bad_member is not None:
+        LOGGER.debug(f"'{path}' failed CRC check at '{bad_member}'")
+        return False
+    return True
 
+
+_LOG_NEWLINE_INDENT = re.compile(r"\\n *")
+_LOG_SINGLE_QUOTE = re.compile(r"\'")
+_LOG_TRUE = re.compile(r"True")
+_LOG_FALSE = re.compile(r"False")
+
+
+def format_payload_for_log(payload) -> str:
+    """Clean up a raw MQTT payload so it can be fed directly into a json prettifier.
+
+    This runs four regex passes over a payload that can be tens of KB so callers must only call it when
+    debug logging is actually enabled.
+    """
+    # X1 mqtt payload is inconsistent. Adjust it for consistent logging.
+    clean_msg = _LOG_NEWLINE_INDENT.sub("", str(payload))
+    # And adjust all payload to be meet proper json syntax instead of being pythonized
+    clean_msg = _LOG_SINGLE_QUOTE.sub("\"", clean_msg)
+    clean_msg = _LOG_TRUE.sub("true", clean_msg)
+    clean_msg = _LOG_FALSE.sub("false", clean_msg)
+    return clean_msg
+
+
+class RawPayloadCapture:
+    """Append raw MQTT payloads, byte for byte, to a size-rotated capture file.
+
+    Each record is a header line '<utc timestamp> <topic> <length>' followed by exactly <length> payload bytes
+    and a newline, so payloads can be replayed exactly as the printer sent them.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._lock = threading.Lock()
+        self._file = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def write(self, topic: str, payload: bytes):
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        header = f"{datetime.now(timezone.utc).isoformat()} {topic} {len(payload)}\n".encode("utf-8")
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+                    self._file = open(self._path, "ab")
+                if self._file.tell() + len(header) + len(payload) + 1 > self._max_bytes and self._file.tell() > 0:
+                    self._rotate()
+                self._file.write(header)
+                self._file.write(payload)
+                self._file.write(b"\n")
+                self._file.flush()
+            except OSError as e:
+                LOGGER.error(f"Failed to write raw payload capture to '{self._path}': {e}")
+                self._close()
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def _rotate(self):
+        self._close()
+        for index in range(self._backup_count - 1, 0, -1):
+            source = f"{self._path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self._path}.{index + 1}")
+        if self._backup_count > 0:
+            os.replace(self._path, f"{self._path}.1")
+        else:
+            os.remove(self._path)
+        self._file = open(self._path, "ab")
+
+
+def _is_valid_utf8(raw_bytes) -> bool:
+    try:
+        raw_bytes.decode("utf-8")
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def safe_json_loads(raw_bytes):
+    """Parse a JSON payload straight from the MQTT bytes.
+
+    The bytes go directly to the fastest parser available (orjson, msgspec, else the stdlib) without an
+    intermediate str. Only when that fails because the payload is not valid UTF-8 (some firmware sends raw
+    latin-1 in file and task names) is it decoded as latin-1, which preserves every byte, and parsed once more.
+    """
+    # 1. Proper UTF-8 first (JSON spec default)
+    try:
+        return _json_loads(raw_bytes)
+    except _json_decode_errors as e:
+        # A payload that is valid UTF-8 but still failed to parse is malformed - latin-1 won't fix that. The fast
+        # parsers are stricter than the stdlib (NaN, integers beyond 64 bits) so give it one chance first.
+        if isinstance(raw_bytes, str) or _is_valid_utf8(raw_bytes):
+            if _json_loads is not json.loads:
+                try:
+                    return json.loads(raw_bytes)
+                except Exception:
+                    pass
+            LOGGER.error(f"Failed to decode JSON payload: '{raw_bytes}'")
+            LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
+            raise
+
+    text = None
     # 2. Latin-1 fallback: preserves bytes exactly
     try:
         text = raw_bytes.decode("latin-1")
-        return json.loads(text)
+        return _json_loads(text)
     except Exception as e:
         LOGGER.error(f"Failed to decode JSON payload: '{text}'")
         LOGGER.error(f"Exception. Type: {type(e)} Args: {e}")
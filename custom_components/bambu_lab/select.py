@@ -38,6 +38,7 @@ class BambuLabSpeedSelect(BambuLabEntity, SelectEntity):
 
     _attr_icon = "mdi:speedometer"
     _attr_translation_key = "printing_speed"
+    _depends_on = frozenset({"print_job", "speed"})
 
     def __init__(self, coordinator: BambuDataUpdateCoordinator) -> None:
         """Initialize Speed Select."""
@@ -69,6 +70,7 @@ class BambuLabAirductModeSelect(BambuLabEntity, SelectEntity):
     _attr_icon = "mdi:air-filter"
     _attr_translation_key = "airduct_mode"
     _attr_entity_category = EntityCategory.CONFIG
+    _depends_on = frozenset({"info"})
 
     def __init__(self, coordinator: BambuDataUpdateCoordinator) -> None:
         """Initialize Airduct Mode Select."""
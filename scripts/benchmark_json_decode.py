@@ -0,0 +1,59 @@
+"""Micro-benchmark for MQTT payload decoding.
+
+Times safe_json_loads against the previous decode-then-parse approach over the MOCK-*.json payloads in the
+pybambu tests directory. Run directly:
+
+    python scripts/benchmark_json_decode.py [iterations]
+"""
+import glob
+import json
+import os
+import sys
+import timeit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INTEGRATION_DIR = os.path.join(SCRIPT_DIR, "..", "custom_components", "bambu_lab")
+PAYLOAD_DIR = os.path.join(INTEGRATION_DIR, "pybambu", "tests")
+
+# Add the integration directory to the Python path to find pybambu
+sys.path.append(INTEGRATION_DIR)
+
+from pybambu.utils import JSON_DECODER, safe_json_loads
+
+
+def legacy_json_loads(raw_bytes):
+    try:
+        return json.loads(raw_bytes.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        pass
+    return json.loads(raw_bytes.decode("latin-1"))
+
+
+def main(iterations: int = 200):
+    payloads = []
+    for file_path in sorted(glob.glob(os.path.join(PAYLOAD_DIR, "MOCK-*.json"))):
+        with open(file_path, 'rb') as f:
+            payloads.append((os.path.basename(file_path), f.read()))
+
+    print(f"Decoder: {JSON_DECODER}, {iterations} iterations per payload")
+    print(f"{'payload':<32}{'size':>10}{'legacy us':>12}{'new us':>12}{'speedup':>10}")
+    total_legacy = total_new = 0.0
+    for name, raw_bytes in payloads:
+        legacy = timeit.timeit(lambda: legacy_json_loads(raw_bytes), number=iterations) / iterations
+        new = timeit.timeit(lambda: safe_json_loads(raw_bytes), number=iterations) / iterations
+        total_legacy += legacy
+        total_new += new
+        print(f"{name:<32}{len(raw_bytes):>10}{legacy * 1e6:>12.1f}{new * 1e6:>12.1f}{legacy / new:>9.2f}x")
+
+    # A latin-1 payload used to be decoded and parsed twice.
+    name, raw_bytes = payloads[0]
+    latin1_bytes = raw_bytes.replace(b'"subtask_name": ""', '"subtask_name": "Bénchy"'.encode("latin-1"), 1)
+    legacy = timeit.timeit(lambda: legacy_json_loads(latin1_bytes), number=iterations) / iterations
+    new = timeit.timeit(lambda: safe_json_loads(latin1_bytes), number=iterations) / iterations
+    print(f"{name + ' (latin-1)':<32}{len(latin1_bytes):>10}{legacy * 1e6:>12.1f}{new * 1e6:>12.1f}{legacy / new:>9.2f}x")
+
+    print(f"{'total':<32}{'':>10}{total_legacy * 1e6:>12.1f}{total_new * 1e6:>12.1f}{total_legacy / total_new:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)